@@ -0,0 +1,121 @@
+"""Compare the plain Python and numpy passes of consumption computation.
+
+Meter histories are synthetic (monthly readings of every zone, with occasional rollovers).
+The delta pass over stacked zone values is timed on its own, as totals are dominated by
+`ConsumptionPeriod` construction, which both paths share. `consumption.NUMPY_MIN_VALUES`
+(the input size numpy is used from) is chosen from these figures.
+
+Usage (from repository root): PYTHONPATH=. python benchmarks/bench_consumption.py [zones]
+"""
+import random
+import sys
+import timeit
+from datetime import date, timedelta
+from types import MappingProxyType
+from typing import List
+
+import numpy as np
+
+from tns_energo_api import Indication, Meter, MeterZone, consumption
+
+HISTORY_MONTHS = (12, 120, 600, 2400)
+DELTA_VALUES = (36, 100, 300, 1000, 2000, 5000, 20000)
+PRECISION = 6
+MAX_DIFFERENCE = 10000.0
+
+
+def make_meter(zones: int) -> Meter:
+    return Meter(
+        account=None,
+        code="00000001",
+        can_delete=False,
+        checkup_date=date(2031, 1, 1),
+        checkup_status=0,
+        checkup_url="",
+        last_checkup_date=date(2015, 1, 1),
+        manufactured_date=date(2015, 1, 1),
+        identifier="meter",
+        transmission_coefficient=1.0,
+        last_indications_date=None,
+        install_location="",
+        model="",
+        precision=PRECISION,
+        status="Расчетный",
+        service_name="",
+        service_number="",
+        tariff_count=zones,
+        type=1,
+        zones=MappingProxyType(
+            {
+                f"t{index + 1}": MeterZone(
+                    identifier=f"zone-{index}",
+                    index=index,
+                    name=None,
+                    last_indication=None,
+                    max_indication_difference=MAX_DIFFERENCE,
+                    closing_indication=None,
+                    label="",
+                )
+                for index in range(zones)
+            }
+        ),
+    )
+
+
+def make_indications(months: int, zones: int, seed: int = 0) -> List[Indication]:
+    rng = random.Random(seed)
+    values = [rng.randrange(10**PRECISION) for _ in range(zones)]
+    indications = []
+    for month in range(months):
+        values = [(value + rng.randint(50, 400)) % 10**PRECISION for value in values]
+        indications.append(
+            Indication(
+                meter_identifier="meter",
+                taken_on=date(1900, 1, 1) + timedelta(days=31 * month),
+                meter_code="00000001",
+                status=0,
+                zones={f"t{index + 1}": value for index, value in enumerate(values)},
+            )
+        )
+    return indications
+
+
+def run(func) -> float:
+    number, _ = timeit.Timer(func).autorange()
+    return min(timeit.repeat(func, number=number, repeat=5)) / number
+
+
+def compare(values, segments) -> str:
+    wrap = 10**PRECISION
+    python = run(lambda: consumption._compute_deltas_python(values, segments, wrap))
+    vectorized = run(lambda: consumption._compute_deltas_numpy(np, values, segments, wrap))
+    return (
+        f"python {python * 1e6:10.1f} us, numpy {vectorized * 1e6:10.1f} us, "
+        f"numpy speedup {python / vectorized:5.2f}x"
+    )
+
+
+def main(zones: int = 2) -> None:
+    print(f"delta pass over stacked values (NUMPY_MIN_VALUES = {consumption.NUMPY_MIN_VALUES})")
+    rng = random.Random(0)
+    for count in DELTA_VALUES:
+        values = [rng.randrange(10**PRECISION) for _ in range(count)]
+        print(f"{count:>6} values: {compare(values, [(0, count, MAX_DIFFERENCE)])}")
+
+    meter = make_meter(zones)
+    print(f"{zones}-zone meter histories")
+    for months in HISTORY_MONTHS:
+        indications = make_indications(months, zones)
+        values = [item.zones[zone_id] for zone_id in meter.zones for item in indications]
+        segments = [
+            (months * index, months * (index + 1), MAX_DIFFERENCE) for index in range(zones)
+        ]
+        total = run(lambda: consumption.compute_meter_consumption(meter, indications, False))
+        print(
+            f"{months:>6} months: deltas {compare(values, segments)}; "
+            f"total {total * 1e6:9.1f} us"
+        )
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
@@ -0,0 +1,64 @@
+"""Compare memoized date/datetime parsing against plain `strptime`.
+
+Usage (from repository root): PYTHONPATH=. python benchmarks/bench_converters.py [records] [unique]
+"""
+import random
+import sys
+import timeit
+from datetime import date, datetime, timedelta
+
+from tns_energo_api import converters
+
+
+def legacy_conv_date(value: str) -> date:
+    try:
+        dt = datetime.strptime(value, "%d.%m.%y")
+    except ValueError:
+        dt = datetime.strptime(value, "%d.%m.%Y")
+    return dt.date()
+
+
+def legacy_conv_datetime(value: str) -> datetime:
+    return datetime.strptime(value, "%Y%m%d%H%M%S")
+
+
+def make_values(records: int, unique: int):
+    start = datetime(2015, 1, 1, 12, 30, 15)
+    moments = [start + timedelta(days=31 * index, minutes=index) for index in range(unique)]
+    rng = random.Random(0)
+    picked = [rng.choice(moments) for _ in range(records)]
+    return (
+        [moment.strftime("%d.%m.%y") for moment in picked],
+        [moment.strftime("%d.%m.%Y") for moment in picked],
+        [moment.strftime("%Y%m%d%H%M%S") for moment in picked],
+    )
+
+
+def run(name: str, func, values) -> float:
+    def _loop():
+        converters._parse_date.cache_clear()
+        converters._parse_datetime.cache_clear()
+        for value in values:
+            func(value)
+
+    result = min(timeit.repeat(_loop, number=1, repeat=5))
+    print(f"{name:>28}: {result * 1000:8.2f} ms")
+    return result
+
+
+def main(records: int = 100000, unique: int = 300) -> None:
+    short_dates, long_dates, datetimes = make_values(records, unique)
+    print(f"{records} values, {unique} unique")
+
+    for label, values, legacy, current in (
+        ("DD.MM.YY", short_dates, legacy_conv_date, converters.conv_date_optional),
+        ("DD.MM.YYYY", long_dates, legacy_conv_date, converters.conv_date_optional),
+        ("YYYYmmddHHMMSS", datetimes, legacy_conv_datetime, converters.conv_datetime_optional),
+    ):
+        baseline = run(f"strptime {label}", legacy, values)
+        optimized = run(f"converters {label}", current, values)
+        print(f"{'speedup':>28}: {baseline / optimized:8.2f}x")
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
@@ -0,0 +1,78 @@
+"""Compare precompiled `DataMapping.from_response` decoders against per-call field walking.
+
+Usage (from repository root): PYTHONPATH=. python benchmarks/bench_decoders.py [years] [meters]
+"""
+import sys
+import timeit
+from datetime import date, timedelta
+
+import attr
+
+from tns_energo_api.converters import DataMapping, META_SOURCE_DATA_KEY
+from tns_energo_api.requests.get_readings_hist_page import (
+    GetReadingsHistPage,
+    GetReadingsHistPageData,
+    ReadingData,
+)
+
+
+def legacy_from_response(cls, data, **kwargs):
+    init_args = {}
+
+    for field in attr.fields(cls):
+        data_field = field.metadata.get(META_SOURCE_DATA_KEY, field.name)
+        if data_field and data_field in data:
+            init_args[field.name.lstrip("_")] = data[data_field]
+
+    init_args.update(kwargs)
+
+    return cls(**init_args)
+
+
+def make_history_payload(years: int, meters: int):
+    history = {}
+    day = date(2021 - years, 1, 25)
+    for month in range(years * 12):
+        history.setdefault(str(day.year), {})[day.strftime("%d.%m.%y")] = {
+            str(100000 + meter): {
+                "number": str(500000 + meter),
+                "status": "0",
+                "readings": {
+                    "pik": {"label": "T1", "value": str(month * 150 + meter)},
+                    "night": {"label": "T2", "value": str(month * 70 + meter)},
+                },
+            }
+            for meter in range(meters)
+        }
+        day = (day + timedelta(days=31)).replace(day=25)
+    return {"result": True, "history": history}
+
+
+def main(years: int = 20, meters: int = 10) -> None:
+    payload = make_history_payload(years, meters)
+    records = years * 12 * meters
+
+    precompiled = DataMapping.from_response.__func__
+    timings = {}
+    for name, impl in (("legacy", legacy_from_response), ("precompiled", precompiled)):
+        for cls in (GetReadingsHistPage, GetReadingsHistPageData, ReadingData):
+            cls.from_response = classmethod(impl)
+        try:
+            timings[name] = min(
+                timeit.repeat(
+                    lambda: GetReadingsHistPage.from_response(payload),
+                    number=5,
+                    repeat=5,
+                )
+            ) / 5
+        finally:
+            for cls in (GetReadingsHistPage, GetReadingsHistPageData, ReadingData):
+                del cls.from_response
+
+    for name, value in timings.items():
+        print(f"{name:>12}: {value * 1000:8.2f} ms ({records} records)")
+    print(f"{'speedup':>12}: {timings['legacy'] / timings['precompiled']:8.2f}x")
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
@@ -0,0 +1,153 @@
+"""Measure cold import time of the package and its commonly used entry points.
+
+Every scenario is imported in a fresh interpreter (as a short-lived CLI job or a serverless
+handler would), reporting wall time, amount of modules loaded and whether aiohttp got
+imported. Results are written as JSON, and may be compared against a previously saved run.
+
+Usage (from repository root):
+    PYTHONPATH=. python benchmarks/bench_import.py [--output results.json] [--repeat 10]
+        [--compare baseline.json] [--threshold 1.25]
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+from datetime import datetime
+from typing import Any, Dict, List, NamedTuple, Optional
+
+FORMAT_VERSION = 1
+
+
+class Scenario(NamedTuple):
+    name: str
+    statement: str
+
+
+SCENARIOS = [
+    Scenario("baseline", "pass"),
+    Scenario("package", "import tns_energo_api"),
+    Scenario("exceptions", "from tns_energo_api.exceptions import TNSEnergoException"),
+    Scenario("validation", "from tns_energo_api.validation import validate_indications"),
+    Scenario("consumption", "from tns_energo_api.consumption import compute_deltas"),
+    Scenario("client", "from tns_energo_api import TNSEnergoAPI"),
+    Scenario("batch", "from tns_energo_api.batch import async_send_indications_batch"),
+    Scenario("main_page", "from tns_energo_api.requests.get_main_page import GetMainPage"),
+]
+
+# Executed in a fresh interpreter; prints JSON measurements of the statement
+_PROBE = """
+import json, sys, time
+started_at = time.perf_counter()
+exec(sys.argv[1])
+seconds = time.perf_counter() - started_at
+print(json.dumps({
+    "seconds": seconds,
+    "modules": len(sys.modules),
+    "aiohttp": "aiohttp" in sys.modules,
+}))
+"""
+
+
+def measure(scenario: Scenario, repeat: int) -> Dict[str, Any]:
+    env = dict(os.environ, PYTHONDONTWRITEBYTECODE="1")
+    runs = []
+    for _ in range(repeat):
+        output = subprocess.run(
+            [sys.executable, "-c", _PROBE, scenario.statement],
+            check=True,
+            stdout=subprocess.PIPE,
+            env=env,
+        ).stdout
+        runs.append(json.loads(output))
+
+    timings = [run["seconds"] for run in runs]
+    return {
+        "name": scenario.name,
+        "statement": scenario.statement,
+        "seconds": min(timings),
+        "seconds_median": statistics.median(timings),
+        "modules": runs[-1]["modules"],
+        "aiohttp": runs[-1]["aiohttp"],
+    }
+
+
+def run_benchmarks(repeat: int) -> Dict[str, Any]:
+    results = []
+
+    for scenario in SCENARIOS:
+        results.append(measure(scenario, repeat))
+        item = results[-1]
+        print(
+            f"{scenario.name:<16} {item['seconds'] * 1000:10.3f} ms "
+            f"{item['modules']:>6} modules" + ("  (aiohttp)" if item["aiohttp"] else ""),
+            file=sys.stderr,
+        )
+
+    return {
+        "format_version": FORMAT_VERSION,
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "repeat": repeat,
+        "results": results,
+    }
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], threshold: float) -> bool:
+    """Print ratios against baseline; return whether any metric regressed past threshold"""
+    previous = {item["name"]: item for item in baseline["results"]}
+    regressed = False
+
+    for item in current["results"]:
+        old = previous.get(item["name"])
+        if old is None:
+            continue
+        ratios = {
+            metric: item[metric] / old[metric]
+            for metric in ("seconds", "modules")
+            if old[metric]
+        }
+        flagged = [metric for metric, ratio in ratios.items() if ratio > threshold]
+        regressed = regressed or bool(flagged)
+        print(
+            f"{item['name']:<16} "
+            + " ".join(f"{metric}={ratio:5.2f}x" for metric, ratio in ratios.items())
+            + ("  REGRESSION: " + ", ".join(flagged) if flagged else "")
+        )
+
+    return regressed
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--output", "-o", help="write JSON results to file (default: stdout)")
+    parser.add_argument("--repeat", type=int, default=10, help="interpreter runs per scenario")
+    parser.add_argument("--compare", help="baseline JSON results to compare against")
+    parser.add_argument("--threshold", type=float, default=1.25, help="regression ratio")
+    args = parser.parse_args(argv)
+
+    report = run_benchmarks(args.repeat)
+    encoded = json.dumps(report, indent=2)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(encoded + "\n")
+    elif not args.compare:
+        print(encoded)
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        if baseline.get("format_version") != FORMAT_VERSION:
+            parser.error("baseline has incompatible format version")
+        return 1 if compare(report, baseline, args.threshold) else 0
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,356 @@
+"""Measure decoding time, allocations and peak memory of request mappings and model builders.
+
+Synthetic payloads are generated with `tns_energo_api.fake_server` at growing sizes (years of
+readings, meters per account, payments per month, dependent accounts). Results are written as
+JSON, and may be compared against a previously saved run to catch regressions.
+
+Usage (from repository root):
+    PYTHONPATH=. python benchmarks/bench_parse.py [--output results.json]
+        [--sizes small,medium,large] [--compare baseline.json] [--threshold 1.25]
+"""
+import argparse
+import asyncio
+import gc
+import json
+import platform
+import random
+import sys
+import time
+import tracemalloc
+from datetime import date, datetime
+from typing import Any, Callable, Dict, List, NamedTuple, Optional
+
+from tns_energo_api import IndicationHistory, PaymentHistory, TNSEnergoAPI
+from tns_energo_api import fake_server
+from tns_energo_api.fake_server import FakeAccount
+from tns_energo_api.requests.account import GetInfo, GetLSListByLS
+from tns_energo_api.requests.authorization import AuthorizationRequest
+from tns_energo_api.requests.get_digital_receipt_status import GetDigitalReceiptStatus
+from tns_energo_api.requests.get_main_page import GetMainPage
+from tns_energo_api.requests.get_payments_page import GetPaymentsPage
+from tns_energo_api.requests.get_readings_hist_page import GetReadingsHistPage
+from tns_energo_api.requests.get_send_indications_page import SendIndicationsPage
+from tns_energo_api.requests.send_readings import SendIndications
+
+FORMAT_VERSION = 1
+TODAY = date(2021, 6, 15)
+
+
+class Size(NamedTuple):
+    years: int
+    meters: int
+    payments_per_month: float
+    dependents: int
+
+
+SIZES: Dict[str, Size] = {
+    "small": Size(years=1, meters=1, payments_per_month=1, dependents=1),
+    "medium": Size(years=5, meters=5, payments_per_month=2, dependents=10),
+    "large": Size(years=20, meters=20, payments_per_month=4, dependents=100),
+}
+
+
+class Fixture(NamedTuple):
+    account: FakeAccount
+    dependents: List[FakeAccount]
+
+
+class Scenario(NamedTuple):
+    name: str
+    # Produces raw response bytes and the number of records within
+    make_raw: Callable[[Fixture], tuple]
+    # Prepares (untimed) arguments of a single run out of freshly decoded response data
+    prepare: Callable[[Any, TNSEnergoAPI], tuple]
+    run: Callable[..., Any]
+
+
+def make_fixture(size: Size, seed: int = 0) -> Fixture:
+    rng = random.Random(seed)
+    generate_kwargs = dict(
+        zones=2,
+        history_months=size.years * 12,
+        payments_per_month=size.payments_per_month,
+        today=TODAY,
+    )
+    account = FakeAccount.generate(rng, "580000000001", meters=size.meters, **generate_kwargs)
+    dependents = [
+        FakeAccount.generate(rng, f"58{index + 1:04d}000001", meters=0, **generate_kwargs)
+        for index in range(size.dependents)
+    ]
+    for dependent in dependents:
+        dependent.controlled_by_code = account.code
+        account.dependent_codes.append(dependent.code)
+    return Fixture(account=account, dependents=dependents)
+
+
+def _raw(payload: Dict[str, Any], records: int) -> tuple:
+    return json.dumps(payload, ensure_ascii=False).encode("utf-8"), records
+
+
+def _history_records(fixture: Fixture) -> int:
+    return sum(len(meter.history) for meter in fixture.account.meters)
+
+
+def _request_scenario(name: str, cls, make_raw) -> Scenario:
+    return Scenario(
+        name=name,
+        make_raw=make_raw,
+        prepare=lambda data, api: (data,),
+        run=cls.from_response,
+    )
+
+
+def _parsed(cls, wrap=lambda response, api: (response,)):
+    return lambda data, api: wrap(cls.from_response(data), api)
+
+
+def _with_account(response, api):
+    account = api._make_account_from_response(
+        AuthorizationRequest.from_response(
+            fake_server.make_authorization_payload(_BUILDER_ACCOUNT)
+        )
+    )
+    return account, response
+
+
+def _reset_indication_history(response, api):
+    object.__setattr__(response, "indication_history", None)
+    return (response,)
+
+
+def _reset_payment_history(response, api):
+    object.__setattr__(response, "payment_history", None)
+    return (response,)
+
+
+_BUILDER_ACCOUNT = make_fixture(SIZES["small"]).account
+
+SCENARIOS: List[Scenario] = [
+    _request_scenario(
+        "requests.AuthorizationRequest",
+        AuthorizationRequest,
+        lambda f: _raw(
+            fake_server.make_authorization_payload(f.account, f.dependents), len(f.dependents)
+        ),
+    ),
+    _request_scenario(
+        "requests.GetLSListByLS",
+        GetLSListByLS,
+        lambda f: _raw(
+            fake_server.make_ls_list_payload(f.account, f.dependents), len(f.dependents)
+        ),
+    ),
+    _request_scenario(
+        "requests.GetInfo",
+        GetInfo,
+        lambda f: _raw(fake_server.make_info_payload(f.account), len(f.account.meters)),
+    ),
+    _request_scenario(
+        "requests.GetMainPage",
+        GetMainPage,
+        lambda f: _raw(fake_server.make_main_page_payload(f.account), 1),
+    ),
+    _request_scenario(
+        "requests.GetDigitalReceiptStatus",
+        GetDigitalReceiptStatus,
+        lambda f: _raw(fake_server.make_digital_receipt_status_payload(f.account), 1),
+    ),
+    _request_scenario(
+        "requests.GetReadingsHistPage",
+        GetReadingsHistPage,
+        lambda f: _raw(fake_server.make_readings_hist_page_payload(f.account), _history_records(f)),
+    ),
+    _request_scenario(
+        "requests.SendIndicationsPage",
+        SendIndicationsPage,
+        lambda f: _raw(
+            fake_server.make_send_readings_page_payload(f.account), len(f.account.meters)
+        ),
+    ),
+    _request_scenario(
+        "requests.GetPaymentsPage",
+        GetPaymentsPage,
+        lambda f: _raw(fake_server.make_payments_page_payload(f.account), len(f.account.payments)),
+    ),
+    _request_scenario(
+        "requests.SendIndications",
+        SendIndications,
+        lambda f: _raw(fake_server.make_send_readings_result_payload(f.account), 1),
+    ),
+    Scenario(
+        name="models.Account",
+        make_raw=lambda f: _raw(
+            fake_server.make_authorization_payload(f.account, f.dependents), len(f.dependents) + 1
+        ),
+        prepare=_parsed(AuthorizationRequest, lambda response, api: (api, response)),
+        run=lambda api, response: [
+            api._make_account_from_response(response),
+            *map(api._make_account_from_response, response.dependent_accounts),
+        ],
+    ),
+    Scenario(
+        name="models.Meter",
+        make_raw=lambda f: _raw(
+            fake_server.make_send_readings_page_payload(f.account), len(f.account.meters)
+        ),
+        prepare=_parsed(SendIndicationsPage, _with_account),
+        run=lambda account, response: account._make_meters_from_response(response),
+    ),
+    Scenario(
+        name="models.IndicationHistory",
+        make_raw=lambda f: _raw(
+            fake_server.make_readings_hist_page_payload(f.account), _history_records(f)
+        ),
+        prepare=_parsed(GetReadingsHistPage, _reset_indication_history),
+        run=IndicationHistory.from_response,
+    ),
+    Scenario(
+        name="models.PaymentHistory",
+        make_raw=lambda f: _raw(
+            fake_server.make_payments_page_payload(f.account), len(f.account.payments)
+        ),
+        prepare=_parsed(GetPaymentsPage, _reset_payment_history),
+        run=PaymentHistory.from_response,
+    ),
+]
+
+
+def measure_time(scenario: Scenario, raw: bytes, api: TNSEnergoAPI, repeat: int) -> float:
+    timings = []
+    gc_enabled = gc.isenabled()
+    for _ in range(repeat):
+        args = scenario.prepare(json.loads(raw), api)
+        gc.collect()
+        gc.disable()
+        try:
+            started_at = time.perf_counter()
+            scenario.run(*args)
+            timings.append(time.perf_counter() - started_at)
+        finally:
+            if gc_enabled:
+                gc.enable()
+    return min(timings)
+
+
+def measure_memory(scenario: Scenario, raw: bytes, api: TNSEnergoAPI) -> Dict[str, int]:
+    args = scenario.prepare(json.loads(raw), api)
+    gc.collect()
+
+    # Tracing is restarted for every measurement to reset the peak (works on Python 3.8)
+    tracemalloc.start()
+    try:
+        before = tracemalloc.take_snapshot()
+        baseline, _ = tracemalloc.get_traced_memory()
+        result = scenario.run(*args)
+        current, peak = tracemalloc.get_traced_memory()
+        after = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+
+    retained_blocks = sum(stat.count_diff for stat in after.compare_to(before, "filename"))
+    del result
+
+    return {
+        "retained_bytes": current - baseline,
+        "retained_blocks": retained_blocks,
+        "peak_bytes": peak - baseline,
+    }
+
+
+async def async_run_benchmarks(sizes: List[str], repeat: int) -> Dict[str, Any]:
+    results = []
+
+    async with TNSEnergoAPI(_BUILDER_ACCOUNT.code, _BUILDER_ACCOUNT.password) as api:
+        for size_name in sizes:
+            fixture = make_fixture(SIZES[size_name])
+            for scenario in SCENARIOS:
+                raw, records = scenario.make_raw(fixture)
+                seconds = measure_time(scenario, raw, api, repeat)
+                results.append(
+                    {
+                        "name": scenario.name,
+                        "size": size_name,
+                        "records": records,
+                        "payload_bytes": len(raw),
+                        "seconds": seconds,
+                        "seconds_per_record": seconds / records if records else None,
+                        **measure_memory(scenario, raw, api),
+                    }
+                )
+                print(
+                    f"{scenario.name:<36} {size_name:>7} {records:>7} rec "
+                    f"{seconds * 1000:10.3f} ms {results[-1]['peak_bytes'] / 1024:10.1f} KiB peak",
+                    file=sys.stderr,
+                )
+
+    return {
+        "format_version": FORMAT_VERSION,
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "repeat": repeat,
+        "results": results,
+    }
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], threshold: float) -> bool:
+    """Print ratios against baseline; return whether any metric regressed past threshold"""
+    previous = {(item["name"], item["size"]): item for item in baseline["results"]}
+    regressed = False
+
+    for item in current["results"]:
+        old = previous.get((item["name"], item["size"]))
+        if old is None:
+            continue
+        ratios = {
+            metric: item[metric] / old[metric]
+            for metric in ("seconds", "peak_bytes")
+            if old[metric] and item[metric] is not None
+        }
+        flagged = [metric for metric, ratio in ratios.items() if ratio > threshold]
+        regressed = regressed or bool(flagged)
+        print(
+            f"{item['name']:<36} {item['size']:>7} "
+            + " ".join(f"{metric}={ratio:5.2f}x" for metric, ratio in ratios.items())
+            + ("  REGRESSION: " + ", ".join(flagged) if flagged else "")
+        )
+
+    return regressed
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--output", "-o", help="write JSON results to file (default: stdout)")
+    parser.add_argument("--sizes", default=",".join(SIZES), help="comma-separated size names")
+    parser.add_argument("--repeat", type=int, default=5, help="timed runs per scenario (min)")
+    parser.add_argument("--compare", help="baseline JSON results to compare against")
+    parser.add_argument("--threshold", type=float, default=1.25, help="regression ratio")
+    args = parser.parse_args(argv)
+
+    sizes = args.sizes.split(",")
+    unknown = set(sizes) - set(SIZES)
+    if unknown:
+        parser.error(f"unknown sizes: {', '.join(sorted(unknown))}")
+
+    report = asyncio.run(async_run_benchmarks(sizes, args.repeat))
+    encoded = json.dumps(report, indent=2)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(encoded + "\n")
+    elif not args.compare:
+        print(encoded)
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        if baseline.get("format_version") != FORMAT_VERSION:
+            parser.error("baseline has incompatible format version")
+        return 1 if compare(report, baseline, args.threshold) else 0
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
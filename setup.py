@@ -26,6 +26,11 @@ setuptools.setup(
     entry_points={
         # "console_scripts": ["tns_energo=tns_energo.command_line:main"],
     },
+    extras_require={
+        "numpy": ["numpy"],
+        "orjson": ["orjson"],
+        "ujson": ["ujson"],
+    },
     packages=setuptools.find_packages(exclude=("old", "tests")),
     python_requires=">=3.8",
 )
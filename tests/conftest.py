@@ -0,0 +1,30 @@
+import asyncio
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Tuple
+
+import pytest
+
+from tns_energo_api import TNSEnergoAPI
+from tns_energo_api.fake_server import FakeTNSEnergoServer
+
+
+@asynccontextmanager
+async def _serve(
+    server_kwargs=None, **api_kwargs
+) -> AsyncIterator[Tuple[FakeTNSEnergoServer, TNSEnergoAPI]]:
+    async with FakeTNSEnergoServer(**(server_kwargs or {})) as server:
+        username, password = server.credentials[0]
+        async with TNSEnergoAPI(username, password, base_url=server.base_url, **api_kwargs) as api:
+            yield server, api
+
+
+@pytest.fixture
+def serve():
+    """Context manager factory running a fake server and an API client connected to it"""
+    return _serve
+
+
+@pytest.fixture
+def run():
+    """Run a coroutine to completion on a fresh event loop"""
+    return asyncio.run
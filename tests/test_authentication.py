@@ -0,0 +1,26 @@
+import asyncio
+
+
+def test_concurrent_login_sends_single_request(serve, run):
+    async def scenario():
+        async with serve({"accounts": 1}) as (server, api):
+            await asyncio.gather(*(api.async_authenticate() for _ in range(10)))
+
+            assert server.request_count == 1
+            assert api.authentication_generation == 1
+
+    run(scenario())
+
+
+def test_ensure_authenticated_reuses_fresh_session(serve, run):
+    async def scenario():
+        async with serve({"accounts": 1}) as (server, api):
+            results = await asyncio.gather(*(api.async_ensure_authenticated() for _ in range(5)))
+            assert all(results)
+            assert await api.async_ensure_authenticated() is False
+            assert server.request_count == 1
+
+            assert await api.async_ensure_authenticated(max_age=0.0) is True
+            assert api.authentication_generation == 2
+
+    run(scenario())
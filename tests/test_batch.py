@@ -0,0 +1,80 @@
+from tns_energo_api.batch import IndicationSubmission, async_send_indications_batch
+from tns_energo_api.exceptions import IndicationValidationException
+from tns_energo_api.validation import IssueCode
+
+
+def _next_values(meter, increment=10):
+    return {
+        zone_id: (zone.last_indication or 0) + increment for zone_id, zone in meter.zones.items()
+    }
+
+
+def test_batch_groups_meters_of_account(serve, run):
+    async def scenario():
+        async with serve({"accounts": 1, "meters_per_account": 3}) as (server, api):
+            await api.async_authenticate()
+            meters = list((await api.main_account.async_get_meters()).values())
+            request_count = server.request_count
+
+            results = await async_send_indications_batch(
+                (meter, _next_values(meter)) for meter in meters
+            )
+
+            assert [result.submission.meter for result in results] == meters
+            assert all(result.success and result.result is not None for result in results)
+            assert server.request_count == request_count + 1
+
+            fake_meters = {meter.code: meter for meter in server.accounts[api.username].meters}
+            for meter in meters:
+                _, last_values = fake_meters[meter.code].last_indications
+                assert list(last_values) == list(_next_values(meter).values())
+
+    run(scenario())
+
+
+def test_batch_splits_requests(serve, run):
+    async def scenario():
+        async with serve({"accounts": 1, "meters_per_account": 3}) as (server, api):
+            await api.async_authenticate()
+            meters = list((await api.main_account.async_get_meters()).values())
+            request_count = server.request_count
+
+            results = await async_send_indications_batch(
+                [(meter, _next_values(meter)) for meter in meters]
+                + [(meters[0], _next_values(meters[0], 20))],
+                max_meters_per_request=2,
+            )
+
+            assert all(result.success for result in results)
+            assert server.request_count == request_count + 2
+
+    run(scenario())
+
+
+def test_batch_reports_invalid_submissions_per_item(serve, run):
+    async def scenario():
+        server_kwargs = {"accounts": 1, "meters_per_account": 2, "dependents_per_account": 1}
+        async with serve(server_kwargs) as (server, api):
+            await api.async_authenticate()
+            account = api.main_account
+            valid, invalid = list((await account.async_get_meters()).values())
+            other = next(iter((await api.dependent_accounts[0].async_get_meters()).values()))
+            request_count = server.request_count
+
+            results = await async_send_indications_batch(
+                [
+                    IndicationSubmission(meter=valid, values=_next_values(valid)),
+                    IndicationSubmission(meter=invalid, values={"t9": 1}),
+                    (account, other, _next_values(other)),
+                ]
+            )
+
+            assert results[0].success
+            assert not results[1].success and not results[2].success
+            expected_codes = (IssueCode.UNKNOWN_ZONE, IssueCode.ACCOUNT_MISMATCH)
+            for result, code in zip(results[1:], expected_codes):
+                assert isinstance(result.exception, IndicationValidationException)
+                assert [issue.code for issue in result.exception.issues] == [code]
+            assert server.request_count == request_count + 1
+
+    run(scenario())
@@ -0,0 +1,106 @@
+from tns_energo_api.cache import ResponseCache
+
+
+def test_repeated_requests_are_served_from_cache(serve, run):
+    async def scenario():
+        async with serve({"accounts": 1}, cache=ResponseCache()) as (server, api):
+            await api.async_authenticate()
+            await api.main_account.async_get_payments()
+            request_count = server.request_count
+
+            await api.main_account.async_get_payments()
+
+            assert server.request_count == request_count
+            assert api.cache.hits > 0
+
+    run(scenario())
+
+
+def test_error_responses_are_not_cached(serve, run):
+    async def scenario():
+        async with serve({"accounts": 1}, cache=ResponseCache()) as (server, api):
+            await api.async_authenticate()
+            path = ("region", api.region, "action", "getInfo", "ls", "000000000000", "json")
+
+            for _ in range(2):
+                response = await api.async_req_get(path)
+                assert response["result"] is False
+
+            assert len(api.cache) == 0
+            assert server.request_count == 3
+
+    run(scenario())
+
+
+def test_sending_indications_invalidates_account_cache(serve, run):
+    async def scenario():
+        async with serve({"accounts": 1}, cache=ResponseCache()) as (server, api):
+            await api.async_authenticate()
+            meter = next(iter((await api.main_account.async_get_meters()).values()))
+            assert len(api.cache)
+
+            values = {
+                zone_id: (zone.last_indication or 0) + 1 for zone_id, zone in meter.zones.items()
+            }
+            await meter.async_send_indications(**values)
+
+            assert len(api.cache) == 0
+
+    run(scenario())
+
+
+def test_expired_entries_are_requested_again(serve, run):
+    async def scenario():
+        cache = ResponseCache(ttls={}, default_ttl=0.0)
+        async with serve({"accounts": 1}, cache=cache) as (server, api):
+            await api.async_authenticate()
+            await api.main_account.async_get_meters()
+            request_count = server.request_count
+
+            await api.main_account.async_get_meters()
+
+            assert server.request_count == request_count + 1
+            assert len(cache) == 0
+
+    run(scenario())
+
+
+def test_parsed_responses_take_no_cache_slots(serve, run):
+    async def scenario():
+        async with serve({"accounts": 1}, cache=ResponseCache()) as (server, api):
+            await api.async_authenticate()
+            history = await api.main_account.async_get_payment_history()
+            request_count = server.request_count
+
+            assert await api.main_account.async_get_payment_history() is history
+            assert server.request_count == request_count
+            assert len(api.cache) == 1
+
+    run(scenario())
+
+
+def test_derived_objects_are_dropped_with_their_entry():
+    now = [0.0]
+    cache = ResponseCache(max_size=1, default_ttl=10.0, ttls={}, clock=lambda: now[0])
+    key = ("penza", "getInfo", "580000000000")
+
+    cache.set_derived(key, "parsed", "ignored")
+    assert cache.get_derived(key, "parsed") is None
+
+    cache.set(key, {"result": True})
+    cache.set_derived(key, "parsed", "parsed value")
+    assert cache.get_derived(key, "parsed") == "parsed value"
+    assert len(cache) == 1
+
+    cache.set(key, {"result": True})
+    assert cache.get_derived(key, "parsed") is None
+
+    cache.set_derived(key, "parsed", "parsed value")
+    now[0] = 10.0
+    assert cache.get_derived(key, "parsed") is None
+
+    now[0] = 0.0
+    cache.set(key, {"result": True})
+    cache.set_derived(key, "parsed", "parsed value")
+    cache.set(("penza", "getInfo", "580000000001"), {"result": True})
+    assert cache.get_derived(key, "parsed") is None
@@ -0,0 +1,87 @@
+import random
+
+import pytest
+
+from tns_energo_api import consumption
+
+np = pytest.importorskip("numpy")
+
+PRECISION = 5
+
+
+def _make_values(rng: random.Random, count: int):
+    values, value = [], rng.randrange(10**PRECISION)
+    for _ in range(count):
+        roll = rng.random()
+        if roll < 0.05:
+            # Reset (meter replacement)
+            value = rng.randrange(10**PRECISION)
+        elif roll < 0.1:
+            # Decrease too large to be a rollover
+            value = max(0, value - rng.randint(1, 1000))
+        elif roll < 0.2:
+            # Dial about to wrap around
+            value = 10**PRECISION - rng.randint(1, 100)
+        else:
+            value = (value + rng.randint(0, 400)) % 10**PRECISION
+        values.append(value)
+    return values
+
+
+@pytest.mark.parametrize(
+    "count",
+    [
+        consumption.NUMPY_MIN_VALUES - 1,
+        consumption.NUMPY_MIN_VALUES,
+        consumption.NUMPY_MIN_VALUES + 1,
+    ],
+)
+@pytest.mark.parametrize("zones", [1, 3])
+@pytest.mark.parametrize("wrap", [10**PRECISION, None])
+def test_python_and_numpy_passes_match(count, zones, wrap):
+    rng = random.Random(count * zones)
+    values = _make_values(rng, count)
+    bounds = [0, *sorted(rng.sample(range(2, count - 1), zones - 1)), count]
+    segments = [
+        (start, end, rng.choice([0.0, 500.0, 1000.0]) or (wrap or 0) / 2)
+        for start, end in zip(bounds, bounds[1:])
+    ]
+
+    python = consumption._compute_deltas_python(values, segments, wrap)
+    vectorized = consumption._compute_deltas_numpy(np, values, segments, wrap)
+
+    deltas, rollovers, resets = python
+    assert python == vectorized
+    if wrap is not None:
+        assert rollovers
+    assert resets
+    boundaries = {end - 1 for _, end, _ in segments[:-1]}
+    assert not boundaries & (rollovers | resets)
+
+
+@pytest.mark.parametrize(
+    "count", [consumption.NUMPY_MIN_VALUES - 1, consumption.NUMPY_MIN_VALUES]
+)
+def test_compute_deltas_around_numpy_threshold(count):
+    values = _make_values(random.Random(count), count)
+    wrap = 10**PRECISION
+    segments = [(0, count, 1000.0)]
+
+    deltas, rollovers, resets = consumption.compute_deltas(values, PRECISION, 1000.0)
+    expected_deltas, expected_rollovers, expected_resets = consumption._compute_deltas_python(
+        values, segments, wrap
+    )
+
+    assert list(deltas) == expected_deltas
+    assert [index for index, flag in enumerate(rollovers) if flag] == sorted(expected_rollovers)
+    assert [index for index, flag in enumerate(resets) if flag] == sorted(expected_resets)
+
+
+def test_compute_deltas_flags():
+    deltas, rollovers, resets = consumption.compute_deltas(
+        [99950, 99990, 20, 10, 15], PRECISION, 100.0
+    )
+
+    assert deltas == [40, 30, -10, 5]
+    assert rollovers == [False, True, False, False]
+    assert resets == [False, False, True, False]
@@ -0,0 +1,87 @@
+from datetime import datetime
+
+import pytest
+
+from tns_energo_api.converters import (
+    _parse_date,
+    _parse_date_strptime,
+    _parse_datetime,
+    conv_date_optional,
+    conv_datetime_optional,
+)
+
+
+def _outcome(func, value):
+    try:
+        return func(value)
+    except ValueError:
+        return ValueError
+
+
+@pytest.mark.parametrize(
+    "value",
+    [
+        # Fast path
+        "01.02.2020",
+        "1.2.2020",
+        "31.12.1999",
+        "29.02.2020",
+        "01.01.68",
+        "01.01.69",
+        "1.2.05",
+        # Out of range, through the fast path
+        "29.02.2021",
+        "31.04.2020",
+        "00.01.2020",
+        "01.13.2020",
+        "01.00.20",
+        # Left to `strptime`
+        "01.02.020",
+        "001.02.2020",
+        "01.02.20200",
+        "01-02-2020",
+        "01.02",
+        "1.2.2020.",
+        "٠١.٠٢.٢٠٢٠",
+        "+1.02.2020",
+        "a.b.c",
+        "",
+    ],
+)
+def test_parse_date_matches_strptime(value):
+    assert _outcome(_parse_date.__wrapped__, value) == _outcome(_parse_date_strptime, value)
+
+
+@pytest.mark.parametrize(
+    "value",
+    [
+        "20200102030405",
+        "19991231235959",
+        "20200229000000",
+        "20210229000000",
+        "20201301000000",
+        "20200100000000",
+        "20200101240000",
+        "20200101006000",
+        "20200101000060",
+        "20200101000061",
+        "00000101000000",
+        "2020010100000a",
+        "2020-01-01 000",
+        "٢٠٢٠٠١٠١٠٠٠٠٠٠",
+    ],
+)
+def test_parse_datetime_matches_strptime(value):
+    assert _outcome(_parse_datetime.__wrapped__, value) == _outcome(
+        lambda item: datetime.strptime(item, "%Y%m%d%H%M%S"), value
+    )
+
+
+def test_conversion_of_optional_values():
+    assert conv_date_optional(None) is None
+    assert conv_date_optional("  ") is None
+    assert conv_date_optional(" 01.02.2020 ") == datetime(2020, 2, 1).date()
+    assert conv_datetime_optional("") is None
+    assert conv_datetime_optional("20200102030405") == datetime(2020, 1, 2, 3, 4, 5)
+    with pytest.raises(ValueError):
+        conv_datetime_optional("202001020304")
@@ -0,0 +1,55 @@
+import pytest
+
+from tns_energo_api import TNSEnergoAPI
+from tns_energo_api.exceptions import ResponseException
+
+
+def test_login(serve, run):
+    async def scenario():
+        async with serve({"accounts": 1, "dependents_per_account": 2}) as (server, api):
+            await api.async_authenticate()
+
+            assert api.main_account.code == server.credentials[0][0]
+            assert [account.code for account in api.dependent_accounts] == (
+                server.accounts[api.username].dependent_codes
+            )
+            assert api.authentication_generation == 1
+            assert api.authenticated_at is not None
+
+    run(scenario())
+
+
+def test_login_invalid_password(serve, run):
+    async def scenario():
+        async with serve({"accounts": 1}) as (server, _):
+            async with TNSEnergoAPI(
+                server.credentials[0][0], "invalid", base_url=server.base_url
+            ) as api:
+                with pytest.raises(ResponseException):
+                    await api.async_authenticate()
+
+    run(scenario())
+
+
+def test_account_info(serve, run):
+    async def scenario():
+        async with serve({"accounts": 1}) as (server, api):
+            await api.async_authenticate()
+
+            info = await api.async_get_account_info()
+
+            assert info.address == server.accounts[api.username].address
+
+    run(scenario())
+
+
+def test_foreign_accounts_are_not_accessible(serve, run):
+    async def scenario():
+        async with serve({"accounts": 2}) as (server, api):
+            await api.async_authenticate()
+            other_code = server.credentials[1][0]
+
+            with pytest.raises(ResponseException):
+                await api.async_get_account_info(other_code)
+
+    run(scenario())
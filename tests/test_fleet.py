@@ -0,0 +1,63 @@
+import asyncio
+
+from tns_energo_api import TNSEnergoAPI
+from tns_energo_api.exceptions import RequestTimeoutException
+from tns_energo_api.fake_server import FakeTNSEnergoServer
+from tns_energo_api.fleet import FleetPoller
+from tns_energo_api.transport import HTTPTransport
+
+
+class _StallingTransport(HTTPTransport):
+    """Let authorization through, but never answer data requests"""
+
+    async def async_request(self, session, request):
+        if request.method == "GET":
+            await asyncio.sleep(10)
+        return await super().async_request(session, request)
+
+
+def _make_poller(server: FakeTNSEnergoServer, transport=None, **kwargs) -> FleetPoller:
+    return FleetPoller(
+        server.credentials,
+        api_factory=lambda credentials, connector: TNSEnergoAPI(
+            credentials.username,
+            credentials.password,
+            base_url=server.base_url,
+            connector=connector,
+            transport=transport,
+        ),
+        **kwargs,
+    )
+
+
+def test_fleet_synchronizes_every_account(run):
+    async def scenario():
+        async with FakeTNSEnergoServer(accounts=4, dependents_per_account=1) as server:
+            results = await _make_poller(server, concurrency=2, region_concurrency=1).async_run()
+
+            assert sorted(result.username for result in results) == sorted(
+                username for username, _ in server.credentials
+            )
+            for result in results:
+                assert result.success
+                assert len(result.accounts) == 2
+                assert set(result.meters) == {account.code for account in result.accounts}
+
+    run(scenario())
+
+
+def test_timed_out_account_leaves_no_pending_tasks(run):
+    async def scenario():
+        async with FakeTNSEnergoServer(accounts=3, dependents_per_account=2) as server:
+            poller = _make_poller(server, _StallingTransport(), account_timeout=0.1)
+
+            results = await poller.async_run()
+
+            for result in results:
+                assert isinstance(result.exception, RequestTimeoutException)
+                # Data fetched before the deadline is kept
+                assert len(result.accounts) == 3
+                assert not result.meters
+            assert asyncio.all_tasks() == {asyncio.current_task()}
+
+    run(scenario())
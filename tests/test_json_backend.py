@@ -0,0 +1,49 @@
+import json
+
+import pytest
+
+from tns_energo_api.json_backend import JSON_BACKENDS, JSONBackend, get_json_backend
+
+PAYLOADS = [
+    {"ls": "580000000001", "t1": 12345, "t2": 678.5, "flag": True, "none": None},
+    [{"ROWID": "1-ABC", "readings": ["100", "200"], "comment": "a / b"}],
+    {"address": "г. Пенза, ул. Московская, д. 1", "name": "Счётчик «Меркурий»"},
+    {"emoji": "\U0001f4a1 ok", "control": "tab\tnewline\n", "quote": 'say "hi"'},
+]
+
+
+@pytest.fixture(params=list(JSON_BACKENDS))
+def backend(request) -> JSONBackend:
+    try:
+        return get_json_backend(request.param)
+    except ImportError:
+        pytest.skip(f"{request.param} is not installed")
+
+
+@pytest.mark.parametrize("payload", PAYLOADS)
+def test_backends_encode_identically(backend, payload):
+    encoded = backend.dumps(payload)
+
+    assert encoded == json.dumps(payload, separators=(",", ":"))
+    assert encoded.isascii()
+    assert backend.loads(encoded.encode("utf-8")) == payload
+
+
+def test_backends_decode_utf8_bytes(backend):
+    data = '{"name":"Счётчик","value":"\\u0410"}'.encode("utf-8")
+
+    assert backend.loads(data) == {"name": "Счётчик", "value": "А"}
+
+
+def test_backends_raise_value_error_on_invalid_input(backend):
+    with pytest.raises(ValueError):
+        backend.loads(b"{not json")
+
+
+def test_get_json_backend_resolution():
+    assert get_json_backend().name == "json"
+    assert get_json_backend("auto").name in JSON_BACKENDS
+    backend = get_json_backend("json")
+    assert get_json_backend(backend) is backend
+    with pytest.raises(ValueError):
+        get_json_backend("unknown")
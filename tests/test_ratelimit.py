@@ -0,0 +1,134 @@
+import asyncio
+
+import pytest
+
+from tns_energo_api.ratelimit import RateLimit, RateLimiter, TokenBucket
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+async def _settle() -> None:
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+@pytest.mark.parametrize("kwargs", [{"rate": 0}, {"rate": 1, "burst": 0}])
+def test_rate_limit_rejects_non_positive_values(kwargs):
+    with pytest.raises(ValueError):
+        RateLimit(**kwargs)
+
+
+def test_bucket_allows_burst_then_waits(run):
+    async def scenario():
+        clock = _Clock()
+        bucket = TokenBucket(RateLimit(rate=10, burst=2), clock)
+
+        assert await bucket.async_acquire() == 0.0
+        assert await bucket.async_acquire() == 0.0
+
+        task = asyncio.ensure_future(bucket.async_acquire())
+        await _settle()
+        assert not task.done()
+        assert bucket.waiting == 1
+
+        clock.now = 0.1
+        assert await asyncio.wait_for(task, 1) == pytest.approx(0.1)
+
+        stats = bucket.stats
+        assert stats.acquired == 3
+        assert stats.waiting == 0
+        assert stats.wait_time == pytest.approx(0.1)
+
+    run(scenario())
+
+
+def test_bucket_grants_tokens_in_order(run):
+    async def scenario():
+        clock = _Clock()
+        bucket = TokenBucket(RateLimit(rate=100, burst=1), clock)
+        await bucket.async_acquire()
+        order = []
+
+        async def acquire(index):
+            await bucket.async_acquire()
+            order.append(index)
+
+        tasks = [asyncio.ensure_future(acquire(index)) for index in range(3)]
+        await _settle()
+        for step in range(1, 4):
+            clock.now = step / 50
+            await asyncio.sleep(0.02)
+        await asyncio.wait_for(asyncio.gather(*tasks), 1)
+
+        assert order == [0, 1, 2]
+
+    run(scenario())
+
+
+def test_blocked_action_does_not_consume_region_tokens(run):
+    async def scenario():
+        clock = _Clock()
+        limiter = RateLimiter(
+            region_limits=RateLimit(rate=10, burst=2),
+            action_limits={"slow": RateLimit(rate=10, burst=1)},
+            clock=clock,
+        )
+        assert await limiter.async_acquire("region", "slow") == 0.0
+
+        task = asyncio.ensure_future(limiter.async_acquire("region", "slow"))
+        await _settle()
+        assert limiter.get_queue_depths() == {("region", None): 0, ("region", "slow"): 1}
+        assert limiter.get_stats()[("region", None)].tokens == 1.0
+
+        # The remaining region token is still available to other actions
+        assert await asyncio.wait_for(limiter.async_acquire("region", "fast"), 0.05) == 0.0
+        assert limiter.get_stats()[("region", None)].tokens == 0.0
+
+        clock.now = 0.1
+        assert await asyncio.wait_for(task, 1) == pytest.approx(0.1)
+        assert limiter.queue_depth == 0
+        assert limiter.get_stats()[("region", None)].acquired == 3
+
+    run(scenario())
+
+
+def test_action_waits_for_region_token(run):
+    async def scenario():
+        clock = _Clock()
+        limiter = RateLimiter(
+            region_limits={"region": RateLimit(rate=10)},
+            action_limits={"action": RateLimit(rate=10, burst=5)},
+            clock=clock,
+        )
+        await limiter.async_acquire("region", "other")
+
+        task = asyncio.ensure_future(limiter.async_acquire("region", "action"))
+        await _settle()
+        assert limiter.get_queue_depths()[("region", None)] == 1
+
+        clock.now = 0.1
+        assert await asyncio.wait_for(task, 1) == pytest.approx(0.1)
+        stats = limiter.get_stats()
+        assert stats[("region", "action")].tokens == 4.0
+        # Time spent waiting on the region bucket is accounted there only
+        assert stats[("region", "action")].wait_time == pytest.approx(0.0)
+
+    run(scenario())
+
+
+def test_unlimited_regions_and_actions_do_not_wait(run):
+    async def scenario():
+        limiter = RateLimiter(region_limits={"other": RateLimit(rate=1)}, clock=_Clock())
+
+        for _ in range(3):
+            assert await limiter.async_acquire("region", "action") == 0.0
+
+        assert limiter.get_stats() == {}
+
+    run(scenario())
@@ -0,0 +1,108 @@
+import asyncio
+
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from tns_energo_api import TNSEnergoAPI
+from tns_energo_api.exceptions import ResponseException, SessionExpiredException
+from tns_energo_api.fake_server import SESSION_EXPIRY_MODES
+
+
+def _get_api_kwargs(session_expiry: str):
+    if session_expiry == "payload":
+        return {"session_expired_error_codes": (401,)}
+    return {}
+
+
+@pytest.mark.parametrize("session_expiry", SESSION_EXPIRY_MODES)
+def test_expired_session_is_renewed(serve, run, session_expiry):
+    async def scenario():
+        server_kwargs = {"accounts": 1, "session_expiry": session_expiry}
+        async with serve(server_kwargs, **_get_api_kwargs(session_expiry)) as (server, api):
+            await api.async_authenticate()
+            server.expire_sessions()
+
+            meters = await api.main_account.async_get_meters()
+
+            assert meters
+            assert api.authentication_generation == 2
+
+    run(scenario())
+
+
+def test_concurrent_expiry_renews_session_once(serve, run):
+    async def scenario():
+        async with serve({"accounts": 1, "dependents_per_account": 3}) as (server, api):
+            await api.async_authenticate()
+            accounts = [api.main_account, *api.dependent_accounts]
+            server.expire_sessions()
+
+            results = await asyncio.gather(*(account.async_get_meters() for account in accounts))
+
+            assert all(results)
+            assert api.authentication_generation == 2
+
+    run(scenario())
+
+
+@pytest.mark.parametrize("session_expiry", SESSION_EXPIRY_MODES)
+def test_expiry_raises_without_reauthentication(serve, run, session_expiry):
+    async def scenario():
+        server_kwargs = {"accounts": 1, "session_expiry": session_expiry}
+        api_kwargs = _get_api_kwargs(session_expiry)
+        async with serve(server_kwargs, reauthenticate=False, **api_kwargs) as (server, api):
+            await api.async_authenticate()
+            server.expire_sessions()
+
+            with pytest.raises(SessionExpiredException):
+                await api.main_account.async_get_meters()
+
+            assert api.authentication_generation == 1
+
+    run(scenario())
+
+
+def test_error_payload_codes_are_not_expiry_by_default(serve, run):
+    async def scenario():
+        async with serve({"accounts": 1, "session_expiry": "payload"}) as (server, api):
+            await api.async_authenticate()
+            server.expire_sessions()
+
+            with pytest.raises(ResponseException) as exc_info:
+                await api.main_account.async_get_meters()
+
+            assert not isinstance(exc_info.value, SessionExpiredException)
+            assert api.authentication_generation == 1
+
+    run(scenario())
+
+
+def test_redirects_outside_login_page_are_followed(run):
+    async def scenario():
+        async def _moved(request: web.Request) -> web.Response:
+            raise web.HTTPMovedPermanently(request.path + "/")
+
+        async def _data(request: web.Request) -> web.Response:
+            return web.json_response({"result": True, "data": request.path})
+
+        async def _expired(request: web.Request) -> web.Response:
+            raise web.HTTPFound("/auth/login/?next=" + request.path)
+
+        async def _login(request: web.Request) -> web.Response:
+            return web.Response(text="<html></html>", content_type="text/html")
+
+        app = web.Application()
+        app.router.add_get("/moved", _moved)
+        app.router.add_get("/moved/", _data)
+        app.router.add_get("/expired/", _expired)
+        app.router.add_get("/auth/login/", _login)
+
+        async with TestServer(app) as server, TNSEnergoAPI("580000000000", "password") as api:
+            response = await api.async_req_get(str(server.make_url("/moved")))
+            assert response == {"result": True, "data": "/moved/"}
+
+            with pytest.raises(SessionExpiredException):
+                await api.async_req_get(str(server.make_url("/expired/")))
+
+    run(scenario())
@@ -0,0 +1,202 @@
+import asyncio
+import random
+
+import aiohttp
+import pytest
+
+from tns_energo_api.exceptions import CircuitOpenException, TNSEnergoException
+from tns_energo_api.retry import CircuitBreaker, CircuitState, RetryPolicy, is_retryable_error
+from tns_energo_api.transport import HTTPTransport
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _make_response_error(status: int) -> aiohttp.ClientResponseError:
+    return aiohttp.ClientResponseError(None, (), status=status)
+
+
+@pytest.mark.parametrize(
+    "error,retryable",
+    [
+        (asyncio.TimeoutError(), True),
+        (aiohttp.ClientConnectionError(), True),
+        (_make_response_error(503), True),
+        (_make_response_error(429), True),
+        (_make_response_error(404), False),
+        (ValueError(), False),
+    ],
+)
+def test_is_retryable_error(error, retryable):
+    assert is_retryable_error(error) is retryable
+
+
+def test_backoff_ceiling_grows_exponentially_up_to_max_delay():
+    policy = RetryPolicy(base_delay=0.5, max_delay=3.0, multiplier=2.0, random=lambda: 1.0)
+
+    assert [policy.get_delay(retry) for retry in range(1, 6)] == [0.5, 1.0, 2.0, 3.0, 3.0]
+
+
+def test_jitter_stays_within_bounds():
+    rng = random.Random(0)
+    policy = RetryPolicy(base_delay=0.5, max_delay=3.0, random=rng.random)
+
+    for retry in range(1, 8):
+        ceiling = min(3.0, 0.5 * 2.0 ** (retry - 1))
+        delays = [policy.get_delay(retry) for _ in range(200)]
+        assert all(0.0 <= delay <= ceiling for delay in delays)
+        # Full jitter spreads delays over the whole range
+        assert min(delays) < ceiling * 0.1
+        assert max(delays) > ceiling * 0.9
+
+
+def test_retry_policy_rejects_non_positive_attempts():
+    with pytest.raises(ValueError):
+        RetryPolicy(max_attempts=0)
+
+
+def test_circuit_opens_after_consecutive_failures():
+    clock = _Clock()
+    breaker = CircuitBreaker(failure_threshold=3, recovery_timeout=10.0, clock=clock)
+
+    for _ in range(2):
+        breaker.before_request("endpoint")
+        breaker.record_failure("endpoint")
+    assert breaker.get_state("endpoint") is CircuitState.CLOSED
+
+    breaker.before_request("endpoint")
+    breaker.record_failure("endpoint")
+    assert breaker.get_state("endpoint") is CircuitState.OPEN
+    assert breaker.open_endpoints == {"endpoint": CircuitState.OPEN}
+
+    clock.now = 4.0
+    with pytest.raises(CircuitOpenException) as exc_info:
+        breaker.before_request("endpoint")
+    assert exc_info.value.endpoint == "endpoint"
+    assert exc_info.value.retry_after == pytest.approx(6.0)
+
+    # Other endpoints are unaffected
+    breaker.before_request("other")
+
+
+def test_success_resets_failure_count():
+    breaker = CircuitBreaker(failure_threshold=2, clock=_Clock())
+
+    breaker.record_failure("endpoint")
+    breaker.record_success("endpoint")
+    breaker.record_failure("endpoint")
+
+    assert breaker.get_state("endpoint") is CircuitState.CLOSED
+
+
+def test_half_open_circuit_lets_single_probe_through():
+    clock = _Clock()
+    breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=10.0, clock=clock)
+    breaker.record_failure("endpoint")
+
+    clock.now = 10.0
+    breaker.before_request("endpoint")
+    assert breaker.get_state("endpoint") is CircuitState.HALF_OPEN
+
+    with pytest.raises(CircuitOpenException):
+        breaker.before_request("endpoint")
+
+    breaker.record_success("endpoint")
+    assert breaker.get_state("endpoint") is CircuitState.CLOSED
+    breaker.before_request("endpoint")
+    breaker.before_request("endpoint")
+
+
+def test_failed_probe_reopens_circuit():
+    clock = _Clock()
+    breaker = CircuitBreaker(failure_threshold=3, recovery_timeout=10.0, clock=clock)
+    for _ in range(3):
+        breaker.record_failure("endpoint")
+
+    clock.now = 15.0
+    breaker.before_request("endpoint")
+    breaker.record_failure("endpoint")
+
+    assert breaker.get_state("endpoint") is CircuitState.OPEN
+    clock.now = 24.0
+    with pytest.raises(CircuitOpenException):
+        breaker.before_request("endpoint")
+    clock.now = 25.0
+    breaker.before_request("endpoint")
+    assert breaker.get_state("endpoint") is CircuitState.HALF_OPEN
+
+
+def test_released_probe_allows_another():
+    clock = _Clock()
+    breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=1.0, clock=clock)
+    breaker.record_failure("endpoint")
+    clock.now = 1.0
+
+    breaker.before_request("endpoint")
+    breaker.release("endpoint")
+    breaker.before_request("endpoint")
+
+    assert breaker.get_state("endpoint") is CircuitState.HALF_OPEN
+
+
+def test_reset_closes_circuits():
+    breaker = CircuitBreaker(failure_threshold=1, clock=_Clock())
+    breaker.record_failure("first")
+    breaker.record_failure("second")
+
+    breaker.reset("first")
+    assert breaker.open_endpoints == {"second": CircuitState.OPEN}
+
+    breaker.reset()
+    assert breaker.open_endpoints == {}
+
+
+class _FailingTransport(HTTPTransport):
+    """Fail the first `failures` data requests with HTTP 503"""
+
+    def __init__(self, failures: int) -> None:
+        self.failures = failures
+        self.requests = 0
+
+    async def async_request(self, session, request):
+        if request.method == "GET":
+            self.requests += 1
+            if self.requests <= self.failures:
+                raise _make_response_error(503)
+        return await super().async_request(session, request)
+
+
+def test_transient_failures_are_retried(serve, run):
+    async def scenario():
+        transport = _FailingTransport(failures=2)
+        policy = RetryPolicy(max_attempts=3, base_delay=0.01)
+        async with serve({"accounts": 1}, transport=transport, retry_policy=policy) as (_, api):
+            await api.async_authenticate()
+            await api.main_account.async_get_payments()
+
+            assert transport.requests == 3
+
+    run(scenario())
+
+
+def test_open_circuit_fails_fast(serve, run):
+    async def scenario():
+        transport = _FailingTransport(failures=1)
+        breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=60.0)
+        async with serve(
+            {"accounts": 1}, transport=transport, circuit_breaker=breaker
+        ) as (_, api):
+            await api.async_authenticate()
+            with pytest.raises(TNSEnergoException, match="status=503"):
+                await api.main_account.async_get_payments()
+            with pytest.raises(CircuitOpenException):
+                await api.main_account.async_get_payments()
+
+            assert transport.requests == 1
+
+    run(scenario())
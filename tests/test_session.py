@@ -0,0 +1,71 @@
+from http.cookies import SimpleCookie
+
+import aiohttp
+from yarl import URL
+
+from tns_energo_api import TNSEnergoAPI
+from tns_energo_api.api import DEFAULT_BASE_URL
+from tns_energo_api.session import SessionState, dump_cookies, load_cookies
+
+
+def _round_trip(cookies: SimpleCookie, url: URL) -> aiohttp.CookieJar:
+    cookie_jar = aiohttp.CookieJar()
+    cookie_jar.update_cookies(cookies, url)
+
+    restored_jar = aiohttp.CookieJar()
+    load_cookies(restored_jar, dump_cookies(cookie_jar))
+    return restored_jar
+
+
+def test_cookie_round_trip_keeps_parent_domain(run):
+    async def scenario():
+        api_url = URL(DEFAULT_BASE_URL)
+        cookies = SimpleCookie()
+        cookies.load("PHPSESSID=session; Domain=.tns-e.ru; Path=/; Secure; HttpOnly")
+
+        cookie_jar = _round_trip(cookies, api_url)
+
+        for url in (api_url, URL("https://lk.penza.tns-e.ru/")):
+            filtered = cookie_jar.filter_cookies(url)
+            assert filtered["PHPSESSID"].value == "session"
+        assert not cookie_jar.filter_cookies(URL("https://example.com/"))
+        assert not cookie_jar.filter_cookies(api_url.with_scheme("http"))
+
+    run(scenario())
+
+
+def test_cookie_round_trip_keeps_host_and_path(run):
+    async def scenario():
+        api_url = URL(DEFAULT_BASE_URL)
+        cookies = SimpleCookie()
+        cookies.load("token=value; Path=/version")
+
+        cookie_jar = _round_trip(cookies, api_url / "version")
+
+        assert cookie_jar.filter_cookies(api_url / "version" / "1.60")["token"].value == "value"
+        assert not cookie_jar.filter_cookies(api_url / "other")
+        assert not cookie_jar.filter_cookies(URL("https://lk.penza.tns-e.ru/version"))
+
+    run(scenario())
+
+
+def test_restored_session_skips_login(serve, run):
+    async def scenario():
+        async with serve({"accounts": 1, "dependents_per_account": 1}) as (server, api):
+            await api.async_authenticate()
+            state = SessionState.from_json(api.export_session_state().to_json())
+
+            username, password = server.credentials[0]
+            async with TNSEnergoAPI(username, password, base_url=server.base_url) as other_api:
+                other_api.restore_session_state(state)
+                request_count = server.request_count
+
+                meters = await other_api.main_account.async_get_meters()
+
+                assert meters
+                assert server.request_count == request_count + 1
+                assert [account.code for account in other_api.dependent_accounts] == [
+                    account.code for account in api.dependent_accounts
+                ]
+
+    run(scenario())
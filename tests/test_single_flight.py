@@ -0,0 +1,94 @@
+import asyncio
+
+import pytest
+
+from tns_energo_api import TNSEnergoAPI
+
+
+def _make_api() -> TNSEnergoAPI:
+    return TNSEnergoAPI("580000000000", "password")
+
+
+def test_concurrent_callers_share_result(run):
+    async def scenario():
+        calls = []
+
+        async def factory():
+            calls.append(None)
+            await asyncio.sleep(0.01)
+            return len(calls)
+
+        async with _make_api() as api:
+            results = await asyncio.gather(
+                *(api.async_single_flight("key", factory) for _ in range(5))
+            )
+            assert results == [1] * 5
+
+            assert await api.async_single_flight("key", factory) == 2
+
+    run(scenario())
+
+
+def test_cancelling_one_caller_keeps_shared_future(run):
+    async def scenario():
+        async def factory():
+            await asyncio.sleep(0.01)
+            return "result"
+
+        async with _make_api() as api:
+            first = asyncio.ensure_future(api.async_single_flight("key", factory))
+            second = asyncio.ensure_future(api.async_single_flight("key", factory))
+            await asyncio.sleep(0)
+            first.cancel()
+
+            assert await second == "result"
+            assert first.cancelled()
+
+    run(scenario())
+
+
+def test_cancelling_every_caller_cancels_shared_future(run):
+    async def scenario():
+        started, cancelled = [], []
+
+        async def factory():
+            started.append(None)
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.append(None)
+                raise
+
+        async with _make_api() as api:
+            waiters = [
+                asyncio.ensure_future(api.async_single_flight("key", factory)) for _ in range(3)
+            ]
+            await asyncio.sleep(0)
+            for waiter in waiters:
+                waiter.cancel()
+            await asyncio.gather(*waiters, return_exceptions=True)
+
+            assert len(started) == 1 and len(cancelled) == 1
+            assert asyncio.all_tasks() == {asyncio.current_task()}
+
+            # Key is released, so that a new caller starts over
+            waiter = asyncio.ensure_future(api.async_single_flight("key", factory))
+            await asyncio.sleep(0)
+            waiter.cancel()
+            await asyncio.gather(waiter, return_exceptions=True)
+            assert len(started) == 2
+
+    run(scenario())
+
+
+def test_timed_out_caller_leaves_no_pending_tasks(run):
+    async def scenario():
+        async with _make_api() as api:
+            with pytest.raises(asyncio.TimeoutError):
+                await asyncio.wait_for(
+                    api.async_single_flight("key", lambda: asyncio.sleep(10)), 0.01
+                )
+
+            assert asyncio.all_tasks() == {asyncio.current_task()}
+
+    run(scenario())
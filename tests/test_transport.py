@@ -0,0 +1,91 @@
+import json
+
+import pytest
+
+from tns_energo_api import TNSEnergoAPI
+from tns_energo_api.exceptions import SessionExpiredException
+from tns_energo_api.fake_server import FakeTNSEnergoServer
+from tns_energo_api.transport import Cassette, Interaction, RecordingTransport, ReplayTransport
+
+PSEUDONYM = "58x000000001"
+
+
+async def _async_run_session(api: TNSEnergoAPI, expire) -> None:
+    await api.async_authenticate()
+    await api.main_account.async_get_meters()
+    expire()
+    await api.main_account.async_get_meters()
+    await api.dependent_accounts[0].async_get_payments()
+
+
+@pytest.mark.parametrize("session_expiry", ["status", "redirect"])
+def test_record_and_replay(run, tmp_path, session_expiry):
+    path = str(tmp_path / "cassette.json")
+
+    async def record():
+        cassette = Cassette()
+        server_kwargs = {"accounts": 1, "dependents_per_account": 1}
+        async with FakeTNSEnergoServer(session_expiry=session_expiry, **server_kwargs) as server:
+            username, password = server.credentials[0]
+            async with TNSEnergoAPI(
+                username,
+                password,
+                base_url=server.base_url,
+                transport=RecordingTransport(cassette),
+            ) as api:
+                await _async_run_session(api, server.expire_sessions)
+                assert api.authentication_generation == 2
+            cassette.save(path)
+
+            with open(path, encoding="utf-8") as f:
+                contents = f.read()
+            for code in (username, *server.accounts[username].dependent_codes):
+                assert code not in contents
+            assert password not in contents
+
+            # Responses ending the expired session are recorded too
+            statuses = [interaction.status for interaction in cassette.interactions]
+            locations = [interaction.location for interaction in cassette.interactions]
+            if session_expiry == "status":
+                assert 401 in statuses
+            else:
+                assert server.base_url + "/login/" in locations
+
+    async def replay():
+        cassette = Cassette(path)
+        async with TNSEnergoAPI(
+            PSEUDONYM, "password", base_url="http://replay", transport=ReplayTransport(cassette)
+        ) as api:
+            await _async_run_session(api, lambda: None)
+
+            assert api.authentication_generation == 2
+            assert api.main_account.code == PSEUDONYM
+
+        cassette.rewind()
+        async with TNSEnergoAPI(
+            PSEUDONYM,
+            "password",
+            base_url="http://replay",
+            transport=ReplayTransport(cassette),
+            reauthenticate=False,
+        ) as api:
+            await api.async_authenticate()
+            await api.main_account.async_get_meters()
+            with pytest.raises(SessionExpiredException):
+                await api.main_account.async_get_meters()
+
+    run(record())
+    run(replay())
+
+
+def test_interaction_round_trip():
+    data = {
+        "method": "GET",
+        "path": "/region/penza/action/getInfo/ls/58x000000001/json/",
+        "params": {"hash": "<redacted>"},
+        "form": None,
+        "status": 302,
+        "response": "",
+        "location": "https://lk.penza.tns-e.ru/login/",
+    }
+    assert Interaction.from_dict(json.loads(json.dumps(data))).to_dict() == data
@@ -0,0 +1,123 @@
+from datetime import date
+from types import MappingProxyType
+
+import pytest
+
+from tns_energo_api import Meter, MeterZone
+from tns_energo_api.exceptions import IndicationValidationException
+from tns_energo_api.validation import IssueCode, validate_indications
+
+
+def _make_meter(precision=5, last_indications=(1000, 500), max_difference=1000.0) -> Meter:
+    return Meter(
+        account=None,
+        code="00000001",
+        can_delete=False,
+        checkup_date=date(2031, 1, 1),
+        checkup_status=0,
+        checkup_url="",
+        last_checkup_date=date(2015, 1, 1),
+        manufactured_date=date(2015, 1, 1),
+        identifier="meter",
+        transmission_coefficient=1.0,
+        last_indications_date=None,
+        install_location="",
+        model="",
+        precision=precision,
+        status="Расчетный",
+        service_name="",
+        service_number="",
+        tariff_count=len(last_indications),
+        type=1,
+        zones=MappingProxyType(
+            {
+                f"t{index + 1}": MeterZone(
+                    identifier=f"zone-{index}",
+                    index=index,
+                    name=None,
+                    last_indication=last_indication,
+                    max_indication_difference=max_difference,
+                    closing_indication=None,
+                    label="",
+                )
+                for index, last_indication in enumerate(last_indications)
+            }
+        ),
+    )
+
+
+def _get_codes(issues):
+    return [(issue.zone, issue.code) for issue in issues]
+
+
+@pytest.mark.parametrize(
+    "values, expected",
+    [
+        ({"t1": 1100, "t2": 600}, []),
+        ({"t1": "1100"}, []),
+        ({"t3": 1}, [("t3", IssueCode.UNKNOWN_ZONE)]),
+        ({"t1": "abc"}, [("t1", IssueCode.INVALID_VALUE)]),
+        ({"t1": None}, [("t1", IssueCode.INVALID_VALUE)]),
+        ({"t1": -1}, [("t1", IssueCode.NEGATIVE_VALUE)]),
+        ({"t1": 100000}, [("t1", IssueCode.TOO_MANY_DIGITS)]),
+        ({"t1": 1000}, [("t1", IssueCode.NOT_INCREASING)]),
+        ({"t1": 900}, [("t1", IssueCode.NOT_INCREASING)]),
+        ({"t1": 2001}, [("t1", IssueCode.DIFFERENCE_EXCEEDED)]),
+        (
+            {"t1": 900, "t2": -1, "t9": 1},
+            [
+                ("t1", IssueCode.NOT_INCREASING),
+                ("t2", IssueCode.NEGATIVE_VALUE),
+                ("t9", IssueCode.UNKNOWN_ZONE),
+            ],
+        ),
+    ],
+)
+def test_validate_indications(values, expected):
+    assert _get_codes(validate_indications(_make_meter(), values)) == expected
+
+
+def test_rollover_within_difference_is_allowed():
+    meter = _make_meter(last_indications=(99990,), max_difference=100.0)
+
+    assert validate_indications(meter, {"t1": 50}) == []
+    assert _get_codes(validate_indications(meter, {"t1": 200})) == [
+        ("t1", IssueCode.NOT_INCREASING)
+    ]
+
+
+def test_rollover_without_precision_is_not_allowed():
+    meter = _make_meter(precision=0, last_indications=(99990,), max_difference=0.0)
+
+    assert _get_codes(validate_indications(meter, {"t1": 50})) == [
+        ("t1", IssueCode.NOT_INCREASING)
+    ]
+    assert validate_indications(meter, {"t1": 10**9}) == []
+
+
+def test_ignore_values_skips_previous_indication_checks():
+    meter = _make_meter()
+
+    assert validate_indications(meter, {"t1": 1, "t2": 99999}, ignore_values=True) == []
+    assert _get_codes(validate_indications(meter, {"t1": -1}, ignore_values=True)) == [
+        ("t1", IssueCode.NEGATIVE_VALUE)
+    ]
+
+
+def test_sending_invalid_indications_raises_before_request(serve, run):
+    async def scenario():
+        async with serve({"accounts": 1}) as (server, api):
+            await api.async_authenticate()
+            meter = next(iter((await api.main_account.async_get_meters()).values()))
+            request_count = server.request_count
+
+            with pytest.raises(IndicationValidationException) as exc_info:
+                await meter.async_send_indications(t9=1)
+
+            # Unknown zones used to be reported with TypeError
+            assert isinstance(exc_info.value, TypeError)
+            assert isinstance(exc_info.value, ValueError)
+            assert _get_codes(exc_info.value.issues) == [("t9", IssueCode.UNKNOWN_ZONE)]
+            assert server.request_count == request_count
+
+    run(scenario())
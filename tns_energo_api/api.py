@@ -0,0 +1,1345 @@
+__all__ = (
+    "TNSEnergoAPI",
+    "AccountCode",
+    "Account",
+    "Meter",
+    "MeterZone",
+    "Payment",
+    "Indication",
+    "IndicationHistory",
+    "IndicationList",
+    "PaymentHistory",
+    "PaymentList",
+    "NewIndication",
+    "process_start_end_arguments",
+    "create_shared_connector",
+)
+
+import asyncio
+import heapq
+import json
+import logging
+import random
+import time
+from bisect import bisect_left, bisect_right
+from contextlib import contextmanager
+from datetime import date, datetime
+from io import StringIO
+from types import MappingProxyType
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    ClassVar,
+    Dict,
+    Hashable,
+    Final,
+    FrozenSet,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    SupportsFloat,
+    SupportsInt,
+    Type,
+    TypeVar,
+    Union,
+)
+from urllib.parse import urlsplit
+
+import aiohttp
+import attr
+
+from tns_energo_api.cache import ResponseCache, is_cacheable_response, make_cache_key
+from tns_energo_api.columnar import ColumnarData, indications_to_columns, payments_to_columns
+from tns_energo_api.consumption import ConsumptionPeriod, compute_meter_consumption
+from tns_energo_api.converters import DataMapping
+from tns_energo_api.exceptions import (
+    IndicationValidationException,
+    RequestException,
+    RequestTimeoutException,
+    ResponseException,
+    SessionExpiredException,
+    TNSEnergoException,
+)
+from tns_energo_api.instrumentation import (
+    ParseEvent,
+    RequestEvent,
+    RequestObserver,
+    RequestTrace,
+    create_trace_config,
+    get_path_action,
+)
+from tns_energo_api.json_backend import JSONBackend, get_json_backend
+from tns_energo_api.ratelimit import RateLimiter
+from tns_energo_api.requests.account import GetInfo, GetLSListByLS
+from tns_energo_api.requests.authorization import AuthorizationRequest
+from tns_energo_api.requests.get_payments_page import GetPaymentsPage
+from tns_energo_api.requests.get_readings_hist_page import GetReadingsHistPage
+from tns_energo_api.requests.get_send_indications_page import SendIndicationsPage
+from tns_energo_api.requests.send_readings import NewIndication, SendIndications
+from tns_energo_api.retry import CircuitBreaker, CircuitState, RetryPolicy, is_retryable_error
+from tns_energo_api.session import SessionState, dump_cookies, load_cookies
+from tns_energo_api.transport import (
+    HTTPTransport,
+    Transport,
+    TransportRequest,
+    TransportResponse,
+    redact,
+)
+from tns_energo_api.validation import ValidationIssue, validate_indications
+
+PathType = Union[str, Iterable[str]]
+AccountCode = str
+
+_T = TypeVar("_T")
+_M = TypeVar("_M", bound=DataMapping)
+
+
+# Loggers are named after the package, as the API is exposed through it
+_LOGGER = logging.getLogger(__package__)
+# Request and response bodies are logged only when opted in with `LOG_BODY_SAMPLE_RATE`
+_BODY_LOGGER = logging.getLogger(__package__ + ".bodies")
+
+
+class _LogBody:
+    """Request or response body formatted (with credentials redacted) only when logged"""
+
+    __slots__ = ("_value", "_limit")
+
+    def __init__(self, value: Any, limit: int) -> None:
+        self._value = value
+        self._limit = limit
+
+    def __str__(self) -> str:
+        value = self._value
+        if isinstance(value, bytes):
+            size = len(value)
+            text = value[: self._limit].decode("utf-8", errors="replace")
+        else:
+            text = json.dumps(redact(value), ensure_ascii=False, default=str)
+            size = len(text)
+        if size > self._limit:
+            return f"{text[:self._limit]}... ({size} total)"
+        return text
+
+
+class _InFlight:
+    """Shared future of `TNSEnergoAPI.async_single_flight` and amount of callers awaiting it"""
+
+    __slots__ = ("future", "waiters")
+
+    def __init__(self, future: "asyncio.Future") -> None:
+        self.future = future
+        self.waiters = 0
+
+
+class TESTWRITER:
+    def __init__(self) -> None:
+        self._contents = StringIO()
+
+    def __str__(self) -> str:
+        return self._contents.getvalue()
+
+    async def write(self, data):
+        if isinstance(data, bytes):
+            data = data.decode("utf-8")
+        self._contents.write(data)
+
+
+def process_start_end_arguments(start: Optional[datetime], end: Optional[datetime]):
+    if start is None:
+        start = datetime.min
+    elif isinstance(start, date):
+        start = datetime.fromordinal(start.toordinal())
+
+    if end is None:
+        end = datetime.now()
+    elif isinstance(end, date):
+        end = datetime.fromordinal(end.toordinal())
+
+    if start > end:
+        raise ValueError("start cannot be greater than end")
+
+    return start, end
+
+
+# This is a lot, but having a timeout like this prevents multiple issues
+DEFAULT_TIMEOUT: Final = aiohttp.ClientTimeout(total=30)
+
+DEFAULT_BASE_URL: Final = "https://rest.tns-e.ru"
+
+DEFAULT_CONNECTOR_LIMIT: Final = 100
+DEFAULT_CONNECTOR_LIMIT_PER_HOST: Final = 20
+DEFAULT_DNS_CACHE_TTL: Final = 300
+DEFAULT_KEEPALIVE_TIMEOUT: Final = 30.0
+
+# Sessions older than this are renewed by `TNSEnergoAPI.async_ensure_authenticated`
+DEFAULT_AUTHENTICATION_MAX_AGE: Final = 1800.0
+
+
+def create_shared_connector(
+    limit: int = DEFAULT_CONNECTOR_LIMIT,
+    limit_per_host: int = DEFAULT_CONNECTOR_LIMIT_PER_HOST,
+    ttl_dns_cache: Optional[int] = DEFAULT_DNS_CACHE_TTL,
+    keepalive_timeout: float = DEFAULT_KEEPALIVE_TIMEOUT,
+    **kwargs,
+) -> aiohttp.TCPConnector:
+    """Create a connector suitable for sharing between multiple `TNSEnergoAPI` instances.
+
+    Instances created with a shared connector keep their own cookie jars, but reuse kept-alive
+    connections (and resolved addresses) of the pool. The connector is not closed together with
+    the instances, and must be closed by its creator."""
+    return aiohttp.TCPConnector(
+        limit=limit,
+        limit_per_host=limit_per_host,
+        ttl_dns_cache=ttl_dns_cache,
+        use_dns_cache=ttl_dns_cache is not None,
+        keepalive_timeout=keepalive_timeout,
+        **kwargs,
+    )
+
+
+class TNSEnergoAPI:
+    GLOBAL_APP_VERSION: ClassVar[str] = "1.60"
+    GLOBAL_HASH: ClassVar[str] = "958fdc9525875bb8ef89e5c0bda3ebc60b95040e"
+
+    # Logged bodies are truncated to this many characters
+    LOG_BODY_LIMIT: ClassVar[int] = 2048
+    # Share of requests to log bodies of at DEBUG level; body logging is off by default
+    LOG_BODY_SAMPLE_RATE: ClassVar[float] = 0.0
+
+    # Redirects to URLs with any of these path segments lead to the login page, meaning the
+    # session has expired; other redirects are followed by the transport
+    LOGIN_PATH_SEGMENTS: ClassVar[FrozenSet[str]] = frozenset(("login", "signin", "auth"))
+
+    REGIONS_MAP: ClassVar[Mapping[str, str]] = {
+        "58": "penza",
+        "76": "yar",
+        "36": "voronezh",
+        "53": "novgorod",
+        "10": "karelia",
+        "23": "kuban",
+        "93": "kuban",
+        "12": "mari-el",
+        "52": "nn",
+        "71": "tula",
+        "61": "rostov",
+    }
+
+    @property
+    def lk_region_url(self) -> str:
+        return f"https://lk.{self.region}.tns-e.ru"
+
+    def __init__(
+        self,
+        username: str,
+        password: str,
+        use_hash: Optional[str] = None,
+        app_version: Optional[str] = None,
+        timeout: Union[SupportsInt, SupportsFloat, aiohttp.ClientTimeout] = DEFAULT_TIMEOUT,
+        connector: Optional[aiohttp.BaseConnector] = None,
+        cache: Optional[ResponseCache] = None,
+        json_backend: Optional[Union[str, JSONBackend]] = None,
+        base_url: str = DEFAULT_BASE_URL,
+        transport: Optional[Transport] = None,
+        observers: Optional[Iterable[RequestObserver]] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        circuit_breaker: Optional[CircuitBreaker] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        reauthenticate: bool = True,
+        session_expired_error_codes: Iterable[Union[int, str]] = (),
+    ) -> None:
+        try:
+            self._region = self.REGIONS_MAP[username[:2]]
+        except KeyError:
+            raise ValueError("username does not match known regions")
+
+        if not isinstance(timeout, aiohttp.ClientTimeout):
+            if isinstance(timeout, SupportsInt):
+                timeout = aiohttp.ClientTimeout(total=int(timeout))
+            elif isinstance(timeout, SupportsFloat):
+                timeout = aiohttp.ClientTimeout(total=float(timeout))
+            else:
+                raise TypeError("invalid argument type for timeout provided")
+
+        self._username = username
+        self._password = password
+        self._local_hash = use_hash
+        self._app_version = app_version
+        self._cache = cache
+        self._base_url = base_url.rstrip("/")
+        self._json = get_json_backend(json_backend)
+        self._transport = transport or HTTPTransport()
+        self._observers: List[RequestObserver] = list(observers or ())
+        self._retry_policy = retry_policy
+        self._circuit_breaker = circuit_breaker
+        self._rate_limiter = rate_limiter
+        self._reauthenticate = reauthenticate
+        self._session_expired_error_codes = frozenset(map(str, session_expired_error_codes))
+        self._session = aiohttp.ClientSession(
+            timeout=timeout,
+            cookie_jar=aiohttp.CookieJar(),
+            headers={aiohttp.hdrs.USER_AGENT: "okhttp/3.7.0"},
+            connector=connector,
+            connector_owner=connector is None,
+            trace_configs=[create_trace_config()],
+        )
+
+        self._inflight: Dict[Hashable, _InFlight] = {}
+
+        self._main_account: Optional[Account] = None
+        self._dependent_accounts: Optional[List[Account]] = None
+        self._authenticated_at: Optional[float] = None
+        self._authentication_generation = 0
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        await self._session.__aexit__(*args)
+        await self.async_close()
+
+    async def async_close(self):
+        if not self._session.closed:
+            await self._session.close()
+
+    @property
+    def region(self) -> str:
+        return self._region
+
+    @property
+    def username(self) -> str:
+        return self._username
+
+    @property
+    def cache(self) -> Optional[ResponseCache]:
+        return self._cache
+
+    @property
+    def rate_limiter(self) -> Optional[RateLimiter]:
+        return self._rate_limiter
+
+    @property
+    def observers(self) -> Sequence[RequestObserver]:
+        return tuple(self._observers)
+
+    def add_observer(self, observer: RequestObserver) -> Callable[[], None]:
+        """Subscribe observer to request events; returns a callable unsubscribing it"""
+        self._observers.append(observer)
+        return lambda: self.remove_observer(observer)
+
+    def remove_observer(self, observer: RequestObserver) -> None:
+        try:
+            self._observers.remove(observer)
+        except ValueError:
+            pass
+
+    def _notify_observers(self, callback: str, event: Union[RequestEvent, ParseEvent]) -> None:
+        for observer in tuple(self._observers):
+            try:
+                getattr(observer, callback)(event)
+            except Exception:
+                _LOGGER.exception("Request observer %r failed to handle %r", observer, event)
+
+    def invalidate_cache(self, code: Optional[AccountCode] = None) -> None:
+        if self._cache is not None:
+            self._cache.invalidate(self._region, code)
+
+    @property
+    def main_account(self) -> Optional["Account"]:
+        return self._main_account
+
+    @property
+    def dependent_accounts(self) -> Optional[List["Account"]]:
+        return self._dependent_accounts
+
+    @property
+    def local_hash(self) -> str:
+        return self._local_hash or self.GLOBAL_HASH
+
+    @local_hash.setter
+    def local_hash(self, value: Optional[str]) -> None:
+        self._local_hash = value
+
+    @property
+    def local_app_version(self) -> str:
+        return self._app_version or self.GLOBAL_APP_VERSION
+
+    @local_app_version.setter
+    def local_app_version(self, value: Optional[str]) -> None:
+        self._app_version = value
+
+    @property
+    def requests_url_base(self) -> str:
+        return f"{self._base_url}/version/{self.local_app_version}/Android/mobile"
+
+    async def async_single_flight(self, key: Hashable, factory: Callable[[], Awaitable[_T]]) -> _T:
+        """Run awaitable produced by factory, unless one with the same key is already running.
+
+        Concurrent callers with identical keys await (and receive result of) the same future.
+        Cancellation of one caller does not affect the others; once every caller is cancelled,
+        the shared future is cancelled as well (and awaited, so no request outlives them)."""
+        inflight = self._inflight
+        entry = inflight.get(key)
+
+        if entry is None:
+            entry = inflight[key] = _InFlight(asyncio.ensure_future(factory()))
+
+            def _done(finished: "asyncio.Future") -> None:
+                if inflight.get(key) is entry:
+                    del inflight[key]
+                if not finished.cancelled():
+                    # Mark exception as retrieved in case every caller got cancelled
+                    finished.exception()
+
+            entry.future.add_done_callback(_done)
+
+        future = entry.future
+        entry.waiters += 1
+        try:
+            return await asyncio.shield(future)
+        finally:
+            entry.waiters -= 1
+            if not entry.waiters and not future.done():
+                if inflight.get(key) is entry:
+                    del inflight[key]
+                future.cancel()
+                await asyncio.wait((future,))
+
+    async def async_req_get(self, path: Union[str, Iterable[str]], use_cache: bool = True):
+        if not isinstance(path, str):
+            path = tuple(map(str, path))
+        return await self.async_single_flight(
+            ("GET", path, use_cache),
+            lambda: self._async_req_get(path, use_cache),
+        )
+
+    @contextmanager
+    def _observe_request(
+        self, method: str, path: Union[str, Iterable[str]]
+    ) -> Iterator[Optional[RequestTrace]]:
+        if not self._observers:
+            yield None
+            return
+
+        trace = RequestTrace(method=method, action=get_path_action(path), region=self._region)
+        error = None
+        try:
+            yield trace
+        except BaseException as e:
+            error = e
+            raise
+        finally:
+            trace.timings.mark_finished()
+            self._notify_observers("on_request", trace.to_event(error))
+
+    async def _async_req_get(self, path: Union[str, Iterable[str]], use_cache: bool = True):
+        with self._observe_request("GET", path) as trace:
+            cache = self._cache if use_cache else None
+            cache_key = None
+            if cache is not None:
+                cache_key = make_cache_key(path)
+                if cache_key is not None:
+                    response_json = cache.get(cache_key)
+                    if response_json is not None:
+                        _LOGGER.debug("[GET] <- [cached] %s", cache_key)
+                        if trace is not None:
+                            trace.cached = True
+                        return response_json
+
+            if isinstance(path, str):
+                target_url = path
+            else:
+                target_url = self.requests_url_base + "/" + "/".join(map(str, path)) + "/"
+
+            try:
+                _LOGGER.debug("[GET] -> (%s)", target_url)
+                if trace is not None:
+                    trace.url = target_url
+                response = await self._async_send(
+                    TransportRequest(
+                        method="GET",
+                        url=target_url,
+                        params={"hash": self.local_hash},
+                        trace=trace,
+                    ),
+                    get_path_action(path),
+                    retry=True,
+                )
+                response_status = response.status
+                response_body = response.body
+                self._check_redirect(response, trace)
+
+                try:
+                    response_json = self._decode_response(response, trace)
+                except ValueError as e:
+                    _LOGGER.error(
+                        "[GET] <- [%s] (%s) %s",
+                        response_status,
+                        target_url,
+                        _LogBody(response_body, self.LOG_BODY_LIMIT),
+                    )
+                    raise ResponseException("Could not decode response data: %s" % repr(e))
+                else:
+                    self._log_response("GET", response_status, target_url, response_json, response)
+                    if cache_key is not None and is_cacheable_response(response_json):
+                        cache.set(cache_key, response_json)
+                    return response_json
+
+            except aiohttp.ClientError as e:
+                if isinstance(e, aiohttp.ClientResponseError):
+                    if trace is not None:
+                        trace.status = e.status
+                    if e.status == 401:
+                        raise SessionExpiredException(e.status, e.message)
+                raise TNSEnergoException(
+                    "During request handling the following error occurred: %s" % repr(e)
+                )
+
+            except asyncio.TimeoutError:
+                raise TNSEnergoException("During request handling a timeout occurred")
+
+    async def async_req_post(
+        self,
+        path: Union[str, Iterable[str]],
+        data: Any,
+        name: str = "data",
+        retry_safe: bool = False,
+    ):
+        """Send POST request; unless `retry_safe` is set, failed requests are never retried"""
+        if isinstance(path, str):
+            target_url = path
+        else:
+            target_url = self.requests_url_base + "/" + "/".join(map(str, path)) + "/"
+
+        with self._observe_request("POST", path) as trace:
+            try:
+                request_body = self._json.dumps(data)
+                request_bytes = len(request_body.encode("utf-8"))
+                _LOGGER.debug("[POST] -> (%s) %d bytes", target_url, request_bytes)
+                if self._should_log_body():
+                    _BODY_LOGGER.debug(
+                        "[POST] -> (%s) %s", target_url, _LogBody(data, self.LOG_BODY_LIMIT)
+                    )
+                if trace is not None:
+                    trace.url = target_url
+                    trace.request_bytes = request_bytes
+                response = await self._async_send(
+                    TransportRequest(
+                        method="POST",
+                        url=target_url,
+                        params={"hash": self.local_hash},
+                        form=(name, request_body),
+                        trace=trace,
+                    ),
+                    get_path_action(path),
+                    retry=retry_safe,
+                )
+                response_status = response.status
+                response_body = response.body
+                self._check_redirect(response, trace)
+
+                try:
+                    response_json = self._decode_response(response, trace)
+                except ValueError as e:
+                    _LOGGER.error(
+                        "[POST] <- [%s] (%s) !NONJSON %s",
+                        response_status,
+                        target_url,
+                        _LogBody(response_body, self.LOG_BODY_LIMIT),
+                    )
+                    raise ResponseException("Could not decode response data: %s" % repr(e))
+                else:
+                    self._log_response("POST", response_status, target_url, response_json, response)
+                    return response_json
+
+            except aiohttp.ClientError as e:
+                if isinstance(e, aiohttp.ClientResponseError):
+                    if trace is not None:
+                        trace.status = e.status
+                    if e.status == 401:
+                        raise SessionExpiredException(e.status, e.message)
+                raise RequestException(
+                    "During request handling the following error occurred: %s" % repr(e)
+                )
+
+            except asyncio.TimeoutError:
+                raise RequestTimeoutException("During request handling a timeout occurred")
+
+    async def _async_send(
+        self, request: TransportRequest, action: Optional[str], retry: bool
+    ) -> TransportResponse:
+        """Send request through transport, applying retry policy and circuit breaker"""
+        breaker = self._circuit_breaker
+        breaker_key = (self._region, action)
+        max_attempts = self._retry_policy.max_attempts if retry and self._retry_policy else 1
+        attempt = 0
+
+        while True:
+            attempt += 1
+            if request.trace is not None:
+                request.trace.attempts = attempt
+            if breaker is not None:
+                breaker.before_request(breaker_key)
+
+            try:
+                if self._rate_limiter is not None:
+                    waited = await self._rate_limiter.async_acquire(self._region, action)
+                    if request.trace is not None:
+                        timings = request.trace.timings
+                        timings.throttled = (timings.throttled or 0.0) + waited
+
+                response = await self._transport.async_request(self._session, request)
+
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                retryable = is_retryable_error(e)
+                if breaker is not None:
+                    if retryable:
+                        breaker.record_failure(breaker_key)
+                    else:
+                        # Upstream is up, albeit responding with an error
+                        breaker.record_success(breaker_key)
+                if not retryable or attempt >= max_attempts:
+                    raise
+                if breaker is not None and breaker.get_state(breaker_key) is CircuitState.OPEN:
+                    # This failure tripped the breaker; further attempts would fail fast
+                    raise
+
+                delay = self._retry_policy.get_delay(attempt)
+                _LOGGER.debug(
+                    "[%s] Attempt %d of %d for %s failed (%r), retrying in %.2f seconds",
+                    request.method,
+                    attempt,
+                    max_attempts,
+                    request.url,
+                    e,
+                    delay,
+                )
+                backoff_started_at = time.perf_counter()
+                await asyncio.sleep(delay)
+                if request.trace is not None:
+                    timings = request.trace.timings
+                    timings.backoff = (
+                        (timings.backoff or 0.0) + time.perf_counter() - backoff_started_at
+                    )
+
+            except BaseException:
+                if breaker is not None:
+                    breaker.release(breaker_key)
+                raise
+
+            else:
+                if breaker is not None:
+                    breaker.record_success(breaker_key)
+                return response
+
+    def _check_redirect(self, response: TransportResponse, trace: Optional[RequestTrace]) -> None:
+        # Requests of expired sessions may get redirected to the login page
+        location = response.location
+        if location is None:
+            return
+        segments = urlsplit(location).path.lower().split("/")
+        if not self.LOGIN_PATH_SEGMENTS.intersection(segments):
+            return
+        if trace is not None:
+            trace.status = response.status
+        raise SessionExpiredException(response.status, "Redirected to %s" % location)
+
+    def _should_log_body(self) -> bool:
+        sample_rate = self.LOG_BODY_SAMPLE_RATE
+        if sample_rate <= 0.0 or not _BODY_LOGGER.isEnabledFor(logging.DEBUG):
+            return False
+        return sample_rate >= 1.0 or random.random() < sample_rate
+
+    def _log_response(
+        self,
+        method: str,
+        status: int,
+        target_url: str,
+        response_json: Any,
+        response: TransportResponse,
+    ) -> None:
+        _LOGGER.debug("[%s] <- [%s] (%s) %d bytes", method, status, target_url, len(response.body))
+        if self._should_log_body():
+            _BODY_LOGGER.debug(
+                "[%s] <- (%s) %s", method, target_url, _LogBody(response_json, self.LOG_BODY_LIMIT)
+            )
+
+    def _decode_response(self, response: TransportResponse, trace: Optional[RequestTrace]) -> Any:
+        if trace is None:
+            return self._json.loads(response.body)
+
+        timings = trace.timings
+        timings.mark_body_received()
+        trace.status = response.status
+        trace.response_bytes = len(response.body)
+
+        decode_started_at = time.perf_counter()
+        try:
+            return self._json.loads(response.body)
+        finally:
+            timings.decode = time.perf_counter() - decode_started_at
+
+    def parse_response(self, mapping_cls: Type[_M], data: Mapping[str, Any]) -> _M:
+        """Convert response data with `mapping_cls.from_response`, reporting time taken"""
+        if not self._observers:
+            return mapping_cls.from_response(data)
+
+        started_at = time.perf_counter()
+        error = None
+        try:
+            return mapping_cls.from_response(data)
+        except BaseException as e:
+            error = e
+            raise
+        finally:
+            self._notify_observers(
+                "on_parse",
+                ParseEvent(
+                    mapping=mapping_cls.__name__,
+                    action=getattr(mapping_cls, "ACTION", None),
+                    region=self._region,
+                    duration=time.perf_counter() - started_at,
+                    error=error,
+                ),
+            )
+
+    def _make_account_from_response(self, response):
+        return Account(
+            api=self,
+            address=response.address,
+            debt=response.debt,
+            code=response.code or response.controlling_code,
+            email=response.email,
+            digital_invoices_ignored=response.digital_invoices_ignored,
+            digital_invoices_email=response.digital_invoices_email,
+            digital_invoices_enabled=response.digital_invoices_enabled,
+            digital_invoices_email_comment=response.digital_invoices_email_comment,
+            is_controlled=response.is_controlled,
+            is_controlling=response.is_controlling,
+            controlled_by_code=response.controlled_by_code,
+        )
+
+    async def async_authenticate(self):
+        """Authenticate and load accounts.
+
+        Concurrent calls share a single authorization request and its response."""
+        return await self.async_single_flight(("authenticate",), self._async_authenticate)
+
+    async def async_ensure_authenticated(
+        self, max_age: Optional[float] = DEFAULT_AUTHENTICATION_MAX_AGE
+    ) -> bool:
+        """Authenticate unless a session established less than `max_age` seconds ago (or
+        any established session, when `max_age` is None) exists; returns whether it did"""
+        authenticated_at = self._authenticated_at
+        if (
+            authenticated_at is not None
+            and self._main_account is not None
+            and (max_age is None or time.time() - authenticated_at < max_age)
+        ):
+            return False
+
+        await self.async_authenticate()
+        return True
+
+    async def _async_authenticate(self):
+        response = await AuthorizationRequest.async_request(self, self._username, self._password)
+
+        main_account = self._make_account_from_response(response)
+        dependent_accounts = list(
+            map(self._make_account_from_response, response.dependent_accounts)
+        )
+
+        self._main_account = main_account
+        self._dependent_accounts = dependent_accounts
+        self._authenticated_at = time.time()
+        self._authentication_generation += 1
+
+        return response
+
+    @property
+    def reauthenticate(self) -> bool:
+        """Whether requests failing due to session expiry authenticate again and get repeated"""
+        return self._reauthenticate
+
+    @reauthenticate.setter
+    def reauthenticate(self, value: bool) -> None:
+        self._reauthenticate = value
+
+    @property
+    def session_expired_error_codes(self) -> FrozenSet[str]:
+        """Error codes of response payloads treated as session expiry, alongside HTTP 401
+        responses and redirects to the login page. No such code is known for the real service,
+        hence none are set by default."""
+        return self._session_expired_error_codes
+
+    @property
+    def authentication_generation(self) -> int:
+        """Counter of sessions established (or restored) by this instance"""
+        return self._authentication_generation
+
+    async def async_reauthenticate(self, generation: int) -> None:
+        """Authenticate again, unless session has been renewed since `generation`.
+
+        Concurrent callers observing the same expired session wait for a single
+        authorization request."""
+        if self._authentication_generation == generation:
+            _LOGGER.debug("Session of %s has expired, authenticating again", self._username)
+            await self.async_authenticate()
+
+    @property
+    def authenticated_at(self) -> Optional[float]:
+        """UNIX timestamp of the last successful authentication (restored ones included)"""
+        return self._authenticated_at
+
+    def export_session_state(self) -> SessionState:
+        """Snapshot cookies, accounts, hash and app version for `restore_session_state`"""
+
+        def _dump_account(account: Account) -> Dict[str, Any]:
+            # noinspection PyDataclass
+            return {
+                field.name: getattr(account, field.name)
+                for field in attr.fields(Account)
+                if field.name != "api"
+            }
+
+        dependent_accounts = self._dependent_accounts
+        return SessionState(
+            username=self._username,
+            local_hash=self._local_hash,
+            app_version=self._app_version,
+            authenticated_at=self._authenticated_at,
+            cookies=dump_cookies(self._session.cookie_jar),
+            main_account=None if self._main_account is None else _dump_account(self._main_account),
+            dependent_accounts=(
+                None if dependent_accounts is None else list(map(_dump_account, dependent_accounts))
+            ),
+        )
+
+    def restore_session_state(self, state: SessionState) -> None:
+        """Restore session exported by `export_session_state`, skipping authentication.
+
+        Sessions expired on the server side still have to be re-authenticated."""
+        if state.username != self._username:
+            raise ValueError("session state belongs to a different username")
+
+        self._local_hash = state.local_hash
+        self._app_version = state.app_version
+        load_cookies(self._session.cookie_jar, state.cookies)
+
+        self._main_account = (
+            None if state.main_account is None else Account(api=self, **state.main_account)
+        )
+        self._dependent_accounts = (
+            None
+            if state.dependent_accounts is None
+            else [Account(api=self, **data) for data in state.dependent_accounts]
+        )
+        self._authenticated_at = state.authenticated_at
+        self._authentication_generation += 1
+
+    async def async_get_accounts_list(self, code: Optional[AccountCode] = None):
+        if code is None:
+            code = self._username
+
+        response = await GetLSListByLS.async_request(self, code)
+
+        return list(map(self._make_account_from_response, response.data))
+
+    async def async_get_account_info(self, code: Optional[AccountCode] = None):
+        if code is None:
+            code = self._username
+
+        response = await GetInfo.async_request(self, code)
+
+        return response
+
+
+@attr.s(kw_only=True, frozen=True, slots=True)
+class Indication(DataMapping):
+    meter_identifier: str = attr.ib(repr=False)
+    taken_on: date = attr.ib()
+    meter_code: str = attr.ib()
+    status: int = attr.ib()
+    zones: Mapping[str, int] = attr.ib(converter=MappingProxyType)
+
+
+ZONE_CODES_MAPPING = {
+    "pik": "t1",
+    "night": "t2",
+    "ppik": "t3",
+}
+
+
+class IndicationList(List[Indication]):
+    def to_columns(self) -> ColumnarData:
+        """Export as typed arrays (requires numpy)"""
+        return indications_to_columns(self)
+
+
+def _get_taken_on(indication: Indication) -> date:
+    return indication.taken_on
+
+
+class IndicationHistory:
+    """Indications sorted by date and indexed by meter code.
+
+    Range queries cost O(log n + k) for the whole history, and O(m * log n + k) when
+    filtering by m meter codes."""
+
+    __slots__ = ("_indications", "_dates", "_by_meter", "_dates_by_meter")
+
+    def __init__(self, indications: Iterable[Indication]) -> None:
+        indications = tuple(sorted(indications, key=_get_taken_on))
+        by_meter: Dict[str, List[Indication]] = {}
+
+        for indication in indications:
+            by_meter.setdefault(indication.meter_code, []).append(indication)
+
+        self._indications = indications
+        self._dates = tuple(map(_get_taken_on, indications))
+        self._by_meter = {code: tuple(items) for code, items in by_meter.items()}
+        self._dates_by_meter = {
+            code: tuple(map(_get_taken_on, items)) for code, items in by_meter.items()
+        }
+
+    @classmethod
+    def from_response(cls, response: GetReadingsHistPage) -> "IndicationHistory":
+        """Get history of a response; it is built once and kept on the response object"""
+        history = response.indication_history
+        if history is None:
+            history = cls(
+                Indication(
+                    taken_on=date_,
+                    meter_identifier=meter,
+                    meter_code=data.meter_code,
+                    status=data.status or 0,
+                    zones={
+                        ZONE_CODES_MAPPING[zone_code]: reading.value
+                        for zone_code, reading in data.readings.items()
+                    },
+                )
+                for date_meter_map in response.history.values()
+                for date_, meter_data_map in date_meter_map.items()
+                for meter, data in meter_data_map.items()
+            )
+            object.__setattr__(response, "indication_history", history)
+        return history
+
+    def __len__(self) -> int:
+        return len(self._indications)
+
+    def __iter__(self) -> Iterator[Indication]:
+        return iter(self._indications)
+
+    @property
+    def meter_codes(self) -> Sequence[str]:
+        return tuple(self._by_meter)
+
+    def get_for_meter(self, meter_code: str) -> Sequence[Indication]:
+        return self._by_meter.get(meter_code, ())
+
+    def get_range(
+        self,
+        start: Optional[date] = None,
+        end: Optional[date] = None,
+        meter_codes: Optional[Union[str, Iterable[str]]] = None,
+    ) -> List[Indication]:
+        """Get indications taken between start and end (both inclusive), ordered by date"""
+        if meter_codes is None:
+            return list(self._slice(self._indications, self._dates, start, end))
+
+        if isinstance(meter_codes, str):
+            meter_codes = (meter_codes,)
+
+        slices = [
+            self._slice(self._by_meter[code], self._dates_by_meter[code], start, end)
+            for code in dict.fromkeys(meter_codes)
+            if code in self._by_meter
+        ]
+
+        if len(slices) == 1:
+            return list(slices[0])
+
+        return list(heapq.merge(*slices, key=_get_taken_on))
+
+    def get_latest(self, meter_code: Optional[str] = None) -> Optional[Indication]:
+        indications = self._indications if meter_code is None else self.get_for_meter(meter_code)
+        return indications[-1] if indications else None
+
+    def get_latest_per_meter(self) -> Dict[str, Indication]:
+        return {code: indications[-1] for code, indications in self._by_meter.items()}
+
+    def to_columns(self) -> ColumnarData:
+        """Export as typed arrays (requires numpy)"""
+        return indications_to_columns(self._indications)
+
+    @staticmethod
+    def _slice(
+        indications: Sequence[Indication],
+        dates: Sequence[date],
+        start: Optional[date],
+        end: Optional[date],
+    ) -> Sequence[Indication]:
+        lo = 0 if start is None else bisect_left(dates, start)
+        hi = len(dates) if end is None else bisect_right(dates, end)
+        return indications[lo:hi]
+
+
+@attr.s(kw_only=True, frozen=True, slots=True)
+class Payment(DataMapping):
+    transaction_id: str = attr.ib()
+    paid_at: datetime = attr.ib()
+    source: str = attr.ib()
+    amount: float = attr.ib()
+
+
+class PaymentList(List[Payment]):
+    def to_columns(self) -> ColumnarData:
+        """Export as typed arrays (requires numpy)"""
+        return payments_to_columns(self)
+
+
+def _get_paid_at(payment: Payment) -> datetime:
+    return payment.paid_at
+
+
+class PaymentHistory:
+    """Payments sorted by payment time, with totals per year and per source.
+
+    Range queries cost O(log n + k), the latest payment is available in O(1)."""
+
+    __slots__ = ("_payments", "_paid_at", "_totals_by_year", "_totals_by_source")
+
+    def __init__(self, payments: Iterable[Payment]) -> None:
+        payments = tuple(sorted(payments, key=_get_paid_at))
+        totals_by_year: Dict[int, float] = {}
+        totals_by_source: Dict[Optional[str], float] = {}
+
+        for payment in payments:
+            year = payment.paid_at.year
+            totals_by_year[year] = totals_by_year.get(year, 0.0) + payment.amount
+            totals_by_source[payment.source] = (
+                totals_by_source.get(payment.source, 0.0) + payment.amount
+            )
+
+        self._payments = payments
+        self._paid_at = tuple(map(_get_paid_at, payments))
+        self._totals_by_year = MappingProxyType(totals_by_year)
+        self._totals_by_source = MappingProxyType(totals_by_source)
+
+    @classmethod
+    def from_response(cls, response: GetPaymentsPage) -> "PaymentHistory":
+        """Get history of a response; it is built once and kept on the response object"""
+        history = response.payment_history
+        if history is None:
+            history = cls(
+                Payment(
+                    transaction_id=payment.transaction_id,
+                    paid_at=payment.datetime or datetime.fromordinal(payment.date.toordinal()),
+                    source=payment.source,
+                    amount=payment.amount,
+                )
+                for payments_data_list in response.history.values()
+                for payment in payments_data_list
+                if payment.datetime is not None or payment.date is not None
+            )
+            object.__setattr__(response, "payment_history", history)
+        return history
+
+    def __len__(self) -> int:
+        return len(self._payments)
+
+    def __iter__(self) -> Iterator[Payment]:
+        return iter(self._payments)
+
+    @property
+    def latest(self) -> Optional[Payment]:
+        return self._payments[-1] if self._payments else None
+
+    @property
+    def totals_by_year(self) -> Mapping[int, float]:
+        return self._totals_by_year
+
+    @property
+    def totals_by_source(self) -> Mapping[Optional[str], float]:
+        return self._totals_by_source
+
+    def get_range(
+        self,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+    ) -> List[Payment]:
+        """Get payments made between start and end (both inclusive), ordered by payment time"""
+        paid_at = self._paid_at
+        lo = 0 if start is None else bisect_left(paid_at, start)
+        hi = len(paid_at) if end is None else bisect_right(paid_at, end)
+        return list(self._payments[lo:hi])
+
+    def to_columns(self) -> ColumnarData:
+        """Export as typed arrays (requires numpy)"""
+        return payments_to_columns(self._payments)
+
+
+@attr.s(kw_only=True, frozen=True, slots=True)
+class Account(DataMapping):
+    api: "TNSEnergoAPI" = attr.ib(repr=False)
+    address: str = attr.ib()
+    debt: float = attr.ib()
+    code: str = attr.ib()
+    email: str = attr.ib()
+    digital_invoices_ignored: bool = attr.ib()
+    digital_invoices_email: str = attr.ib()
+    digital_invoices_enabled: bool = attr.ib()
+    digital_invoices_email_comment: str = attr.ib()
+    is_controlled: bool = attr.ib()
+    is_controlling: bool = attr.ib()
+    controlled_by_code: str = attr.ib()
+
+    @property
+    def balance(self) -> float:
+        return -self.debt
+
+    async def async_get_meters(self) -> Mapping[str, "Meter"]:
+        response = await SendIndicationsPage.async_request(self.api, self.code)
+        return self._make_meters_from_response(response)
+
+    def _make_meters_from_response(self, response: SendIndicationsPage) -> Dict[str, "Meter"]:
+        meters = {}
+        for meter_id, zone_data_list in response.counters.items():
+            if not zone_data_list:
+                continue
+            first_tariff = next(iter(zone_data_list))
+            meters[first_tariff.code] = Meter(
+                account=self,
+                identifier=meter_id,
+                code=first_tariff.code,
+                can_delete=first_tariff.can_delete,
+                checkup_date=first_tariff.checkup_date,
+                checkup_status=first_tariff.checkup_status,
+                checkup_url=first_tariff.checkup_url,
+                last_checkup_date=first_tariff.last_checkup_date,
+                manufactured_date=first_tariff.manufactured_date,
+                transmission_coefficient=first_tariff.transmission_coefficient,
+                last_indications_date=first_tariff.last_indications_date,
+                install_location=first_tariff.install_location,
+                model=first_tariff.model,
+                precision=first_tariff.precision,
+                status=first_tariff.status,
+                service_name=first_tariff.service_name,
+                service_number=first_tariff.service_number,
+                tariff_count=first_tariff.zone_count,
+                type=first_tariff.type,
+                zones=MappingProxyType(
+                    {
+                        ("t" + str(zone.index + 1)): MeterZone(
+                            identifier=zone.identifier,
+                            index=zone.index,
+                            name=zone.name.strip() or None,
+                            last_indication=zone.last_indication,
+                            max_indication_difference=zone.max_indication_difference,
+                            closing_indication=zone.closing_indication,
+                            label=zone.label,
+                        )
+                        for zone in zone_data_list
+                    }
+                ),
+            )
+
+        return meters
+
+    async def async_get_payments(
+        self,
+        start: Optional[Union[datetime, date]] = None,
+        end: Optional[Union[datetime, date]] = None,
+    ):
+        start, end = process_start_end_arguments(start, end)
+
+        history = await self.async_get_payment_history()
+
+        return PaymentList(history.get_range(start, end))
+
+    async def async_get_last_payment(self) -> Optional[Payment]:
+        history = await self.async_get_payment_history()
+
+        return history.latest
+
+    async def async_get_payment_history(self) -> PaymentHistory:
+        response = await GetPaymentsPage.async_request(self.api, self.code)
+
+        return PaymentHistory.from_response(response)
+
+    async def async_get_indications(
+        self,
+        start: Optional[Union[datetime, date]] = None,
+        end: Optional[Union[datetime, date]] = None,
+        meter_codes: Optional[Union[str, Iterable[str]]] = None,
+    ):
+        start, end = process_start_end_arguments(start, end)
+
+        history = await self.async_get_indication_history()
+
+        return IndicationList(history.get_range(start.date(), end.date(), meter_codes))
+
+    async def async_get_last_indication(
+        self, meter_code: Optional[str] = None
+    ) -> Optional[Indication]:
+        history = await self.async_get_indication_history()
+
+        return history.get_latest(meter_code)
+
+    async def async_get_indication_history(self) -> IndicationHistory:
+        response = await GetReadingsHistPage.async_request(self.api, self.code)
+
+        return IndicationHistory.from_response(response)
+
+    async def async_get_consumption(
+        self,
+        start: Optional[Union[datetime, date]] = None,
+        end: Optional[Union[datetime, date]] = None,
+        include_current: bool = True,
+    ) -> Mapping[str, List[ConsumptionPeriod]]:
+        meters, history = await asyncio.gather(
+            self.async_get_meters(),
+            self.async_get_indication_history(),
+        )
+
+        return {
+            meter_code: _filter_consumption(
+                compute_meter_consumption(
+                    meter, history.get_for_meter(meter_code), include_current
+                ),
+                start,
+                end,
+            )
+            for meter_code, meter in meters.items()
+        }
+
+
+def _filter_consumption(
+    periods: List[ConsumptionPeriod],
+    start: Optional[Union[datetime, date]],
+    end: Optional[Union[datetime, date]],
+) -> List[ConsumptionPeriod]:
+    if start is None and end is None:
+        return periods
+
+    start, end = process_start_end_arguments(start, end)
+    start_date, end_date = start.date(), end.date()
+
+    return [period for period in periods if start_date <= period.start and period.end <= end_date]
+
+
+@attr.s(kw_only=True, frozen=True, slots=True)
+class MeterZone(DataMapping):
+    identifier: str = attr.ib()
+    index: int = attr.ib()
+    name: Optional[str] = attr.ib()
+    last_indication: Optional[int] = attr.ib()
+    max_indication_difference: float = attr.ib()
+    closing_indication: Optional[float] = attr.ib()
+    label: str = attr.ib()
+
+
+@attr.s(kw_only=True, frozen=False, slots=True)
+class Meter(DataMapping):
+    account: "Account" = attr.ib(repr=False)
+    code: str = attr.ib()
+    can_delete: bool = attr.ib()
+    checkup_date: date = attr.ib()
+    checkup_status: int = attr.ib()
+    checkup_url: str = attr.ib()
+    last_checkup_date: date = attr.ib()
+    manufactured_date: date = attr.ib()
+    identifier: str = attr.ib()
+    transmission_coefficient: float = attr.ib()
+    last_indications_date: Optional[date] = attr.ib()
+    install_location: str = attr.ib()
+    model: str = attr.ib()
+    precision: int = attr.ib()
+    status: str = attr.ib()
+    service_name: str = attr.ib()
+    service_number: str = attr.ib()
+    tariff_count: int = attr.ib()
+    type: int = attr.ib()
+    zones: Mapping[str, MeterZone] = attr.ib()
+
+    async def async_get_indications(
+        self,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+    ):
+        return await self.account.async_get_indications(start, end, self.code)
+
+    async def async_get_last_indication(self) -> Optional[Indication]:
+        return await self.account.async_get_last_indication(self.code)
+
+    async def async_get_consumption(
+        self,
+        start: Optional[Union[datetime, date]] = None,
+        end: Optional[Union[datetime, date]] = None,
+        include_current: bool = True,
+    ) -> List[ConsumptionPeriod]:
+        history = await self.account.async_get_indication_history()
+
+        return _filter_consumption(
+            compute_meter_consumption(self, history.get_for_meter(self.code), include_current),
+            start,
+            end,
+        )
+
+    def _make_new_indications(
+        self, values: Mapping[str, SupportsInt], ignore_values: bool = False
+    ) -> List[NewIndication]:
+        issues = validate_indications(self, values, ignore_values)
+        if issues:
+            raise IndicationValidationException(issues)
+
+        zones = self.zones
+
+        return [
+            NewIndication(
+                meter_number=self.code,
+                indication=int(value),
+                label=zones[zone_id].label,
+                index=zones[zone_id].index,
+                identifier=zones[zone_id].identifier,
+            )
+            for zone_id, value in values.items()
+        ]
+
+    def validate_indications(
+        self, values: Mapping[str, SupportsInt], ignore_values: bool = False
+    ) -> List[ValidationIssue]:
+        return validate_indications(self, values, ignore_values)
+
+    async def async_send_indications(
+        self,
+        t1: Optional[SupportsInt] = None,
+        t2: Optional[SupportsInt] = None,
+        t3: Optional[SupportsInt] = None,
+        *,
+        ignore_values: bool = False,
+        **kwargs,
+    ):
+        # @TODO: this assumes multi-zone meters may accept arbitrary indications count
+
+        if t1 is not None:
+            kwargs["t1"] = t1
+
+        if t2 is not None:
+            kwargs["t2"] = t2
+
+        if t3 is not None:
+            kwargs["t3"] = t3
+
+        send_indications = self._make_new_indications(kwargs, ignore_values)
+
+        return await SendIndications.async_request(
+            self.account.api,
+            self.account.code,
+            send_indications,
+        )
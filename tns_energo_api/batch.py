@@ -0,0 +1,184 @@
+__all__ = (
+    "IndicationSubmission",
+    "SubmissionResult",
+    "async_send_indications_batch",
+    "validate_submissions",
+)
+
+import asyncio
+from itertools import chain
+from typing import Dict, Hashable, Iterable, List, Mapping, Optional, SupportsInt, Tuple, Union
+
+import attr
+
+from tns_energo_api import Account, Meter, NewIndication
+from tns_energo_api.exceptions import IndicationValidationException
+from tns_energo_api.requests.send_readings import ResultData, SendIndications
+from tns_energo_api.validation import IssueCode, ValidationIssue
+
+DEFAULT_BATCH_CONCURRENCY = 20
+
+
+@attr.s(kw_only=True, frozen=True, slots=True)
+class IndicationSubmission:
+    meter: Meter = attr.ib()
+    # Zone identifier (`t1`, `t2`, ...) to new indication
+    values: Mapping[str, SupportsInt] = attr.ib()
+    ignore_values: bool = attr.ib(default=False)
+
+    @property
+    def account(self) -> Account:
+        return self.meter.account
+
+
+@attr.s(kw_only=True, frozen=True, slots=True)
+class SubmissionResult:
+    """Outcome of a single submission.
+
+    Billing info (`result`) is returned by the server per request, hence it is shared by
+    every submission of an account sent in the same request."""
+
+    submission: IndicationSubmission = attr.ib()
+    result: Optional[ResultData] = attr.ib(default=None)
+    exception: Optional[BaseException] = attr.ib(default=None)
+
+    @property
+    def success(self) -> bool:
+        return self.exception is None
+
+
+SubmissionType = Union[
+    IndicationSubmission,
+    Tuple[Meter, Mapping[str, SupportsInt]],
+    Tuple[Account, Meter, Mapping[str, SupportsInt]],
+]
+
+
+def _make_submission(value: SubmissionType) -> Tuple[IndicationSubmission, List[ValidationIssue]]:
+    """Convert submission; issues of the submission itself (but not its values) are returned"""
+    if isinstance(value, IndicationSubmission):
+        return value, []
+    if len(value) == 2:
+        meter, values = value
+        return IndicationSubmission(meter=meter, values=values), []
+
+    account, meter, values = value
+    submission = IndicationSubmission(meter=meter, values=values)
+    if meter.account.code == account.code:
+        return submission, []
+    return submission, [
+        ValidationIssue(
+            meter_code=meter.code,
+            zone=None,
+            code=IssueCode.ACCOUNT_MISMATCH,
+            message=f"meter does not belong to account {account.code}",
+        )
+    ]
+
+
+def validate_submissions(submissions: Iterable[SubmissionType]) -> List[List[ValidationIssue]]:
+    """Validate submissions locally; returns issues of every submission, in order"""
+    results = []
+    for submission, issues in map(_make_submission, submissions):
+        issues.extend(
+            submission.meter.validate_indications(submission.values, submission.ignore_values)
+        )
+        results.append(issues)
+    return results
+
+
+# Submission index, submission and indications to send
+_BatchItem = Tuple[int, IndicationSubmission, List[NewIndication]]
+
+
+def _split_requests(
+    items: List[_BatchItem], max_meters_per_request: Optional[int]
+) -> List[List[_BatchItem]]:
+    # Every meter may appear only once per request; repeated submissions go to later requests
+    requests: List[List[_BatchItem]] = []
+    meter_codes: List[set] = []
+    for item in items:
+        code = item[1].meter.code
+        for chunk, codes in zip(requests, meter_codes):
+            if code not in codes and (
+                max_meters_per_request is None or len(chunk) < max_meters_per_request
+            ):
+                chunk.append(item)
+                codes.add(code)
+                break
+        else:
+            requests.append([item])
+            meter_codes.append({code})
+    return requests
+
+
+async def _async_send_request(
+    items: List[_BatchItem],
+    results: List[Optional[SubmissionResult]],
+) -> None:
+    account = items[0][1].account
+    indications = list(chain.from_iterable(item[2] for item in items))
+
+    try:
+        response = await SendIndications.async_request(account.api, account.code, indications)
+    except Exception as e:
+        for index, submission, _ in items:
+            results[index] = SubmissionResult(submission=submission, exception=e)
+    else:
+        for index, submission, _ in items:
+            results[index] = SubmissionResult(submission=submission, result=response.data)
+
+
+async def async_send_indications_batch(
+    submissions: Iterable[SubmissionType],
+    *,
+    concurrency: int = DEFAULT_BATCH_CONCURRENCY,
+    max_meters_per_request: Optional[int] = None,
+) -> List[SubmissionResult]:
+    """Submit indications of many meters, grouping meters of an account into one request.
+
+    Submissions are accepted as `IndicationSubmission` objects, (meter, values) or
+    (account, meter, values) tuples. Up to `concurrency` requests run at once (further
+    limited by rate limiters of the API objects involved); requests of one account are sent
+    sequentially. Results are returned in the order of submissions, with failures reported
+    per item instead of being raised. Submissions failing local validation are reported with
+    `IndicationValidationException` before any request is sent."""
+    if concurrency < 1:
+        raise ValueError("concurrency must be positive")
+    if max_meters_per_request is not None and max_meters_per_request < 1:
+        raise ValueError("max_meters_per_request must be positive")
+
+    converted = list(map(_make_submission, submissions))
+    results: List[Optional[SubmissionResult]] = [None] * len(converted)
+
+    groups: Dict[Hashable, List[_BatchItem]] = {}
+    for index, (submission, issues) in enumerate(converted):
+        # Invalid submissions are reported without sending anything
+        meter = submission.meter
+        try:
+            if issues:
+                issues.extend(
+                    meter.validate_indications(submission.values, submission.ignore_values)
+                )
+                raise IndicationValidationException(issues)
+            indications = meter._make_new_indications(submission.values, submission.ignore_values)
+        except IndicationValidationException as e:
+            results[index] = SubmissionResult(submission=submission, exception=e)
+            continue
+
+        account = submission.account
+        groups.setdefault((id(account.api), account.code), []).append(
+            (index, submission, indications)
+        )
+
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def _async_send_account(items: List[_BatchItem]) -> None:
+        for request_items in _split_requests(items, max_meters_per_request):
+            async with semaphore:
+                await _async_send_request(request_items, results)
+
+    await asyncio.gather(*map(_async_send_account, groups.values()))
+
+    # noinspection PyTypeChecker
+    return results
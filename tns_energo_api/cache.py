@@ -0,0 +1,165 @@
+__all__ = (
+    "CacheKey",
+    "ResponseCache",
+    "DEFAULT_ACTION_TTLS",
+    "is_cacheable_response",
+    "make_cache_key",
+)
+
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Iterable, Mapping, Optional, Tuple, Union
+
+from tns_energo_api.converters import conv_bool
+
+CacheKey = Tuple[str, str, Optional[str]]
+
+DEFAULT_CACHE_SIZE = 1024
+DEFAULT_CACHE_TTL = 60.0
+
+DEFAULT_ACTION_TTLS: Mapping[str, float] = {
+    "getReadingsHistPage": 300.0,
+    "getSendReadingsPage": 60.0,
+    "getPaymentsHistPage": 300.0,
+    "getMainpage": 60.0,
+    "getDigitalReceiptStatus": 300.0,
+    "getInfo": 600.0,
+}
+
+
+def make_cache_key(path: Union[str, Iterable[Any]]) -> Optional[CacheKey]:
+    """Extract (region, action, account code) from a request path, if possible"""
+    if isinstance(path, str):
+        return None
+
+    path = tuple(map(str, path))
+    params = dict(zip(path[::2], path[1::2]))
+
+    try:
+        return params["region"], params["action"], params.get("ls")
+    except KeyError:
+        return None
+
+
+def is_cacheable_response(response_json: Any) -> bool:
+    """Whether a decoded response may be cached: error payloads (with a false-valued `result`)
+    are not, so that transient server errors are not served from cache until expiry"""
+    if not isinstance(response_json, Mapping):
+        return False
+    try:
+        return conv_bool(response_json.get("result"))
+    except ValueError:
+        return False
+
+
+class ResponseCache:
+    """Size-bounded LRU cache of decoded responses with per-action expiry.
+
+    Entries are keyed by tuples starting with (region, action, account code). Actions with
+    a non-positive TTL are not cached at all. A single cache may be shared by many
+    `TNSEnergoAPI` instances.
+
+    Objects derived from a cached value (such as responses parsed out of it) may be attached
+    to its entry; they take no slots of their own, and are dropped together with the value."""
+
+    def __init__(
+        self,
+        max_size: int = DEFAULT_CACHE_SIZE,
+        default_ttl: float = DEFAULT_CACHE_TTL,
+        ttls: Optional[Mapping[str, float]] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if max_size < 1:
+            raise ValueError("max_size must be positive")
+
+        self._max_size = max_size
+        self._default_ttl = default_ttl
+        self._ttls = dict(DEFAULT_ACTION_TTLS if ttls is None else ttls)
+        self._clock = clock
+        # Expiry time, value and objects derived from the value
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any, Dict[Hashable, Any]]]" = (
+            OrderedDict()
+        )
+
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def max_size(self) -> int:
+        return self._max_size
+
+    def get_ttl(self, action: str) -> float:
+        return self._ttls.get(action, self._default_ttl)
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        entries = self._entries
+        try:
+            expires_at, value, _ = entries[key]
+        except KeyError:
+            self.misses += 1
+            return None
+
+        if expires_at <= self._clock():
+            del entries[key]
+            self.misses += 1
+            return None
+
+        entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        ttl = self.get_ttl(key[1])
+        if ttl <= 0:
+            return
+
+        entries = self._entries
+        entries[key] = (self._clock() + ttl, value, {})
+        entries.move_to_end(key)
+
+        while len(entries) > self._max_size:
+            entries.popitem(last=False)
+
+    def get_derived(self, key: Hashable, derived_key: Hashable) -> Optional[Any]:
+        """Object attached with `set_derived` to a live entry, if any"""
+        entries = self._entries
+        entry = entries.get(key)
+        if entry is None or entry[0] <= self._clock():
+            return None
+
+        value = entry[2].get(derived_key)
+        if value is not None:
+            entries.move_to_end(key)
+            self.hits += 1
+        return value
+
+    def set_derived(self, key: Hashable, derived_key: Hashable, value: Any) -> None:
+        """Attach object derived from value of a live entry; ignored when there is none"""
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] > self._clock():
+            entry[2][derived_key] = value
+
+    def invalidate(
+        self,
+        region: Optional[str] = None,
+        code: Optional[str] = None,
+        action: Optional[str] = None,
+    ) -> int:
+        """Drop entries matching every provided criteria; return amount of dropped entries"""
+        entries = self._entries
+        drop = [
+            key
+            for key in entries
+            if (region is None or key[0] == region)
+            and (action is None or key[1] == action)
+            and (code is None or key[2] == code)
+        ]
+        for key in drop:
+            del entries[key]
+        return len(drop)
+
+    def clear(self) -> None:
+        self._entries.clear()
@@ -0,0 +1,119 @@
+__all__ = (
+    "ColumnarData",
+    "indications_to_columns",
+    "payments_to_columns",
+)
+
+from typing import Any, Dict, Iterable, Iterator, Mapping, Optional, Sequence, TYPE_CHECKING, Tuple
+
+import attr
+
+if TYPE_CHECKING:
+    import numpy as np
+    from tns_energo_api import Indication, Payment
+
+DEFAULT_ZONES = ("t1", "t2", "t3")
+
+
+def _import_numpy():
+    try:
+        import numpy
+    except ImportError:
+        raise ImportError(
+            "numpy is required for columnar export; install it with `tns-energo-api[numpy]`"
+        ) from None
+    return numpy
+
+
+def _factorize(values: Sequence[Optional[str]]) -> Tuple[Sequence[int], Tuple[str, ...]]:
+    # Missing values are coded as -1, in line with `pandas.Categorical.from_codes`
+    categories: Dict[str, int] = {}
+    codes = [
+        -1 if value is None else categories.setdefault(value, len(categories)) for value in values
+    ]
+    return codes, tuple(categories)
+
+
+@attr.s(kw_only=True, frozen=True, slots=True)
+class ColumnarData(Mapping):
+    """Equal-length typed arrays keyed by column name.
+
+    Categorical columns hold integer codes, with labels of every code provided by
+    `categories` under the same column name."""
+
+    columns: Mapping[str, "np.ndarray"] = attr.ib()
+    categories: Mapping[str, Tuple[str, ...]] = attr.ib(factory=dict)
+
+    def __getitem__(self, item: str) -> "np.ndarray":
+        return self.columns[item]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.columns)
+
+    def __len__(self) -> int:
+        return len(self.columns)
+
+    def decode(self, column: str) -> Sequence[Optional[str]]:
+        labels = self.categories[column]
+        return [None if code < 0 else labels[code] for code in self.columns[column].tolist()]
+
+    def to_pandas(self) -> Any:
+        import pandas
+
+        return pandas.DataFrame(
+            {
+                name: (
+                    pandas.Categorical.from_codes(values, self.categories[name])
+                    if name in self.categories
+                    else values
+                )
+                for name, values in self.columns.items()
+            }
+        )
+
+
+def indications_to_columns(
+    indications: Iterable["Indication"],
+    zones: Sequence[str] = DEFAULT_ZONES,
+) -> ColumnarData:
+    """Columns: taken_on (datetime64[D]), meter_code (categorical), status (int64) and one
+    float64 value column per zone, with NaN where a zone is missing from an indication"""
+    np = _import_numpy()
+
+    indications = indications if isinstance(indications, Sequence) else tuple(indications)
+    count = len(indications)
+
+    meter_codes, meter_categories = _factorize([item.meter_code for item in indications])
+    nan = float("nan")
+
+    columns = {
+        "taken_on": np.array([item.taken_on for item in indications], dtype="datetime64[D]"),
+        "meter_code": np.array(meter_codes, dtype=np.int32),
+        "status": np.fromiter((item.status for item in indications), np.int64, count),
+    }
+    for zone in zones:
+        columns[zone] = np.fromiter(
+            (item.zones.get(zone, nan) for item in indications), np.float64, count
+        )
+
+    return ColumnarData(columns=columns, categories={"meter_code": meter_categories})
+
+
+def payments_to_columns(payments: Iterable["Payment"]) -> ColumnarData:
+    """Columns: paid_at (datetime64[s]), amount (float64), source (categorical) and
+    transaction_id (object)"""
+    np = _import_numpy()
+
+    payments = payments if isinstance(payments, Sequence) else tuple(payments)
+    count = len(payments)
+
+    sources, source_categories = _factorize([item.source for item in payments])
+
+    columns = {
+        "paid_at": np.array([item.paid_at for item in payments], dtype="datetime64[s]"),
+        "amount": np.fromiter((item.amount for item in payments), np.float64, count),
+        "source": np.array(sources, dtype=np.int32),
+        "transaction_id": np.array([item.transaction_id for item in payments], dtype=object),
+    }
+
+    return ColumnarData(columns=columns, categories={"source": source_categories})
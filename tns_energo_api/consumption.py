@@ -0,0 +1,221 @@
+__all__ = (
+    "ConsumptionPeriod",
+    "compute_meter_consumption",
+    "compute_deltas",
+    "summarize_consumption",
+)
+
+from datetime import date
+from typing import Iterable, List, Mapping, Optional, Sequence, Set, TYPE_CHECKING, Tuple
+
+import attr
+
+if TYPE_CHECKING:
+    from tns_energo_api import Indication, Meter
+
+
+@attr.s(kw_only=True, frozen=True, slots=True)
+class ConsumptionPeriod:
+    """Consumption of a single meter zone between two consecutive indications.
+
+    `consumption` is None when the indication decreased without a plausible rollover
+    (e.g. after a meter replacement or reset); such periods start a new baseline."""
+
+    meter_code: str = attr.ib()
+    zone: str = attr.ib()
+    start: date = attr.ib()
+    end: date = attr.ib()
+    start_value: int = attr.ib()
+    end_value: int = attr.ib()
+    consumption: Optional[float] = attr.ib()
+    rollover: bool = attr.ib(default=False)
+
+    @property
+    def is_reset(self) -> bool:
+        return self.consumption is None
+
+
+# Below this many values, plain Python outperforms numpy (array conversion overhead dominates)
+NUMPY_MIN_VALUES = 1000
+
+# Start and end (exclusive) positions of a zone within stacked values, and rollover threshold
+_Segment = Tuple[int, int, float]
+
+
+def _get_wrap(precision: Optional[int]) -> Optional[int]:
+    return 10 ** precision if precision and precision > 0 else None
+
+
+def _get_threshold(wrap: Optional[int], max_difference: Optional[float]) -> float:
+    return max_difference if max_difference and max_difference > 0 else (wrap or 0) / 2
+
+
+def _compute_deltas_python(
+    values: Sequence[float], segments: Sequence[_Segment], wrap: Optional[int]
+) -> Tuple[List[float], Set[int], Set[int]]:
+    deltas = [current - previous for previous, current in zip(values, values[1:])]
+    rollovers, resets = set(), set()
+    for start, end, threshold in segments:
+        for position in range(start, end - 1):
+            delta = deltas[position]
+            if delta < 0:
+                if wrap is not None and delta + wrap <= threshold:
+                    deltas[position] = delta + wrap
+                    rollovers.add(position)
+                else:
+                    resets.add(position)
+    return deltas, rollovers, resets
+
+
+def _compute_deltas_numpy(
+    np, values: Sequence[float], segments: Sequence[_Segment], wrap: Optional[int]
+) -> Tuple[List[float], Set[int], Set[int]]:
+    deltas = np.diff(np.asarray(values))
+    decreased = deltas < 0
+    # Differences across zone boundaries are meaningless
+    decreased[[end - 1 for _, end, _ in segments[:-1]]] = False
+
+    if wrap is None:
+        rollovers = np.zeros_like(decreased)
+    else:
+        thresholds = np.repeat(
+            [threshold for _, _, threshold in segments],
+            [end - start for start, end, _ in segments],
+        )[:-1]
+        rollovers = decreased & (deltas + wrap <= thresholds)
+        deltas = np.where(rollovers, deltas + wrap, deltas)
+
+    # Flags are sparse; positions are converted instead of whole masks
+    return (
+        deltas.tolist(),
+        set(np.flatnonzero(rollovers).tolist()),
+        set(np.flatnonzero(decreased & ~rollovers).tolist()),
+    )
+
+
+def _compute_segment_deltas(
+    values: Sequence[float], segments: Sequence[_Segment], wrap: Optional[int]
+) -> Tuple[List[float], Set[int], Set[int]]:
+    """Deltas between consecutive stacked values (positions of rollovers and resets among
+    them), in a single pass over every segment. Uses numpy for large inputs when available."""
+    if len(values) >= NUMPY_MIN_VALUES:
+        try:
+            import numpy as np
+        except ImportError:
+            pass
+        else:
+            return _compute_deltas_numpy(np, values, segments, wrap)
+    return _compute_deltas_python(values, segments, wrap)
+
+
+def compute_deltas(
+    values: Sequence[float],
+    precision: Optional[int] = None,
+    max_difference: Optional[float] = None,
+) -> Tuple[Sequence[float], Sequence[bool], Sequence[bool]]:
+    """Compute differences between consecutive readings of one meter zone.
+
+    Returns deltas, rollover flags and reset flags (n - 1 items each). A decrease is treated
+    as a rollover when the meter has `precision` integer digits and the wrapped delta does not
+    exceed `max_difference` (or half of the dial when no limit is known); otherwise it is
+    flagged as a reset. Uses numpy for large inputs when available."""
+    if len(values) < 2:
+        return [], [], []
+
+    wrap = _get_wrap(precision)
+    deltas, rollovers, resets = _compute_segment_deltas(
+        values, [(0, len(values), _get_threshold(wrap, max_difference))], wrap
+    )
+    positions = range(len(deltas))
+    return (
+        deltas,
+        [position in rollovers for position in positions],
+        [position in resets for position in positions],
+    )
+
+
+def compute_meter_consumption(
+    meter: "Meter",
+    indications: Iterable["Indication"],
+    include_current: bool = True,
+) -> List[ConsumptionPeriod]:
+    """Compute per-zone consumption periods of a meter out of its (date-ordered) indications.
+
+    Transmission coefficient of the meter is applied to every delta. With `include_current`,
+    a final period up to the current zone indications of the meter is appended when those are
+    newer than the last provided indication."""
+    indications = [item for item in indications if item.meter_code == meter.code]
+    coefficient = meter.transmission_coefficient or 1.0
+    wrap = _get_wrap(meter.precision)
+
+    # Readings of every zone are stacked to compute deltas in one pass
+    dates: List[date] = []
+    values: List[int] = []
+    zone_segments: List[Tuple[str, int, int]] = []
+    segments: List[_Segment] = []
+
+    for zone_id, zone in meter.zones.items():
+        zone_dates = [item.taken_on for item in indications if zone_id in item.zones]
+        zone_values = [item.zones[zone_id] for item in indications if zone_id in item.zones]
+
+        current = zone.last_indication
+        if include_current and current is not None and zone_dates:
+            current_date = meter.last_indications_date or date.today()
+            if current_date > zone_dates[-1]:
+                zone_dates.append(current_date)
+                zone_values.append(current)
+
+        if len(zone_values) < 2:
+            continue
+
+        start = len(values)
+        dates.extend(zone_dates)
+        values.extend(zone_values)
+        zone_segments.append((zone_id, start, len(values)))
+        segments.append(
+            (start, len(values), _get_threshold(wrap, zone.max_indication_difference))
+        )
+
+    if not segments:
+        return []
+
+    deltas, rollovers, resets = _compute_segment_deltas(values, segments, wrap)
+    consumptions: List[Optional[float]] = [delta * coefficient for delta in deltas]
+    for position in resets:
+        consumptions[position] = None
+
+    # Objects are built only once every delta is known
+    meter_code = meter.code
+    periods = [
+        ConsumptionPeriod(
+            meter_code=meter_code,
+            zone=zone_id,
+            start=start_date,
+            end=end_date,
+            start_value=start_value,
+            end_value=end_value,
+            consumption=period_consumption,
+            rollover=position in rollovers,
+        )
+        for zone_id, start, end in zone_segments
+        for position, start_date, end_date, start_value, end_value, period_consumption in zip(
+            range(start, end - 1),
+            dates[start:end],
+            dates[start + 1 : end],
+            values[start:end],
+            values[start + 1 : end],
+            consumptions[start:end],
+        )
+    ]
+
+    periods.sort(key=lambda period: (period.end, period.zone))
+    return periods
+
+
+def summarize_consumption(periods: Iterable[ConsumptionPeriod]) -> Mapping[str, float]:
+    """Total consumption per zone, ignoring reset periods"""
+    totals = {}
+    for period in periods:
+        if period.consumption is not None:
+            totals[period.zone] = totals.get(period.zone, 0.0) + period.consumption
+    return totals
@@ -1,11 +1,23 @@
+import functools
 import inspect
 from abc import ABC
 from datetime import date, datetime
-from typing import Any, Callable, Mapping, Optional, Type, TypeVar, Union
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    ClassVar,
+    Mapping,
+    Optional,
+    Tuple,
+    Type,
+    TypeVar,
+    Union,
+)
 
 import attr
 
-from tns_energo_api.exceptions import ResponseException
+from tns_energo_api.exceptions import ResponseException, SessionExpiredException
 
 
 def conv_bool(value: Union[bool, str]) -> bool:
@@ -29,6 +41,58 @@ def conv_int(value: Union[int, str]) -> int:
     return int(str(value).strip())
 
 
+DATE_PARSE_CACHE_SIZE = 4096
+
+
+def _parse_date_strptime(value: str) -> date:
+    try:
+        dt = datetime.strptime(value, "%d.%m.%y")
+    except ValueError:
+        dt = datetime.strptime(value, "%d.%m.%Y")
+
+    return dt.date()
+
+
+@functools.lru_cache(maxsize=DATE_PARSE_CACHE_SIZE)
+def _parse_date(value: str) -> date:
+    # Fast path for `DD.MM.YY` and `DD.MM.YYYY`; anything else is left to `strptime`
+    parts = value.split(".")
+    if len(parts) == 3:
+        day, month, year = parts
+        if (
+            0 < len(day) < 3
+            and 0 < len(month) < 3
+            and value.isascii()
+            and day.isdigit()
+            and month.isdigit()
+            and year.isdigit()
+        ):
+            if len(year) == 2:
+                # Same pivot `strptime` uses for `%y`
+                year = int(year)
+                return date(year + (2000 if year < 69 else 1900), int(month), int(day))
+            if len(year) == 4:
+                return date(int(year), int(month), int(day))
+
+    return _parse_date_strptime(value)
+
+
+@functools.lru_cache(maxsize=DATE_PARSE_CACHE_SIZE)
+def _parse_datetime(value: str) -> datetime:
+    # `YYYYmmddHHMMSS`
+    if value.isascii() and value.isdigit():
+        return datetime(
+            int(value[0:4]),
+            int(value[4:6]),
+            int(value[6:8]),
+            int(value[8:10]),
+            int(value[10:12]),
+            int(value[12:14]),
+        )
+
+    return datetime.strptime(value, "%Y%m%d%H%M%S")
+
+
 def conv_date_optional(value: Optional[Union[date, str]]) -> Optional[date]:
     if value is None:
         return None
@@ -40,12 +104,7 @@ def conv_date_optional(value: Optional[Union[date, str]]) -> Optional[date]:
     if not value:
         return None
 
-    try:
-        dt = datetime.strptime(value, "%d.%m.%y")
-    except ValueError:
-        dt = datetime.strptime(value, "%d.%m.%Y")
-
-    return dt.date()
+    return _parse_date(value)
 
 
 def conv_datetime_optional(value: Optional[Union[datetime, str]]) -> Optional[datetime]:
@@ -62,7 +121,7 @@ def conv_datetime_optional(value: Optional[Union[datetime, str]]) -> Optional[da
     if len(value) != 14:
         raise ValueError(f"datetime can only be converted from long string (14len). Actual: {value}")
 
-    return datetime.strptime(value, "%Y%m%d%H%M%S")
+    return _parse_datetime(value)
 
 
 _T = TypeVar("_T")
@@ -109,10 +168,26 @@ def wrap_str_stripped(conv: Callable[[str], _RT]) -> Callable[[Any], _RT]:
 META_SOURCE_DATA_KEY = "source_data_key"
 
 
+DecodePlan = Tuple[Tuple[str, str], ...]
+
+
+def _build_decode_plan(cls) -> DecodePlan:
+    """Create (source data key, init argument name) pairs for an attrs class"""
+    # noinspection PyDataclass
+    return tuple(
+        (field.metadata.get(META_SOURCE_DATA_KEY, field.name), field.name.lstrip("_"))
+        for field in attr.fields(cls)
+        if field.init and field.metadata.get(META_SOURCE_DATA_KEY, field.name)
+    )
+
+
 class DataMapping(Mapping, ABC):
     _meta_search: Mapping[str, str] = NotImplemented
+    _decode_plan: Optional[DecodePlan] = None
 
     def __init_subclass__(cls, **kwargs):
+        # attrs with `slots=True` recreates classes, so this gets called once fields are known
+        cls._decode_plan = None
         if not inspect.isabstract(cls):
             if attr.has(cls):
                 cls._meta_search = {
@@ -120,6 +195,7 @@ class DataMapping(Mapping, ABC):
                     for field in attr.fields(cls)
                     if META_SOURCE_DATA_KEY in field.metadata
                 }
+                cls._decode_plan = _build_decode_plan(cls)
         return super().__init_subclass__(**kwargs)
 
     def convert_to(self, cls: Type[_T], **kwargs) -> _T:
@@ -143,18 +219,21 @@ class DataMapping(Mapping, ABC):
 
     @classmethod
     def from_response(cls, data: Mapping[str, Any], **kwargs):
-        if not attr.has(cls):
-            raise TypeError("DataMapping.from_response may only be used on attrs classes")
-
-        init_args = {}
+        decode_plan = cls._decode_plan
+        if decode_plan is None:
+            if not attr.has(cls):
+                raise TypeError("DataMapping.from_response may only be used on attrs classes")
+            # Classes decorated without slots are only complete after `__init_subclass__`
+            decode_plan = cls._decode_plan = _build_decode_plan(cls)
 
-        # noinspection PyDataclass
-        for field in attr.fields(cls):
-            data_field = field.metadata.get(META_SOURCE_DATA_KEY, field.name)
-            if data_field and data_field in data:
-                init_args[field.name.lstrip("_")] = data[data_field]
+        init_args = {
+            init_name: data[data_field]
+            for data_field, init_name in decode_plan
+            if data_field in data
+        }
 
-        init_args.update(kwargs)
+        if kwargs:
+            init_args.update(kwargs)
 
         return cls(**init_args)  # type: ignore[call-arg]
 
@@ -169,6 +248,8 @@ class DataMapping(Mapping, ABC):
 
 
 class RequestMapping(DataMapping):
+    ACTION: ClassVar[Optional[str]] = None
+
     @classmethod
     def from_response(cls, data: Mapping[str, Any], **kwargs):
         if not conv_bool(data["result"]):
@@ -189,3 +270,64 @@ class RequestMapping(DataMapping):
             raise ResponseException(code, msg)
 
         return super().from_response(data, **kwargs)
+
+
+def shared_request(func: Callable[..., Awaitable[_T]]) -> Callable[..., Awaitable[_T]]:
+    """Coalesce concurrent identical `async_request` calls into one request and one parsed result.
+
+    When the API object has a response cache, parsed results of request mappings with an
+    `ACTION` are attached to cached responses they were parsed from (the account code must be
+    the first argument), so derived indexes built on them are reused too, without taking cache
+    slots of their own. Must be applied below `@classmethod`."""
+
+    @functools.wraps(func)
+    async def wrapper(cls, on, *args, **kwargs):
+        cache = on.cache
+        cache_key = derived_key = None
+        if cache is not None and cls.ACTION is not None and args and not kwargs:
+            cache_key = (on.region, cls.ACTION, str(args[0]))
+            derived_key = (cls, args[1:])
+            response = cache.get_derived(cache_key, derived_key)
+            if response is not None:
+                return response
+
+        response = await on.async_single_flight(
+            (cls, args, tuple(sorted(kwargs.items()))),
+            lambda: func(cls, on, *args, **kwargs),
+        )
+
+        if cache_key is not None:
+            cache.set_derived(cache_key, derived_key, response)
+
+        return response
+
+    return wrapper
+
+
+def reauthenticating(func: Callable[..., Awaitable[_T]]) -> Callable[..., Awaitable[_T]]:
+    """Authenticate again and repeat `async_request` once when the session has expired.
+
+    Besides `SessionExpiredException`, error payloads with codes listed in
+    `TNSEnergoAPI.session_expired_error_codes` signify expiry (and are raised as
+    `SessionExpiredException` when re-authentication is disabled). Concurrent callers hitting
+    an expired session share a single authorization request. Must be applied below
+    `@classmethod` (and below `shared_request`, so that coalesced callers share the repeated
+    request as well)."""
+
+    @functools.wraps(func)
+    async def wrapper(cls, on, *args, **kwargs):
+        generation = on.authentication_generation
+        try:
+            return await func(cls, on, *args, **kwargs)
+        except SessionExpiredException:
+            if not on.reauthenticate:
+                raise
+        except ResponseException as e:
+            if not e.args or str(e.args[0]) not in on.session_expired_error_codes:
+                raise
+            if not on.reauthenticate:
+                raise SessionExpiredException(*e.args) from e
+        await on.async_reauthenticate(generation)
+        return await func(cls, on, *args, **kwargs)
+
+    return wrapper
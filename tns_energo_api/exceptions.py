@@ -20,3 +20,28 @@ class RequestTimeoutException(RequestException):
 
 class EmptyResultException(ResponseResultException):
     """Response contains empty result"""
+
+
+class CircuitOpenException(RequestException):
+    """Requests to endpoint are suspended after repeated failures"""
+
+    def __init__(self, endpoint, retry_after: float) -> None:
+        super().__init__(
+            "Requests to %s are suspended for %.1f more seconds" % (endpoint, retry_after)
+        )
+        self.endpoint = endpoint
+        self.retry_after = retry_after
+
+
+class SessionExpiredException(ResponseException):
+    """Server-side session has expired, authentication is required"""
+
+
+class IndicationValidationException(TNSEnergoException, ValueError, TypeError):
+    """Indications failed local validation; `issues` lists every problem found.
+
+    Subclasses `TypeError` as well, which unknown zones used to be reported with."""
+
+    def __init__(self, issues) -> None:
+        super().__init__("; ".join(map(str, issues)))
+        self.issues = tuple(issues)
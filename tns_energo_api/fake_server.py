@@ -0,0 +1,683 @@
+"""Local stand-in for the TNS Energo mobile API, for offline testing and load testing.
+
+Example:
+
+    async with FakeTNSEnergoServer(accounts=1000, latency=(0.01, 0.05)) as server:
+        for username, password in server.credentials:
+            api = TNSEnergoAPI(username, password, base_url=server.base_url)
+            ...
+"""
+
+__all__ = (
+    "FakeAccount",
+    "FakeMeter",
+    "FakeTNSEnergoServer",
+    "SESSION_EXPIRY_MODES",
+    "make_account_info_payload",
+    "make_authorization_payload",
+    "make_digital_receipt_status_payload",
+    "make_info_payload",
+    "make_ls_list_payload",
+    "make_main_page_payload",
+    "make_payments_page_payload",
+    "make_readings_hist_page_payload",
+    "make_send_readings_page_payload",
+    "make_send_readings_result_payload",
+)
+
+import asyncio
+import json
+import random
+import re
+import secrets
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple, Union
+
+import attr
+from aiohttp import web
+
+from tns_energo_api import TNSEnergoAPI
+
+ZONE_SOURCE_CODES = ("pik", "night", "ppik")
+ZONE_LABELS = ("T1", "T2", "T3")
+ZONE_NAMES = ("День", "Ночь", "Пик")
+PAYMENT_SOURCES = (
+    "Сбербанк",
+    "Почта России",
+    "Мобильное приложение",
+)
+
+SESSION_COOKIE = "TNS_SESSION"
+
+LatencyType = Union[float, Tuple[float, float]]
+
+# Ways of reporting requests of expired sessions: HTTP 401 status, redirect to the login page,
+# or error payload with code 401 (which clients have to be configured to recognize, with
+# `TNSEnergoAPI(session_expired_error_codes=(401,))`)
+SESSION_EXPIRY_MODES = ("status", "redirect", "payload")
+LOGIN_PAGE_PATH = "/login/"
+
+
+#################################################################################
+# Synthetic data
+#################################################################################
+
+
+@attr.s(kw_only=True, slots=True)
+class FakeMeter:
+    identifier: str = attr.ib()
+    code: str = attr.ib()
+    precision: int = attr.ib(default=6)
+    transmission_coefficient: float = attr.ib(default=1.0)
+    max_indication_difference: float = attr.ib(default=10000.0)
+    # Date -> indications per zone, in chronological order
+    history: Dict[date, Tuple[int, ...]] = attr.ib(factory=dict)
+
+    @property
+    def zone_count(self) -> int:
+        return len(next(iter(self.history.values()), (0,)))
+
+    @property
+    def last_indications(self) -> Tuple[Optional[date], Tuple[int, ...]]:
+        if not self.history:
+            return None, (0,) * self.zone_count
+        last_date = max(self.history)
+        return last_date, self.history[last_date]
+
+
+@attr.s(kw_only=True, slots=True)
+class FakeAccount:
+    code: str = attr.ib()
+    password: str = attr.ib()
+    address: str = attr.ib()
+    email: str = attr.ib()
+    balance: float = attr.ib(default=0.0)
+    meters: List[FakeMeter] = attr.ib(factory=list)
+    # (paid at, source, amount, transaction id)
+    payments: List[Tuple[datetime, str, float, str]] = attr.ib(factory=list)
+    dependent_codes: List[str] = attr.ib(factory=list)
+    controlled_by_code: Optional[str] = attr.ib(default=None)
+
+    @classmethod
+    def generate(
+        cls,
+        rng: random.Random,
+        code: str,
+        *,
+        meters: int = 1,
+        zones: int = 2,
+        history_months: int = 36,
+        payments_per_month: float = 1.0,
+        today: Optional[date] = None,
+    ) -> "FakeAccount":
+        today = today or date.today()
+        account = cls(
+            code=code,
+            password=secrets.token_hex(4),
+            address=(
+                f"г. Город, ул. Улица, д. {rng.randint(1, 200)}, "
+                f"кв. {rng.randint(1, 300)}"
+            ),
+            email=f"user{code}@example.com",
+            balance=round(rng.uniform(-3000, 500), 2),
+        )
+
+        months = [
+            _shift_month(today, -offset).replace(day=25)
+            for offset in range(1, history_months + 1)
+        ]
+        months.reverse()
+
+        for meter_index in range(meters):
+            values = [rng.randint(0, 50000) for _ in range(zones)]
+            meter = FakeMeter(
+                identifier=str(rng.randint(10 ** 7, 10 ** 8 - 1)),
+                code=f"{code}{meter_index:02d}",
+            )
+            for month in months:
+                values = [value + rng.randint(20, 400) for value in values]
+                meter.history[month] = tuple(values)
+            account.meters.append(meter)
+
+        for month in months:
+            for _ in range(int(payments_per_month) + (rng.random() < payments_per_month % 1)):
+                paid_at = datetime.combine(
+                    month.replace(day=rng.randint(1, 28)),
+                    datetime.min.time(),
+                ) + timedelta(seconds=rng.randint(0, 86399))
+                account.payments.append(
+                    (
+                        paid_at,
+                        rng.choice(PAYMENT_SOURCES),
+                        round(rng.uniform(100, 5000), 2),
+                        str(rng.randint(10 ** 11, 10 ** 12 - 1)),
+                    )
+                )
+        account.payments.sort()
+
+        return account
+
+
+def _shift_month(value: date, months: int) -> date:
+    month_index = value.year * 12 + value.month - 1 + months
+    return value.replace(year=month_index // 12, month=month_index % 12 + 1, day=1)
+
+
+def _format_date(value: Optional[date]) -> str:
+    return "" if value is None else value.strftime("%d.%m.%Y")
+
+
+def make_account_info_payload(account: FakeAccount) -> Dict[str, Any]:
+    return {
+        "cache_address": account.address,
+        "cache_balance": str(-account.balance),
+        "ls": account.code,
+        "slave_ls": account.code,
+        "email": account.email,
+        "ignore_ekvit": "0",
+        "kvit_email": account.email,
+        "kvit_enabled": "1",
+        "kvit_email_string": "",
+        "is_slave_ls": "1" if account.controlled_by_code else "0",
+        "is_master_ls": "1" if account.dependent_codes else "0",
+        "master_ls": account.controlled_by_code or "",
+        "alias": None,
+        "is_locked": "0",
+        "avatar_type": "0",
+    }
+
+
+def _make_email_and_kvit_status(account: FakeAccount) -> Dict[str, Any]:
+    return {
+        "ls": account.code,
+        "email": account.email,
+        "kvit_email": account.email,
+        "kvit_enabled": True,
+        "ignore_ekvit": False,
+        "kvit_email_string": "",
+        "result": True,
+    }
+
+
+def make_authorization_payload(
+    account: FakeAccount, dependents: Sequence[FakeAccount] = ()
+) -> Dict[str, Any]:
+    return {
+        "result": True,
+        "LS": account.code,
+        "IS_SLAVE": bool(account.controlled_by_code),
+        "MASTER_LS": account.controlled_by_code,
+        "IS_MASTER": bool(dependents),
+        "EMAIL": account.email,
+        "ignore_ekvit": False,
+        "emailAndKvitStatus": _make_email_and_kvit_status(account),
+        "ADDRESS": account.address,
+        "BALANCE": str(-account.balance),
+        "SLAVE_LS_LIST": [make_account_info_payload(dependent) for dependent in dependents],
+        "has_ls_without_kvit": False,
+        "CONSENT": {"pd": True, "digital": True},
+        "PWD": secrets.token_hex(16),
+        "STATUS": "OK",
+        "checkEmailKvtParam": False,
+        "COMPANY_NAME": "ТНС энерго",
+        "IS_ALLOW_DELEGATION": True,
+    }
+
+
+def make_readings_hist_page_payload(account: FakeAccount) -> Dict[str, Any]:
+    history: Dict[str, Dict[str, Dict[str, Any]]] = {}
+    for meter in account.meters:
+        for taken_on, values in meter.history.items():
+            history.setdefault(str(taken_on.year), {}).setdefault(
+                taken_on.strftime("%d.%m.%y"), {}
+            )[meter.identifier] = {
+                "number": meter.code,
+                "status": "0",
+                "readings": {
+                    ZONE_SOURCE_CODES[index]: {"label": ZONE_LABELS[index], "value": str(value)}
+                    for index, value in enumerate(values)
+                },
+            }
+    return {"result": True, "history": history}
+
+
+def make_send_readings_page_payload(account: FakeAccount) -> Dict[str, Any]:
+    counters = {}
+    for meter in account.meters:
+        last_date, last_values = meter.last_indications
+        counters[meter.identifier] = [
+            {
+                "RowID": f"{meter.identifier}-{index}",
+                "NomerTarifa": str(index),
+                "NazvanieTarifa": ZONE_NAMES[index],
+                "PredPok": str(value),
+                "KoefTrans": str(meter.transmission_coefficient),
+                "MaxPok": str(meter.max_indication_difference),
+                "Type": "1",
+                "Can_delete": "0",
+                "zakrPok": "",
+                "Label": ZONE_LABELS[index],
+                "sort": str(index),
+                "DatePoverStatus": "0",
+                "DatePoverURL": "",
+                "DatePover": "01.01.2031",
+                "RaschSch": "Расчетный",
+                "MestoUst": "Квартира",
+                "GodVipuska": "01.01.2015",
+                "DatePosledPover": "01.01.2015",
+                "ModelPU": "Меркурий 200",
+                "Tarifnost": str(len(last_values)),
+                "DatePok": _format_date(last_date),
+                "NomerUslugi": "1",
+                "NazvanieUslugi": "Электроснабжение",
+                "ZavodNomer": meter.code,
+                "Razradnost": str(meter.precision),
+            }
+            for index, value in enumerate(last_values)
+        ]
+    return {"result": True, "STATUS": "OK", "counters": counters}
+
+
+def make_payments_page_payload(account: FakeAccount) -> Dict[str, Any]:
+    history: Dict[str, List[Dict[str, Any]]] = {}
+    for paid_at, source, amount, transaction_id in account.payments:
+        history.setdefault(str(paid_at.year), []).append(
+            {
+                "DATE": paid_at.strftime("%d.%m.%Y"),
+                "DATETIME": paid_at.strftime("%Y-%m-%d %H:%M:%S"),
+                "ISTOCHNIK": source,
+                "SUMMA": str(amount),
+                "TRANSACTION": transaction_id,
+            }
+        )
+    return {"result": True, "history": history}
+
+
+def make_main_page_payload(account: FakeAccount) -> Dict[str, Any]:
+    return {
+        "result": True,
+        "COST-OF-RESTRICTION": "0",
+        "COST-OF-RESUMING": "0",
+        "summ": str(-account.balance),
+        "emailAndKvitStatus": _make_email_and_kvit_status(account),
+        "banners": [],
+        "notifications": [],
+        "ticketsInfo": {"resolved": 0, "with_answer": 0},
+    }
+
+
+def make_info_payload(account: FakeAccount) -> Dict[str, Any]:
+    return {
+        "result": True,
+        "ADDRESS": account.address,
+        "TELNANIMATEL": None,
+        "CHISLOPROPISAN": "2",
+        "OBSCHPLOSCHAD": "54.3",
+        "JILPLOSCHAD": "38",
+        "DOCSOBSTV": None,
+        "KATEGJIL": "Квартира",
+        "SN_KOEFSEZON": None,
+        "SN_OBJEM": None,
+        "DIGITAL_RECEIPT": True,
+        "counters": [
+            {
+                "MestoUst": "Квартира",
+                "RaschSch": "Расчетный",
+                "ZavodNomer": meter.code,
+            }
+            for meter in account.meters
+        ],
+    }
+
+
+def make_ls_list_payload(account: FakeAccount, dependents: Sequence[FakeAccount]) -> Dict[str, Any]:
+    return {
+        "result": True,
+        "data": [make_account_info_payload(dependent) for dependent in dependents],
+        "email": account.email,
+        "is_slave": bool(account.controlled_by_code),
+        "is_master": bool(dependents),
+        "kvit_enabled": True,
+        "has_ls_without_kvit": False,
+    }
+
+
+def make_digital_receipt_status_payload(account: FakeAccount) -> Dict[str, Any]:
+    return {
+        "result": True,
+        "sendKvt": True,
+        "EMAILVERIFY": False,
+        "registeredEmail": account.email,
+        "sendKvtEmail": account.email,
+        "sendKvtEmailFrom": "01.01.2020",
+        "sendKvtEmailTo": "",
+    }
+
+
+def make_send_readings_result_payload(account: FakeAccount) -> Dict[str, Any]:
+    debt = -account.balance
+    return {
+        "result": True,
+        "data": {
+            "ВХСАЛЬДО": str(debt),
+            "ЗАДОЛЖЕННОСТЬ": str(max(debt, 0.0)),
+            "ЗАДОЛЖЕННОСТЬОТКЛ": "0",
+            "ЗАДОЛЖЕННОСТЬПЕНИ": "0",
+            "ЗАДОЛЖЕННОСТЬПОДКЛ": "0",
+            "ЗАКРЫТЫЙМЕСЯЦ": _format_date(_shift_month(date.today(), -1)),
+            "НАЧИСЛЕНОПОИПУ": "0",
+            "ПЕРЕРАСЧЕТ": "0",
+            "ПРОГНОЗПОИПУ": "0",
+            "СУМАПОТЕРИ": "0",
+            "СУММАКОПЛАТЕ": str(max(debt, 0.0)),
+            "СУММАОДНПРОГНОЗ": "0",
+            "СУММАПЕНИПРОГНОЗ": "0",
+            "СУММАПЛАТЕЖЕЙ": "0",
+            "СУММАПРОГНОЗНАЧ": "0",
+            "ФНАЧИСЛЕНОПОИПУ": "0",
+            "KOPLATEPSEVDO": str(max(debt, 0.0)),
+        },
+    }
+
+
+def _make_error_payload(code: int, message: str) -> Dict[str, Any]:
+    return {"result": False, "error": code, "errMsg": message}
+
+
+#################################################################################
+# Server
+#################################################################################
+
+
+def _parse_form(body: str) -> Dict[str, str]:
+    # The mobile client sends parts with a `multipart/form-data` content type of their own,
+    # which `aiohttp` refuses to parse; extract named parts by hand instead.
+    fields = {}
+    for match in re.finditer(
+        r'name="([^"]+)"[^\r\n]*\r\n(?:[^\r\n]+\r\n)*\r\n(.*?)\r\n--', body, re.S
+    ):
+        fields[match.group(1)] = match.group(2)
+    return fields
+
+
+class FakeTNSEnergoServer:
+    """aiohttp-based server implementing the endpoints used by the request mappings.
+
+    Accounts are generated deterministically out of `seed`. Every request is delayed by
+    `latency` seconds (either fixed, or uniformly distributed within a range), and fails
+    with probability `error_rate` (half of the failures being HTTP 503 responses, and half
+    being error payloads). Sessions are cookie-based; `session_lifetime` makes them expire,
+    and `session_expiry` (one of `SESSION_EXPIRY_MODES`) selects how expiry is reported."""
+
+    def __init__(
+        self,
+        *,
+        accounts: int = 10,
+        region_code: str = "58",
+        meters_per_account: int = 1,
+        zones_per_meter: int = 2,
+        history_months: int = 36,
+        payments_per_month: float = 1.0,
+        dependents_per_account: int = 0,
+        latency: LatencyType = 0.0,
+        error_rate: float = 0.0,
+        session_lifetime: Optional[float] = None,
+        session_expiry: str = "status",
+        seed: int = 0,
+    ) -> None:
+        if region_code not in TNSEnergoAPI.REGIONS_MAP:
+            raise ValueError("unknown region code")
+        if session_expiry not in SESSION_EXPIRY_MODES:
+            raise ValueError("unknown session expiry mode")
+
+        self._rng = random.Random(seed)
+        self._latency = latency
+        self._error_rate = error_rate
+        self._session_lifetime = session_lifetime
+        self._session_expiry = session_expiry
+        self._sessions: Dict[str, Tuple[str, float]] = {}
+        self._accounts: Dict[str, FakeAccount] = {}
+        self._main_codes: List[str] = []
+        self._runner: Optional[web.AppRunner] = None
+        self._base_url: Optional[str] = None
+        self.request_count = 0
+
+        generate_kwargs = dict(
+            meters=meters_per_account,
+            zones=zones_per_meter,
+            history_months=history_months,
+            payments_per_month=payments_per_month,
+        )
+        for account_index in range(accounts):
+            main = self._add_account(f"{region_code}{account_index:010d}", **generate_kwargs)
+            self._main_codes.append(main.code)
+            for dependent_index in range(dependents_per_account):
+                dependent = self._add_account(
+                    f"{main.code[:2]}{dependent_index + 1:02d}{main.code[4:]}",
+                    **generate_kwargs,
+                )
+                dependent.controlled_by_code = main.code
+                main.dependent_codes.append(dependent.code)
+
+    def _add_account(self, code: str, **kwargs) -> FakeAccount:
+        account = FakeAccount.generate(self._rng, code, **kwargs)
+        self._accounts[code] = account
+        return account
+
+    @property
+    def accounts(self) -> Mapping[str, FakeAccount]:
+        return self._accounts
+
+    @property
+    def credentials(self) -> List[Tuple[str, str]]:
+        """(username, password) pairs of main accounts"""
+        return [(code, self._accounts[code].password) for code in self._main_codes]
+
+    @property
+    def base_url(self) -> str:
+        if self._base_url is None:
+            raise RuntimeError("server is not started")
+        return self._base_url
+
+    def expire_sessions(self) -> None:
+        self._sessions.clear()
+
+    #################################################################################
+    # Lifecycle
+    #################################################################################
+
+    def create_app(self) -> web.Application:
+        app = web.Application(middlewares=[self._middleware])
+        prefix = "/version/{version}/Android/mobile"
+        app.router.add_post(prefix + "/region/{region}/action/authorization/json/", self._auth)
+        app.router.add_route(
+            "*", prefix + "/region/{region}/action/{action}/ls/{ls}/json/", self._action
+        )
+        app.router.add_post(prefix + "/delegation/getLSListByLs/{ls}/", self._ls_list)
+        app.router.add_get(LOGIN_PAGE_PATH, self._login_page)
+        return app
+
+    async def async_start(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        self._runner = web.AppRunner(self.create_app())
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port)
+        await site.start()
+        socket_port = self._runner.addresses[0][1]
+        # Cookie jars refuse cookies of IP address hosts by default
+        self._base_url = f"http://{'localhost' if host == '127.0.0.1' else host}:{socket_port}"
+        return self._base_url
+
+    async def async_close(self) -> None:
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+            self._base_url = None
+
+    async def __aenter__(self) -> "FakeTNSEnergoServer":
+        await self.async_start()
+        return self
+
+    async def __aexit__(self, *args) -> None:
+        await self.async_close()
+
+    #################################################################################
+    # Handlers
+    #################################################################################
+
+    @web.middleware
+    async def _middleware(self, request: web.Request, handler):
+        self.request_count += 1
+
+        latency = self._latency
+        if isinstance(latency, tuple):
+            latency = self._rng.uniform(*latency)
+        if latency > 0:
+            await asyncio.sleep(latency)
+
+        if self._error_rate and self._rng.random() < self._error_rate:
+            if self._rng.random() < 0.5:
+                raise web.HTTPServiceUnavailable()
+            return web.json_response(
+                _make_error_payload(500, "Синтетическая ошибка")
+            )
+
+        return await handler(request)
+
+    def _get_session_account(self, request: web.Request) -> Optional[FakeAccount]:
+        session = self._sessions.get(request.cookies.get(SESSION_COOKIE, ""))
+        if session is None:
+            return None
+
+        code, created_at = session
+        if (
+            self._session_lifetime is not None
+            and asyncio.get_running_loop().time() - created_at > self._session_lifetime
+        ):
+            return None
+
+        return self._accounts.get(code)
+
+    def _get_accessible_account(
+        self, request: web.Request, code: str
+    ) -> Union[FakeAccount, web.Response]:
+        session_account = self._get_session_account(request)
+        if session_account is None:
+            if self._session_expiry == "status":
+                return web.Response(status=401, text="Unauthorized")
+            if self._session_expiry == "redirect":
+                return web.Response(status=302, headers={"Location": LOGIN_PAGE_PATH})
+            return web.json_response(
+                _make_error_payload(401, "Необходима авторизация")
+            )
+
+        account = self._accounts.get(code)
+        if account is None or (
+            account is not session_account and account.code not in session_account.dependent_codes
+        ):
+            return web.json_response(
+                _make_error_payload(404, "Лицевой счёт не найден")
+            )
+
+        return account
+
+    async def _auth(self, request: web.Request) -> web.Response:
+        fields = _parse_form(await request.text())
+        try:
+            credentials = json.loads(fields["data"])
+            account = self._accounts[credentials["ls"]]
+        except (KeyError, ValueError, TypeError):
+            return web.json_response(
+                _make_error_payload(1, "Неверный логин или пароль")
+            )
+
+        if account.password != credentials.get("password"):
+            return web.json_response(
+                _make_error_payload(1, "Неверный логин или пароль")
+            )
+
+        token = secrets.token_hex(16)
+        self._sessions[token] = (account.code, asyncio.get_running_loop().time())
+
+        response = web.json_response(
+            make_authorization_payload(
+                account, [self._accounts[code] for code in account.dependent_codes]
+            )
+        )
+        response.set_cookie(SESSION_COOKIE, token)
+        return response
+
+    async def _login_page(self, request: web.Request) -> web.Response:
+        return web.Response(
+            text="<html><body>Вход в личный кабинет</body></html>",
+            content_type="text/html",
+        )
+
+    async def _ls_list(self, request: web.Request) -> web.Response:
+        account = self._get_accessible_account(request, request.match_info["ls"])
+        if isinstance(account, web.Response):
+            return account
+        return web.json_response(
+            make_ls_list_payload(
+                account, [self._accounts[code] for code in account.dependent_codes]
+            )
+        )
+
+    async def _action(self, request: web.Request) -> web.Response:
+        account = self._get_accessible_account(request, request.match_info["ls"])
+        if isinstance(account, web.Response):
+            return account
+
+        action = request.match_info["action"]
+
+        if request.method == "POST":
+            if action != "sendReadings":
+                raise web.HTTPMethodNotAllowed(request.method, ["GET"])
+            return await self._send_readings(request, account)
+
+        payload_factory = {
+            "getReadingsHistPage": make_readings_hist_page_payload,
+            "getSendReadingsPage": make_send_readings_page_payload,
+            "getPaymentsHistPage": make_payments_page_payload,
+            "getMainpage": make_main_page_payload,
+            "getInfo": make_info_payload,
+            "getDigitalReceiptStatus": make_digital_receipt_status_payload,
+        }.get(action)
+
+        if payload_factory is None:
+            raise web.HTTPNotFound()
+
+        return web.json_response(payload_factory(account))
+
+    async def _send_readings(self, request: web.Request, account: FakeAccount) -> web.Response:
+        fields = _parse_form(await request.text())
+        try:
+            readings = json.loads(fields["readings"])
+            meters = {meter.code: meter for meter in account.meters}
+            updates: Dict[str, Dict[int, int]] = {}
+            for reading in readings:
+                meter = meters[reading["counterNumber"]]
+                updates.setdefault(meter.code, {})[int(reading["nomerTarifa"])] = int(
+                    reading["newPok"]
+                )
+        except (KeyError, ValueError, TypeError):
+            return web.json_response(
+                _make_error_payload(2, "Некорректные показания")
+            )
+
+        today = date.today()
+        for meter_code, zone_values in updates.items():
+            meter = meters[meter_code]
+            _, last_values = meter.last_indications
+            if any(
+                not 0 <= index < len(last_values) or value < last_values[index]
+                for index, value in zone_values.items()
+            ):
+                return web.json_response(
+                    _make_error_payload(3, "Показания меньше предыдущих")
+                )
+            new_values = list(last_values)
+            for index, value in zone_values.items():
+                new_values[index] = value
+            meter.history[today] = tuple(new_values)
+
+        return web.json_response(make_send_readings_result_payload(account))
@@ -0,0 +1,271 @@
+__all__ = (
+    "FleetCredentials",
+    "FleetResult",
+    "FleetPoller",
+    "async_poll_fleet",
+)
+
+import asyncio
+import logging
+import time
+from typing import (
+    AsyncIterator,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Tuple,
+    Union,
+)
+
+import aiohttp
+import attr
+
+from tns_energo_api import (
+    Account,
+    Indication,
+    Meter,
+    Payment,
+    TNSEnergoAPI,
+    create_shared_connector,
+)
+from tns_energo_api.exceptions import RequestTimeoutException
+
+_LOGGER = logging.getLogger(__name__)
+
+DEFAULT_FLEET_CONCURRENCY = 50
+DEFAULT_ACCOUNT_TIMEOUT = 120.0
+
+
+@attr.s(kw_only=True, frozen=True, slots=True)
+class FleetCredentials:
+    username: str = attr.ib()
+    password: str = attr.ib()
+
+    @property
+    def region(self) -> Optional[str]:
+        return TNSEnergoAPI.REGIONS_MAP.get(self.username[:2])
+
+
+@attr.s(kw_only=True, frozen=True, slots=True)
+class FleetResult:
+    """Outcome of a single credentials' synchronization pass.
+
+    When `exception` is set (for example, `RequestTimeoutException` once the account deadline
+    expires), data fetched before the failure is kept: `accounts` may be filled while
+    `meters`, `payments` and `indications` lack some (or all) of the accounts."""
+
+    username: str = attr.ib()
+    region: Optional[str] = attr.ib()
+    accounts: Tuple[Account, ...] = attr.ib(default=())
+    meters: Mapping[str, Mapping[str, Meter]] = attr.ib(factory=dict)
+    payments: Mapping[str, List[Payment]] = attr.ib(factory=dict)
+    indications: Mapping[str, List[Indication]] = attr.ib(factory=dict)
+    exception: Optional[BaseException] = attr.ib(default=None)
+    elapsed: float = attr.ib(default=0.0)
+
+    @property
+    def success(self) -> bool:
+        return self.exception is None
+
+
+CredentialsType = Union[FleetCredentials, Tuple[str, str]]
+ApiFactoryType = Callable[[FleetCredentials, Optional[aiohttp.BaseConnector]], TNSEnergoAPI]
+
+
+def _make_credentials(value: CredentialsType) -> FleetCredentials:
+    if isinstance(value, FleetCredentials):
+        return value
+    username, password = value
+    return FleetCredentials(username=username, password=password)
+
+
+class FleetPoller:
+    """Synchronize many accounts on one event loop with bounded concurrency.
+
+    A global cap limits the amount of accounts synchronized at once, while an optional per-region
+    cap (either a single value for every region, or a mapping of region name to value) prevents
+    a single regional backend from being overloaded. Every account gets its own deadline; once it
+    expires, requests of the account are cancelled before its slots are released.
+
+    All instances created by the poller share a single connection pool. When no connector is
+    provided, one is created (and closed) for every run."""
+
+    def __init__(
+        self,
+        credentials: Iterable[CredentialsType],
+        *,
+        concurrency: int = DEFAULT_FLEET_CONCURRENCY,
+        region_concurrency: Optional[Union[int, Mapping[str, int]]] = None,
+        account_timeout: Optional[float] = DEFAULT_ACCOUNT_TIMEOUT,
+        fetch_meters: bool = True,
+        fetch_payments: bool = True,
+        fetch_indications: bool = True,
+        api_factory: Optional[ApiFactoryType] = None,
+        connector: Optional[aiohttp.BaseConnector] = None,
+    ) -> None:
+        if concurrency < 1:
+            raise ValueError("concurrency must be positive")
+
+        self._credentials = tuple(map(_make_credentials, credentials))
+        self._concurrency = concurrency
+        self._region_concurrency = region_concurrency
+        self._account_timeout = account_timeout
+        self._fetch_meters = fetch_meters
+        self._fetch_payments = fetch_payments
+        self._fetch_indications = fetch_indications
+        self._api_factory = api_factory
+        self._connector = connector
+
+    def __len__(self) -> int:
+        return len(self._credentials)
+
+    def _get_region_limit(self, region: Optional[str]) -> Optional[int]:
+        region_concurrency = self._region_concurrency
+        if region_concurrency is None or region is None:
+            return None
+        if isinstance(region_concurrency, int):
+            return region_concurrency
+        return region_concurrency.get(region)
+
+    def _create_api(
+        self,
+        credentials: FleetCredentials,
+        connector: Optional[aiohttp.BaseConnector],
+    ) -> TNSEnergoAPI:
+        if self._api_factory is not None:
+            return self._api_factory(credentials, connector)
+        return TNSEnergoAPI(credentials.username, credentials.password, connector=connector)
+
+    async def _async_sync_account(self, account: Account, result: Dict):
+        code = account.code
+        coroutines, keys = [], []
+
+        if self._fetch_meters:
+            coroutines.append(account.async_get_meters())
+            keys.append("meters")
+        if self._fetch_payments:
+            coroutines.append(account.async_get_payments())
+            keys.append("payments")
+        if self._fetch_indications:
+            coroutines.append(account.async_get_indications())
+            keys.append("indications")
+
+        for key, value in zip(keys, await asyncio.gather(*coroutines)):
+            result[key][code] = value
+
+    async def _async_sync(
+        self,
+        credentials: FleetCredentials,
+        connector: Optional[aiohttp.BaseConnector],
+        result: Dict,
+    ) -> None:
+        api = self._create_api(credentials, connector)
+        try:
+            await api.async_authenticate()
+
+            accounts = [api.main_account, *(api.dependent_accounts or ())]
+            result["accounts"] = tuple(accounts)
+
+            await asyncio.gather(
+                *(self._async_sync_account(account, result) for account in accounts)
+            )
+        finally:
+            await api.async_close()
+
+    async def _async_poll_one(
+        self,
+        credentials: FleetCredentials,
+        connector: Optional[aiohttp.BaseConnector],
+        global_semaphore: asyncio.Semaphore,
+        region_semaphores: Dict[str, asyncio.Semaphore],
+    ) -> FleetResult:
+        region = credentials.region
+        result = {"accounts": (), "meters": {}, "payments": {}, "indications": {}}
+        exception = None
+        started_at = None
+
+        region_semaphore = region_semaphores.get(region)
+        if region_semaphore is None:
+            limit = self._get_region_limit(region)
+            if limit is not None:
+                region_semaphore = region_semaphores[region] = asyncio.Semaphore(limit)
+
+        # Region slot is acquired first, so that accounts waiting on a saturated region
+        # do not hold on to global slots which could be used by other regions.
+        try:
+            if region_semaphore is not None:
+                await region_semaphore.acquire()
+            try:
+                async with global_semaphore:
+                    started_at = time.monotonic()
+                    try:
+                        await asyncio.wait_for(
+                            self._async_sync(credentials, connector, result),
+                            self._account_timeout,
+                        )
+                    except asyncio.TimeoutError:
+                        raise RequestTimeoutException(
+                            "Account synchronization did not finish within %s seconds"
+                            % self._account_timeout
+                        )
+            finally:
+                if region_semaphore is not None:
+                    region_semaphore.release()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            _LOGGER.debug("Synchronization of %s failed: %r", credentials.username, e)
+            exception = e
+
+        return FleetResult(
+            username=credentials.username,
+            region=region,
+            exception=exception,
+            elapsed=0.0 if started_at is None else time.monotonic() - started_at,
+            **result,
+        )
+
+    async def async_iter_results(self) -> AsyncIterator[FleetResult]:
+        """Yield results in order of completion"""
+        global_semaphore = asyncio.Semaphore(self._concurrency)
+        region_semaphores: Dict[str, asyncio.Semaphore] = {}
+        queue: "asyncio.Queue[FleetResult]" = asyncio.Queue()
+
+        connector = self._connector
+        owns_connector = connector is None and self._api_factory is None
+        if owns_connector:
+            # Concurrency is already bounded by the semaphores above
+            connector = create_shared_connector(limit=0, limit_per_host=0)
+
+        async def _async_poll_and_enqueue(credentials: FleetCredentials) -> None:
+            queue.put_nowait(
+                await self._async_poll_one(
+                    credentials, connector, global_semaphore, region_semaphores
+                )
+            )
+
+        tasks = [
+            asyncio.ensure_future(_async_poll_and_enqueue(credentials))
+            for credentials in self._credentials
+        ]
+
+        try:
+            for _ in range(len(tasks)):
+                yield await queue.get()
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            if owns_connector:
+                await connector.close()
+
+    async def async_run(self) -> List[FleetResult]:
+        return [result async for result in self.async_iter_results()]
+
+
+async def async_poll_fleet(credentials: Iterable[CredentialsType], **kwargs) -> List[FleetResult]:
+    return await FleetPoller(credentials, **kwargs).async_run()
@@ -0,0 +1,205 @@
+__all__ = (
+    "ParseEvent",
+    "RequestEvent",
+    "RequestObserver",
+    "RequestTimings",
+    "RequestTrace",
+    "create_trace_config",
+    "get_path_action",
+)
+
+import time
+from typing import Any, Iterable, Optional, Union
+
+import aiohttp
+import attr
+
+
+@attr.s(kw_only=True, slots=True)
+class RequestTimings:
+    """Durations (in seconds) of request phases.
+
+    `throttled` is time spent waiting for the rate limiter and `backoff` is time spent waiting
+    between retry attempts (both summed over attempts). Network phases describe the last
+    attempt: `queued` is time spent waiting for a free connection, `connect` covers DNS
+    resolution and connection establishment (zero when a pooled connection is reused), `ttfb`
+    is time from the start of the attempt until response headers arrive, and `download` is
+    time spent reading the body. Network phases remain None when unknown (e.g. for cached or
+    replayed responses)."""
+
+    started_at: float = attr.ib(factory=time.perf_counter, repr=False)
+    throttled: Optional[float] = attr.ib(default=None)
+    backoff: Optional[float] = attr.ib(default=None)
+    queued: Optional[float] = attr.ib(default=None)
+    connect: Optional[float] = attr.ib(default=None)
+    ttfb: Optional[float] = attr.ib(default=None)
+    download: Optional[float] = attr.ib(default=None)
+    decode: Optional[float] = attr.ib(default=None)
+    total: Optional[float] = attr.ib(default=None)
+
+    # Phase start marks, filled in by trace callbacks
+    _attempt_started_at: Optional[float] = attr.ib(default=None, repr=False)
+    _phase_started_at: float = attr.ib(default=0.0, repr=False)
+    _headers_received_at: Optional[float] = attr.ib(default=None, repr=False)
+
+    def start_attempt(self) -> None:
+        """Mark start of a network attempt, discarding phases of the previous one"""
+        self._attempt_started_at = time.perf_counter()
+        self._headers_received_at = None
+        self.queued = self.connect = self.ttfb = self.download = None
+
+    def mark_body_received(self) -> None:
+        if self._headers_received_at is not None:
+            self.download = time.perf_counter() - self._headers_received_at
+
+    def mark_finished(self) -> None:
+        self.total = time.perf_counter() - self.started_at
+
+
+@attr.s(kw_only=True, frozen=True, slots=True)
+class RequestEvent:
+    """Emitted once per `async_req_get` / `async_req_post` call, including failed ones"""
+
+    method: str = attr.ib()
+    action: Optional[str] = attr.ib()
+    region: str = attr.ib()
+    url: Optional[str] = attr.ib()
+    status: Optional[int] = attr.ib()
+    timings: RequestTimings = attr.ib()
+    request_bytes: int = attr.ib(default=0)
+    response_bytes: int = attr.ib(default=0)
+    cached: bool = attr.ib(default=False)
+    attempts: int = attr.ib(default=0)
+    error: Optional[BaseException] = attr.ib(default=None)
+
+    @property
+    def success(self) -> bool:
+        return self.error is None
+
+
+@attr.s(kw_only=True, slots=True)
+class RequestTrace:
+    """Mutable state of a request in progress; passed to aiohttp as `trace_request_ctx`"""
+
+    method: str = attr.ib()
+    action: Optional[str] = attr.ib()
+    region: str = attr.ib()
+    url: Optional[str] = attr.ib(default=None)
+    status: Optional[int] = attr.ib(default=None)
+    request_bytes: int = attr.ib(default=0)
+    response_bytes: int = attr.ib(default=0)
+    cached: bool = attr.ib(default=False)
+    attempts: int = attr.ib(default=0)
+    timings: RequestTimings = attr.ib(factory=RequestTimings)
+
+    def to_event(self, error: Optional[BaseException] = None) -> RequestEvent:
+        return RequestEvent(
+            method=self.method,
+            action=self.action,
+            region=self.region,
+            url=self.url,
+            status=self.status,
+            timings=self.timings,
+            request_bytes=self.request_bytes,
+            response_bytes=self.response_bytes,
+            cached=self.cached,
+            attempts=self.attempts,
+            error=error,
+        )
+
+
+@attr.s(kw_only=True, frozen=True, slots=True)
+class ParseEvent:
+    """Emitted once response data is converted into a request mapping"""
+
+    mapping: str = attr.ib()
+    action: Optional[str] = attr.ib()
+    region: str = attr.ib()
+    duration: float = attr.ib()
+    error: Optional[BaseException] = attr.ib(default=None)
+
+
+class RequestObserver:
+    """Base class for request observers; override the callbacks of interest.
+
+    Callbacks are invoked synchronously on the event loop and must not block. Exceptions
+    raised by observers are logged and otherwise ignored."""
+
+    def on_request(self, event: RequestEvent) -> None:
+        pass
+
+    def on_parse(self, event: ParseEvent) -> None:
+        pass
+
+
+#################################################################################
+# aiohttp tracing
+#################################################################################
+
+
+def get_path_action(path: Union[str, Iterable[str]]) -> Optional[str]:
+    """Action name of a request path: its `action` parameter, or two leading path segments"""
+    if isinstance(path, str):
+        return None
+    path = tuple(path)
+    try:
+        return path[path.index("action") + 1]
+    except (ValueError, IndexError):
+        return "/".join(path[:2]) or None
+
+
+def _get_timings(trace_config_ctx: Any) -> Optional[RequestTimings]:
+    trace = trace_config_ctx.trace_request_ctx
+    return trace.timings if isinstance(trace, RequestTrace) else None
+
+
+def _make_phase_end(name: str):
+    async def _on_phase_end(session, trace_config_ctx, params) -> None:
+        timings = _get_timings(trace_config_ctx)
+        if timings is not None:
+            elapsed = time.perf_counter() - timings._phase_started_at
+            setattr(timings, name, (getattr(timings, name) or 0.0) + elapsed)
+
+    return _on_phase_end
+
+
+async def _on_phase_start(session, trace_config_ctx, params) -> None:
+    timings = _get_timings(trace_config_ctx)
+    if timings is not None:
+        timings._phase_started_at = time.perf_counter()
+
+
+async def _on_connection_reuseconn(session, trace_config_ctx, params) -> None:
+    timings = _get_timings(trace_config_ctx)
+    if timings is not None and timings.connect is None:
+        timings.connect = 0.0
+
+
+async def _on_request_start(session, trace_config_ctx, params) -> None:
+    timings = _get_timings(trace_config_ctx)
+    if timings is not None:
+        timings.start_attempt()
+
+
+async def _on_request_end(session, trace_config_ctx, params) -> None:
+    # Fired once response headers are received
+    timings = _get_timings(trace_config_ctx)
+    if timings is not None and timings._attempt_started_at is not None:
+        timings._headers_received_at = time.perf_counter()
+        timings.ttfb = timings._headers_received_at - timings._attempt_started_at
+
+
+def create_trace_config() -> aiohttp.TraceConfig:
+    """Trace config filling timings of `RequestTrace` passed as `trace_request_ctx`.
+
+    Requests issued without timings context are left untouched."""
+    trace_config = aiohttp.TraceConfig()
+    trace_config.on_request_start.append(_on_request_start)
+    trace_config.on_connection_queued_start.append(_on_phase_start)
+    trace_config.on_connection_queued_end.append(_make_phase_end("queued"))
+    trace_config.on_connection_create_start.append(_on_phase_start)
+    trace_config.on_connection_create_end.append(_make_phase_end("connect"))
+    trace_config.on_connection_reuseconn.append(_on_connection_reuseconn)
+    trace_config.on_request_end.append(_on_request_end)
+    trace_config.freeze()
+    return trace_config
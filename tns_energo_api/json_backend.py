@@ -0,0 +1,108 @@
+__all__ = (
+    "JSONBackend",
+    "JSON_BACKENDS",
+    "get_json_backend",
+)
+
+import json
+import re
+from typing import Any, Callable, Dict, Optional, Union
+
+import attr
+
+
+@attr.s(kw_only=True, frozen=True, slots=True)
+class JSONBackend:
+    """JSON decoder operating on raw response bytes and compact encoder for request bodies.
+
+    Decoding errors must be raised as (subclasses of) `ValueError`. Encoded output must be
+    ASCII-only (as with `json.dumps(..., ensure_ascii=True)`), so that request bodies do not
+    depend on the backend."""
+
+    name: str = attr.ib()
+    loads: Callable[[bytes], Any] = attr.ib(repr=False)
+    dumps: Callable[[Any], str] = attr.ib(repr=False)
+
+
+def _create_stdlib() -> JSONBackend:
+    return JSONBackend(
+        name="json",
+        loads=json.loads,
+        dumps=lambda value: json.dumps(value, separators=(",", ":")),
+    )
+
+
+# Non-ASCII characters may only occur within strings of encoded JSON, so they can be escaped
+# without tokenizing it
+_NON_ASCII = re.compile(r"[^\x00-\x7f]")
+
+
+def _escape_non_ascii(match: "re.Match[str]") -> str:
+    code = ord(match.group())
+    if code < 0x10000:
+        return "\\u%04x" % code
+    code -= 0x10000
+    return "\\u%04x\\u%04x" % (0xD800 | code >> 10, 0xDC00 | code & 0x3FF)
+
+
+def _create_orjson() -> JSONBackend:
+    import orjson
+
+    def dumps(value: Any) -> str:
+        # orjson always emits UTF-8
+        encoded = orjson.dumps(value).decode("utf-8")
+        return encoded if encoded.isascii() else _NON_ASCII.sub(_escape_non_ascii, encoded)
+
+    return JSONBackend(name="orjson", loads=orjson.loads, dumps=dumps)
+
+
+def _create_ujson() -> JSONBackend:
+    import ujson
+
+    return JSONBackend(
+        name="ujson",
+        loads=ujson.loads,
+        dumps=lambda value: ujson.dumps(value, ensure_ascii=True, escape_forward_slashes=False),
+    )
+
+
+# Ordered by preference for `auto` backend selection
+JSON_BACKENDS: Dict[str, Callable[[], JSONBackend]] = {
+    "orjson": _create_orjson,
+    "ujson": _create_ujson,
+    "json": _create_stdlib,
+}
+
+_LOADED_BACKENDS: Dict[str, JSONBackend] = {}
+
+
+def get_json_backend(backend: Optional[Union[str, JSONBackend]] = None) -> JSONBackend:
+    """Resolve JSON backend by name.
+
+    `None` resolves to the standard library implementation, `"auto"` resolves to the first
+    installed backend out of `JSON_BACKENDS`."""
+    if isinstance(backend, JSONBackend):
+        return backend
+
+    if backend is None:
+        backend = "json"
+
+    if backend == "auto":
+        for name in JSON_BACKENDS:
+            try:
+                return get_json_backend(name)
+            except ImportError:
+                continue
+
+    try:
+        return _LOADED_BACKENDS[backend]
+    except KeyError:
+        pass
+
+    try:
+        factory = JSON_BACKENDS[backend]
+    except KeyError:
+        raise ValueError(f"unknown JSON backend: {backend}")
+
+    loaded = _LOADED_BACKENDS[backend] = factory()
+    return loaded
@@ -0,0 +1,185 @@
+__all__ = (
+    "BucketStats",
+    "RateLimit",
+    "RateLimiter",
+    "TokenBucket",
+)
+
+import asyncio
+import time
+from typing import Callable, Dict, Mapping, Optional, Tuple, Union
+
+import attr
+
+
+@attr.s(kw_only=True, frozen=True, slots=True)
+class RateLimit:
+    """Sustained `rate` of requests per second, with bursts of up to `burst` requests"""
+
+    rate: float = attr.ib()
+    burst: int = attr.ib(default=1)
+
+    @rate.validator
+    def _validate_rate(self, attribute, value):
+        if value <= 0:
+            raise ValueError("rate must be positive")
+
+    @burst.validator
+    def _validate_burst(self, attribute, value):
+        if value < 1:
+            raise ValueError("burst must be positive")
+
+
+@attr.s(kw_only=True, frozen=True, slots=True)
+class BucketStats:
+    waiting: int = attr.ib()
+    acquired: int = attr.ib()
+    wait_time: float = attr.ib()
+    tokens: float = attr.ib()
+
+
+class TokenBucket:
+    """Token bucket granting tokens to waiters in FIFO order"""
+
+    def __init__(self, limit: RateLimit, clock: Callable[[], float] = time.monotonic) -> None:
+        self.limit = limit
+        self._clock = clock
+        self._tokens = float(limit.burst)
+        self._updated_at = clock()
+        self._lock: Optional[asyncio.Lock] = None
+        self._waiting = 0
+        self._acquired = 0
+        self._wait_time = 0.0
+
+    def _refill(self) -> None:
+        now = self._clock()
+        self._tokens = min(
+            float(self.limit.burst),
+            self._tokens + (now - self._updated_at) * self.limit.rate,
+        )
+        self._updated_at = now
+
+    @property
+    def waiting(self) -> int:
+        return self._waiting
+
+    @property
+    def stats(self) -> BucketStats:
+        self._refill()
+        return BucketStats(
+            waiting=self._waiting,
+            acquired=self._acquired,
+            wait_time=self._wait_time,
+            tokens=self._tokens,
+        )
+
+    async def async_acquire(self, then: Optional["TokenBucket"] = None) -> float:
+        """Wait for a token; returns time spent waiting.
+
+        With `then`, a token of that bucket is acquired once a token of this one is available,
+        and the latter is only consumed afterwards, so requests waiting on this bucket do not
+        take tokens of the other one."""
+        self._refill()
+        if self._waiting == 0 and self._tokens >= 1.0 and (then is None or then._try_take()):
+            self._tokens -= 1.0
+            self._acquired += 1
+            return 0.0
+
+        if self._lock is None:
+            # Created lazily to bind to the running event loop on older Python versions
+            self._lock = asyncio.Lock()
+
+        started_at = self._clock()
+        then_waited = 0.0
+        self._waiting += 1
+        try:
+            async with self._lock:
+                while True:
+                    self._refill()
+                    if self._tokens >= 1.0:
+                        break
+                    await asyncio.sleep((1.0 - self._tokens) / self.limit.rate)
+                if then is not None:
+                    # Tokens only accumulate meanwhile, as other callers queue behind the lock
+                    then_waited = await then.async_acquire()
+                    self._refill()
+                self._tokens -= 1.0
+        finally:
+            self._waiting -= 1
+
+        waited = self._clock() - started_at
+        self._acquired += 1
+        self._wait_time += waited - then_waited
+        return waited
+
+    def _try_take(self) -> bool:
+        """Consume a token if one is available without waiting"""
+        self._refill()
+        if self._waiting == 0 and self._tokens >= 1.0:
+            self._tokens -= 1.0
+            self._acquired += 1
+            return True
+        return False
+
+
+RegionLimitsType = Optional[Union[RateLimit, Mapping[str, RateLimit]]]
+
+
+class RateLimiter:
+    """Client-side rate limiter, shareable between `TNSEnergoAPI` instances.
+
+    Region limits (either a single limit applied to every region separately, or a mapping of
+    region name, as in `TNSEnergoAPI.REGIONS_MAP`, to limit) cap all requests to a region.
+    Action limits (keyed by action name, such as `getReadingsHistPage`) additionally cap
+    requests of an action within each region. A request waits for a token of every applicable
+    bucket, and consumes none of them until all are available."""
+
+    def __init__(
+        self,
+        region_limits: RegionLimitsType = None,
+        action_limits: Optional[Mapping[str, RateLimit]] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._region_limits = region_limits
+        self._action_limits = dict(action_limits or {})
+        self._clock = clock
+        self._buckets: Dict[Tuple[str, Optional[str]], TokenBucket] = {}
+
+    def _get_region_limit(self, region: str) -> Optional[RateLimit]:
+        region_limits = self._region_limits
+        if region_limits is None or isinstance(region_limits, RateLimit):
+            return region_limits
+        return region_limits.get(region)
+
+    def _get_bucket(self, key: Tuple[str, Optional[str]], limit: RateLimit) -> TokenBucket:
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = self._buckets[key] = TokenBucket(limit, self._clock)
+        return bucket
+
+    async def async_acquire(self, region: str, action: Optional[str] = None) -> float:
+        """Wait until request may be sent; returns time spent waiting"""
+        region_limit = self._get_region_limit(region)
+        region_bucket = (
+            None if region_limit is None else self._get_bucket((region, None), region_limit)
+        )
+
+        action_limit = self._action_limits.get(action) if action is not None else None
+        if action_limit is None:
+            return 0.0 if region_bucket is None else await region_bucket.async_acquire()
+
+        # Region tokens are only taken once the action bucket has a token for the request
+        return await self._get_bucket((region, action), action_limit).async_acquire(region_bucket)
+
+    @property
+    def queue_depth(self) -> int:
+        """Total amount of requests currently waiting for a token"""
+        return sum(bucket.waiting for bucket in self._buckets.values())
+
+    def get_queue_depths(self) -> Dict[Tuple[str, Optional[str]], int]:
+        """Amount of waiting requests per (region, action) bucket; action is None for
+        region-wide buckets"""
+        return {key: bucket.waiting for key, bucket in self._buckets.items()}
+
+    def get_stats(self) -> Dict[Tuple[str, Optional[str]], BucketStats]:
+        return {key: bucket.stats for key, bucket in self._buckets.items()}
@@ -8,3 +8,13 @@ __all__ = (
     "get_send_indications_page",
     "send_readings",
 )
+
+from importlib import import_module
+from typing import Any
+
+
+def __getattr__(name: str) -> Any:
+    # Request modules are imported on first access
+    if name in __all__:
+        return import_module(__name__ + "." + name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,4 +1,14 @@
-from typing import Any, Iterable, Mapping, Optional, Sequence, TYPE_CHECKING, Tuple, Union
+from typing import (
+    Any,
+    ClassVar,
+    Iterable,
+    Mapping,
+    Optional,
+    Sequence,
+    TYPE_CHECKING,
+    Tuple,
+    Union,
+)
 
 import attr
 
@@ -10,6 +20,8 @@ from tns_energo_api.converters import (
     conv_int,
     conv_str_optional,
     conv_str_stripped,
+    reauthenticating,
+    shared_request,
     wrap_default_none,
     wrap_optional_none,
 )
@@ -149,18 +161,22 @@ def _converter__counters(
 
 @attr.s(kw_only=True, frozen=True, slots=True)
 class GetInfo(RequestMapping):
+    ACTION: ClassVar[str] = "getInfo"
+
     @classmethod
     async def async_request_raw(cls, on: "TNSEnergoAPI", code: str) -> Mapping[str, Any]:
         return await on.async_req_get(
-            ("region", on.region, "action", "getInfo", "ls", code + "asdf", "json"),
+            ("region", on.region, "action", cls.ACTION, "ls", code, "json"),
         )
 
     @classmethod
+    @shared_request
+    @reauthenticating
     async def async_request(cls, on: "TNSEnergoAPI", code: str):
         result = await cls.async_request_raw(on, code)
         if result is None:
             raise EmptyResultException("Response result is empty")
-        return cls.from_response(result)
+        return on.parse_response(cls, result)
 
     address: str = attr.ib(
         converter=wrap_default_none(str, ""),
@@ -231,14 +247,16 @@ class GetLSListByLS(RequestMapping):
         return await on.async_req_post(
             ("delegation", "getLSListByLs", code),
             {"for_ls": code, "dlogin": dlogin},
+            retry_safe=True,
         )
 
     @classmethod
+    @reauthenticating
     async def async_request(cls, on: "TNSEnergoAPI", code: str, dlogin: int = 0):
         response = await cls.async_request_raw(on, code, dlogin)
         if response is None:
             raise EmptyResultException("Response result is empty")
-        return cls.from_response(response)
+        return on.parse_response(cls, response)
 
     data: Sequence[AccountInfo] = attr.ib(
         converter=converter__ls_list,
@@ -1,4 +1,4 @@
-from typing import Any, Mapping, Optional, Sequence, TYPE_CHECKING, Union
+from typing import Any, ClassVar, Mapping, Optional, Sequence, TYPE_CHECKING, Union
 
 import attr
 
@@ -85,11 +85,14 @@ def _converter__consent(value: Union[Consent, Mapping[str, Any]]) -> Consent:
 
 @attr.s(kw_only=True, frozen=True, slots=True)
 class AuthorizationRequest(RequestMapping):
+    ACTION: ClassVar[str] = "authorization"
+
     @classmethod
     async def async_request_raw(cls, on: "TNSEnergoAPI", username: str, password: str):
         return await on.async_req_post(
-            ("region", on.region, "action", "authorization", "json"),
+            ("region", on.region, "action", cls.ACTION, "json"),
             {"ls": username, "password": password},
+            retry_safe=True,
         )
 
     @classmethod
@@ -97,7 +100,7 @@ class AuthorizationRequest(RequestMapping):
         result = await cls.async_request_raw(on, username, password)
         if result is None:
             raise EmptyResultException("Response result is empty")
-        return cls.from_response(result)
+        return on.parse_response(cls, result)
 
     # Required attributes
     code: str = attr.ib(
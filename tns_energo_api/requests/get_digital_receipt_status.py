@@ -1,5 +1,5 @@
 from datetime import date
-from typing import Optional, TYPE_CHECKING
+from typing import ClassVar, Optional, TYPE_CHECKING
 
 import attr
 
@@ -9,6 +9,8 @@ from tns_energo_api.converters import (
     conv_bool,
     conv_date_optional,
     conv_str_optional,
+    reauthenticating,
+    shared_request,
 )
 from tns_energo_api.exceptions import EmptyResultException
 
@@ -18,18 +20,22 @@ if TYPE_CHECKING:
 
 @attr.s(kw_only=True, frozen=True, slots=True)
 class GetDigitalReceiptStatus(RequestMapping):
+    ACTION: ClassVar[str] = "getDigitalReceiptStatus"
+
     @classmethod
     async def async_request_raw(cls, on: "TNSEnergoAPI", code: str):
         return await on.async_req_get(
-            ("region", on.region, "action", "getDigitalReceiptStatus", "ls", code, "json")
+            ("region", on.region, "action", cls.ACTION, "ls", code, "json")
         )
 
     @classmethod
+    @shared_request
+    @reauthenticating
     async def async_request(cls, on: "TNSEnergoAPI", code: str):
         result = await cls.async_request_raw(on, code)
         if result is None:
             raise EmptyResultException("Response result is empty")
-        return cls.from_response(result)
+        return on.parse_response(cls, result)
 
     send_invoices: bool = attr.ib(
         converter=conv_bool,
@@ -1,5 +1,15 @@
 from types import MappingProxyType
-from typing import Any, Iterable, List, Mapping, Optional, TYPE_CHECKING, Tuple, Union
+from typing import (
+    Any,
+    ClassVar,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    TYPE_CHECKING,
+    Tuple,
+    Union,
+)
 
 import attr
 
@@ -11,6 +21,8 @@ from tns_energo_api.converters import (
     conv_float,
     conv_str_optional,
     conv_str_stripped,
+    reauthenticating,
+    shared_request,
     wrap_default_none,
 )
 from tns_energo_api.exceptions import EmptyResultException
@@ -84,18 +96,22 @@ def _converter__tickets_info(value: Union[Mapping[str, Any]]) -> TicketsInfo:
 
 @attr.s(kw_only=True, frozen=True, slots=True)
 class GetMainPage(RequestMapping):
+    ACTION: ClassVar[str] = "getMainpage"
+
     @classmethod
     async def async_request_raw(cls, on: "TNSEnergoAPI", code: str):
         return await on.async_req_get(
-            ("region", on.region, "action", "getMainpage", "ls", code, "json"),
+            ("region", on.region, "action", cls.ACTION, "ls", code, "json"),
         )
 
     @classmethod
+    @shared_request
+    @reauthenticating
     async def async_request(cls, on: "TNSEnergoAPI", code: str):
         result = await cls.async_request_raw(on, code)
         if result is None:
             raise EmptyResultException("Response result is empty")
-        return cls.from_response(result)
+        return on.parse_response(cls, result)
 
     cost_of_restriction: float = attr.ib(
         converter=conv_float,
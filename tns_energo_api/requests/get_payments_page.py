@@ -1,6 +1,16 @@
 from datetime import date as date_sys, datetime as datetime_sys
 from types import MappingProxyType
-from typing import Any, Iterable, Mapping, Optional, Sequence, TYPE_CHECKING, Tuple, Union
+from typing import (
+    Any,
+    ClassVar,
+    Iterable,
+    Mapping,
+    Optional,
+    Sequence,
+    TYPE_CHECKING,
+    Tuple,
+    Union,
+)
 
 import attr
 
@@ -12,12 +22,14 @@ from tns_energo_api.converters import (
     conv_date_optional,
     conv_datetime_optional,
     conv_str_optional,
+    reauthenticating,
+    shared_request,
     wrap_default_none,
 )
 from tns_energo_api.exceptions import EmptyResultException
 
 if TYPE_CHECKING:
-    from tns_energo_api import TNSEnergoAPI
+    from tns_energo_api import PaymentHistory, TNSEnergoAPI
 
 
 @attr.s(kw_only=True, frozen=True, slots=True)
@@ -90,18 +102,22 @@ def converter__history(
 
 @attr.s(kw_only=True, frozen=True, slots=True)
 class GetPaymentsPage(RequestMapping):
+    ACTION: ClassVar[str] = "getPaymentsHistPage"
+
     @classmethod
     async def async_request_raw(cls, on: "TNSEnergoAPI", code: str):
         return await on.async_req_get(
-            ("region", on.region, "action", "getPaymentsHistPage", "ls", code, "json"),
+            ("region", on.region, "action", cls.ACTION, "ls", code, "json"),
         )
 
     @classmethod
+    @shared_request
+    @reauthenticating
     async def async_request(cls, on: "TNSEnergoAPI", code: str):
         result = await cls.async_request_raw(on, code)
         if result is None:
             raise EmptyResultException("Response result is empty")
-        return cls.from_response(result)
+        return on.parse_response(cls, result)
 
     result: bool = attr.ib(
         converter=conv_bool,
@@ -111,3 +127,11 @@ class GetPaymentsPage(RequestMapping):
         converter=converter__history,
         metadata={META_SOURCE_DATA_KEY: "history"},
     )
+
+    # Populated on first use by `PaymentHistory.from_response`
+    payment_history: Optional["PaymentHistory"] = attr.ib(
+        init=False,
+        default=None,
+        eq=False,
+        repr=False,
+    )
@@ -1,7 +1,7 @@
 __all__ = ("GetReadingsHistPage",)
 
 from datetime import date
-from typing import Any, Mapping, Optional, TYPE_CHECKING, Union
+from typing import Any, ClassVar, Mapping, Optional, TYPE_CHECKING, Union
 
 import attr
 
@@ -12,12 +12,14 @@ from tns_energo_api.converters import (
     conv_date_optional,
     conv_int,
     conv_str_stripped,
+    reauthenticating,
+    shared_request,
     wrap_optional_eval,
 )
 from tns_energo_api.exceptions import EmptyResultException
 
 if TYPE_CHECKING:
-    from tns_energo_api import TNSEnergoAPI
+    from tns_energo_api import IndicationHistory, TNSEnergoAPI
 
 
 @attr.s(kw_only=True, frozen=True, slots=True)
@@ -112,20 +114,32 @@ def converter__history(
 
 @attr.s(kw_only=True, frozen=True, slots=True)
 class GetReadingsHistPage(RequestMapping):
+    ACTION: ClassVar[str] = "getReadingsHistPage"
+
     @classmethod
     async def async_request_raw(cls, on: "TNSEnergoAPI", code: str):
         return await on.async_req_get(
-            ("region", on.region, "action", "getReadingsHistPage", "ls", code, "json")
+            ("region", on.region, "action", cls.ACTION, "ls", code, "json")
         )
 
     @classmethod
+    @shared_request
+    @reauthenticating
     async def async_request(cls, on: "TNSEnergoAPI", code: str):
         result = await cls.async_request_raw(on, code)
         if result is None:
             raise EmptyResultException("Response result is empty")
-        return cls.from_response(result)
+        return on.parse_response(cls, result)
 
     history: Mapping[int, Mapping[date, Mapping[str, GetReadingsHistPageData]]] = attr.ib(
         converter=converter__history,
         metadata={META_SOURCE_DATA_KEY: "history"},
     )
+
+    # Populated on first use by `IndicationHistory.from_response`
+    indication_history: Optional["IndicationHistory"] = attr.ib(
+        init=False,
+        default=None,
+        eq=False,
+        repr=False,
+    )
@@ -1,6 +1,16 @@
 from datetime import date
 from types import MappingProxyType
-from typing import Any, Iterable, Mapping, Optional, Sequence, TYPE_CHECKING, Tuple, Union
+from typing import (
+    Any,
+    ClassVar,
+    Iterable,
+    Mapping,
+    Optional,
+    Sequence,
+    TYPE_CHECKING,
+    Tuple,
+    Union,
+)
 
 import attr
 
@@ -14,6 +24,8 @@ from tns_energo_api.converters import (
     conv_int,
     conv_str_optional,
     conv_str_stripped,
+    reauthenticating,
+    shared_request,
     wrap_optional_eval,
     wrap_optional_none,
     wrap_str_stripped,
@@ -174,18 +186,22 @@ def converter__counters(
 
 @attr.s(kw_only=True, frozen=True, slots=True)
 class SendIndicationsPage(RequestMapping):
+    ACTION: ClassVar[str] = "getSendReadingsPage"
+
     @classmethod
     async def async_request_raw(cls, on: "TNSEnergoAPI", code: str):
         return await on.async_req_get(
-            ("region", on.region, "action", "getSendReadingsPage", "ls", code, "json"),
+            ("region", on.region, "action", cls.ACTION, "ls", code, "json"),
         )
 
     @classmethod
+    @shared_request
+    @reauthenticating
     async def async_request(cls, on: "TNSEnergoAPI", code: str):
         result = await cls.async_request_raw(on, code)
         if result is None:
             raise EmptyResultException("Response result is empty")
-        return cls.from_response(result)
+        return on.parse_response(cls, result)
 
     status: str = attr.ib(
         converter=conv_str_stripped,
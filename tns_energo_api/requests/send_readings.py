@@ -1,5 +1,5 @@
 from datetime import date
-from typing import Any, Iterable, Mapping, NamedTuple, TYPE_CHECKING, Union
+from typing import Any, ClassVar, Iterable, Mapping, NamedTuple, TYPE_CHECKING, Union
 
 import attr
 
@@ -10,6 +10,7 @@ from tns_energo_api.converters import (
     conv_bool,
     conv_date_optional,
     conv_float,
+    reauthenticating,
 )
 from tns_energo_api.exceptions import EmptyResultException
 
@@ -105,10 +106,12 @@ class NewIndication(NamedTuple):
 
 @attr.s(kw_only=True, frozen=True, slots=True)
 class SendIndications(RequestMapping):
+    ACTION: ClassVar[str] = "sendReadings"
+
     @classmethod
     async def async_request_raw(cls, on: "TNSEnergoAPI", code: str, data: Iterable[NewIndication]):
         return await on.async_req_post(
-            ("region", on.region, "action", "sendReadings", "ls", code, "json"),
+            ("region", on.region, "action", cls.ACTION, "ls", code, "json"),
             list(
                 map(
                     lambda x: dict(
@@ -124,11 +127,15 @@ class SendIndications(RequestMapping):
         )
 
     @classmethod
+    @reauthenticating
     async def async_request(cls, on: "TNSEnergoAPI", code: str, data: Iterable[NewIndication]):
         result = await cls.async_request_raw(on, code, data)
         if result is None:
             raise EmptyResultException("Response result is empty")
-        return cls.from_response(result)
+        response = on.parse_response(cls, result)
+        # Readings history and meter data of the account are now stale
+        on.invalidate_cache(code)
+        return response
 
     result: bool = attr.ib(
         converter=conv_bool,
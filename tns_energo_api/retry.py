@@ -0,0 +1,145 @@
+__all__ = (
+    "CircuitBreaker",
+    "CircuitState",
+    "RetryPolicy",
+    "is_retryable_error",
+)
+
+import asyncio
+import enum
+import random
+import time
+from typing import Callable, Dict, Hashable, Optional
+
+import aiohttp
+import attr
+
+from tns_energo_api.exceptions import CircuitOpenException
+
+# Response statuses indicating a transient upstream condition
+RETRYABLE_STATUSES = frozenset((408, 429, 500, 502, 503, 504))
+
+
+def is_retryable_error(error: BaseException) -> bool:
+    """Whether a transport error is transient: timeouts, connection failures and
+    `RETRYABLE_STATUSES` responses (other response statuses are not)"""
+    if isinstance(error, aiohttp.ClientResponseError):
+        return error.status in RETRYABLE_STATUSES
+    return isinstance(error, (aiohttp.ClientError, asyncio.TimeoutError))
+
+
+@attr.s(kw_only=True, frozen=True, slots=True)
+class RetryPolicy:
+    """Exponential backoff with full jitter.
+
+    Delay before retry N (starting with 1) is picked uniformly from
+    [0, min(max_delay, base_delay * multiplier ** (N - 1))]."""
+
+    max_attempts: int = attr.ib(default=3)
+    base_delay: float = attr.ib(default=0.5)
+    max_delay: float = attr.ib(default=10.0)
+    multiplier: float = attr.ib(default=2.0)
+    random: Callable[[], float] = attr.ib(default=random.random, repr=False, eq=False)
+
+    @max_attempts.validator
+    def _validate_max_attempts(self, attribute, value):
+        if value < 1:
+            raise ValueError("max_attempts must be positive")
+
+    def get_delay(self, retry: int) -> float:
+        ceiling = min(self.max_delay, self.base_delay * self.multiplier ** (retry - 1))
+        return ceiling * self.random()
+
+
+
+class CircuitState(enum.Enum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+@attr.s(slots=True)
+class _Circuit:
+    state: CircuitState = attr.ib(default=CircuitState.CLOSED)
+    failures: int = attr.ib(default=0)
+    opened_at: float = attr.ib(default=0.0)
+    probing: bool = attr.ib(default=False)
+
+
+class CircuitBreaker:
+    """Per-endpoint circuit breaker, shareable between `TNSEnergoAPI` instances.
+
+    After `failure_threshold` consecutive transient failures of an endpoint, requests to it
+    fail fast with `CircuitOpenException` for `recovery_timeout` seconds. Then a single probe
+    request is let through: its success closes the circuit, its failure reopens it."""
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        recovery_timeout: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if failure_threshold < 1:
+            raise ValueError("failure_threshold must be positive")
+        self._failure_threshold = failure_threshold
+        self._recovery_timeout = recovery_timeout
+        self._clock = clock
+        self._circuits: Dict[Hashable, _Circuit] = {}
+
+    def get_state(self, key: Hashable) -> CircuitState:
+        circuit = self._circuits.get(key)
+        return CircuitState.CLOSED if circuit is None else circuit.state
+
+    @property
+    def open_endpoints(self) -> Dict[Hashable, CircuitState]:
+        return {
+            key: circuit.state
+            for key, circuit in self._circuits.items()
+            if circuit.state is not CircuitState.CLOSED
+        }
+
+    def before_request(self, key: Hashable) -> None:
+        """Raise `CircuitOpenException` unless a request to endpoint may proceed"""
+        circuit = self._circuits.get(key)
+        if circuit is None or circuit.state is CircuitState.CLOSED:
+            return
+
+        if circuit.state is CircuitState.OPEN:
+            remaining = circuit.opened_at + self._recovery_timeout - self._clock()
+            if remaining > 0:
+                raise CircuitOpenException(key, remaining)
+            circuit.state = CircuitState.HALF_OPEN
+            circuit.probing = False
+
+        if circuit.probing:
+            raise CircuitOpenException(key, 0.0)
+        circuit.probing = True
+
+    def release(self, key: Hashable) -> None:
+        """Forget an outstanding probe whose outcome is unknown (e.g. it got cancelled)"""
+        circuit = self._circuits.get(key)
+        if circuit is not None:
+            circuit.probing = False
+
+    def record_success(self, key: Hashable) -> None:
+        self._circuits.pop(key, None)
+
+    def record_failure(self, key: Hashable) -> None:
+        circuit = self._circuits.get(key)
+        if circuit is None:
+            circuit = self._circuits[key] = _Circuit()
+
+        circuit.failures += 1
+        circuit.probing = False
+        if (
+            circuit.state is CircuitState.HALF_OPEN
+            or circuit.failures >= self._failure_threshold
+        ):
+            circuit.state = CircuitState.OPEN
+            circuit.opened_at = self._clock()
+
+    def reset(self, key: Optional[Hashable] = None) -> None:
+        if key is None:
+            self._circuits.clear()
+        else:
+            self._circuits.pop(key, None)
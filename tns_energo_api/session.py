@@ -0,0 +1,94 @@
+__all__ = (
+    "SessionState",
+    "dump_cookies",
+    "load_cookies",
+)
+
+import json
+from http.cookies import Morsel
+from typing import Any, Dict, List, Mapping, Optional, Sequence
+
+import attr
+from aiohttp.abc import AbstractCookieJar
+from yarl import URL
+
+SESSION_STATE_VERSION = 1
+
+# Morsel attributes kept on serialization. Domain is restored as a morsel attribute too, so that
+# cookies of a parent domain (e.g. `.tns-e.ru`, set by `rest.tns-e.ru`) keep matching its hosts;
+# host-only cookies are restored as domain cookies of their host.
+_COOKIE_ATTRIBUTES = ("domain", "path", "expires", "max-age", "secure", "httponly", "samesite")
+
+
+def dump_cookies(cookie_jar: AbstractCookieJar) -> List[Dict[str, Any]]:
+    return [
+        {
+            "name": morsel.key,
+            "value": morsel.value,
+            **{key: morsel[key] for key in _COOKIE_ATTRIBUTES if morsel.get(key)},
+        }
+        for morsel in cookie_jar
+    ]
+
+
+def load_cookies(cookie_jar: AbstractCookieJar, cookies: Sequence[Mapping[str, Any]]) -> None:
+    for cookie in cookies:
+        morsel: Morsel = Morsel()
+        morsel.set(cookie["name"], cookie["value"], cookie["value"])
+        for key in _COOKIE_ATTRIBUTES:
+            if key in cookie:
+                morsel[key] = cookie[key]
+        scheme = "https" if cookie.get("secure") else "http"
+        cookie_jar.update_cookies(
+            {cookie["name"]: morsel},
+            URL.build(scheme=scheme, host=cookie["domain"], path=cookie.get("path") or "/"),
+        )
+
+
+@attr.s(kw_only=True, frozen=True, slots=True)
+class SessionState:
+    """Serializable state of an authenticated `TNSEnergoAPI` session.
+
+    Accounts are stored as plain mappings of `Account` attributes (without the API
+    reference). `authenticated_at` is a UNIX timestamp of the authorization request."""
+
+    username: str = attr.ib()
+    local_hash: Optional[str] = attr.ib(default=None)
+    app_version: Optional[str] = attr.ib(default=None)
+    authenticated_at: Optional[float] = attr.ib(default=None)
+    cookies: Sequence[Mapping[str, Any]] = attr.ib(default=())
+    main_account: Optional[Mapping[str, Any]] = attr.ib(default=None)
+    dependent_accounts: Optional[Sequence[Mapping[str, Any]]] = attr.ib(default=None)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "version": SESSION_STATE_VERSION,
+            "username": self.username,
+            "local_hash": self.local_hash,
+            "app_version": self.app_version,
+            "authenticated_at": self.authenticated_at,
+            "cookies": [dict(cookie) for cookie in self.cookies],
+            "main_account": self.main_account,
+            "dependent_accounts": self.dependent_accounts,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> "SessionState":
+        if data.get("version") != SESSION_STATE_VERSION:
+            raise ValueError(f"unsupported session state version: {data.get('version')}")
+        return cls(
+            username=data["username"],
+            local_hash=data.get("local_hash"),
+            app_version=data.get("app_version"),
+            authenticated_at=data.get("authenticated_at"),
+            cookies=tuple(data.get("cookies") or ()),
+            main_account=data.get("main_account"),
+            dependent_accounts=data.get("dependent_accounts"),
+        )
+
+    def to_json(self) -> str:
+        return json.dumps(self.to_dict(), ensure_ascii=False)
+
+    @classmethod
+    def from_json(cls, data: str) -> "SessionState":
+        return cls.from_dict(json.loads(data))
@@ -0,0 +1,312 @@
+__all__ = (
+    "HistoryStore",
+    "SyncResult",
+)
+
+import asyncio
+import json
+import sqlite3
+import threading
+from datetime import date, datetime
+from types import MappingProxyType
+from typing import Any, Dict, Iterable, List, Mapping, Optional, TYPE_CHECKING, Union
+
+import attr
+
+from tns_energo_api import (
+    Account,
+    Indication,
+    IndicationList,
+    Meter,
+    MeterZone,
+    Payment,
+    PaymentList,
+    process_start_end_arguments,
+)
+
+if TYPE_CHECKING:
+    from tns_energo_api import AccountCode
+
+_ZONES = ("t1", "t2", "t3")
+_METER_DATE_FIELDS = frozenset(
+    ("checkup_date", "last_checkup_date", "manufactured_date", "last_indications_date")
+)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meters (
+    account_code TEXT NOT NULL,
+    meter_code TEXT NOT NULL,
+    data TEXT NOT NULL,
+    PRIMARY KEY (account_code, meter_code)
+);
+CREATE TABLE IF NOT EXISTS indications (
+    account_code TEXT NOT NULL,
+    meter_code TEXT NOT NULL,
+    taken_on TEXT NOT NULL,
+    meter_identifier TEXT NOT NULL,
+    status INTEGER NOT NULL,
+    t1 INTEGER,
+    t2 INTEGER,
+    t3 INTEGER,
+    PRIMARY KEY (account_code, meter_code, taken_on)
+);
+CREATE TABLE IF NOT EXISTS payments (
+    account_code TEXT NOT NULL,
+    paid_at TEXT NOT NULL,
+    transaction_id TEXT NOT NULL,
+    source TEXT,
+    amount REAL NOT NULL,
+    PRIMARY KEY (account_code, paid_at, transaction_id)
+);
+"""
+
+
+@attr.s(kw_only=True, frozen=True, slots=True)
+class SyncResult:
+    account_code: str = attr.ib()
+    meters: int = attr.ib(default=0)
+    indications: int = attr.ib(default=0)
+    payments: int = attr.ib(default=0)
+
+
+def _meter_to_json(meter: Meter) -> str:
+    data = {}
+    # noinspection PyDataclass
+    for field in attr.fields(Meter):
+        if field.name == "account":
+            continue
+        value = getattr(meter, field.name)
+        if field.name == "zones":
+            value = {zone_id: attr.asdict(zone) for zone_id, zone in value.items()}
+        elif isinstance(value, date):
+            value = value.isoformat()
+        data[field.name] = value
+    return json.dumps(data, ensure_ascii=False)
+
+
+def _meter_from_json(account: Account, data: str) -> Meter:
+    data = json.loads(data)
+    for key in _METER_DATE_FIELDS:
+        if data.get(key) is not None:
+            data[key] = date.fromisoformat(data[key])
+    data["zones"] = MappingProxyType(
+        {zone_id: MeterZone(**zone) for zone_id, zone in data["zones"].items()}
+    )
+    return Meter(account=account, **data)
+
+
+class HistoryStore:
+    """Persistent SQLite store of indications, payments and meter metadata per account.
+
+    Synchronization merges only records newer than what is already stored (per meter for
+    indications, per account for payments), and range queries are served locally. Methods
+    are thread-safe; `async_sync` performs database work in the default executor."""
+
+    def __init__(self, path: str = ":memory:") -> None:
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._connection:
+            self._connection.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def _execute(self, query: str, parameters: Iterable[Any] = ()) -> List[tuple]:
+        with self._lock:
+            return self._connection.execute(query, tuple(parameters)).fetchall()
+
+    #################################################################################
+    # High-water marks
+    #################################################################################
+
+    def get_indications_high_water_marks(self, account_code: "AccountCode") -> Dict[str, date]:
+        return {
+            meter_code: date.fromisoformat(taken_on)
+            for meter_code, taken_on in self._execute(
+                "SELECT meter_code, MAX(taken_on) FROM indications "
+                "WHERE account_code = ? GROUP BY meter_code",
+                (account_code,),
+            )
+        }
+
+    def get_payments_high_water_mark(self, account_code: "AccountCode") -> Optional[datetime]:
+        ((paid_at,),) = self._execute(
+            "SELECT MAX(paid_at) FROM payments WHERE account_code = ?",
+            (account_code,),
+        )
+        return None if paid_at is None else datetime.fromisoformat(paid_at)
+
+    #################################################################################
+    # Merging
+    #################################################################################
+
+    def store_meters(self, account_code: "AccountCode", meters: Mapping[str, Meter]) -> int:
+        with self._lock, self._connection:
+            self._connection.executemany(
+                "INSERT OR REPLACE INTO meters (account_code, meter_code, data) VALUES (?, ?, ?)",
+                [(account_code, code, _meter_to_json(meter)) for code, meter in meters.items()],
+            )
+        return len(meters)
+
+    def merge_indications(
+        self, account_code: "AccountCode", indications: Iterable[Indication]
+    ) -> int:
+        """Store indications newer than the latest stored one of their meter"""
+        high_water_marks = self.get_indications_high_water_marks(account_code)
+        rows = [
+            (
+                account_code,
+                indication.meter_code,
+                indication.taken_on.isoformat(),
+                indication.meter_identifier,
+                indication.status,
+                *(indication.zones.get(zone) for zone in _ZONES),
+            )
+            for indication in indications
+            if indication.meter_code not in high_water_marks
+            or indication.taken_on > high_water_marks[indication.meter_code]
+        ]
+
+        with self._lock, self._connection:
+            cursor = self._connection.executemany(
+                "INSERT OR IGNORE INTO indications (account_code, meter_code, taken_on, "
+                "meter_identifier, status, t1, t2, t3) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+        return cursor.rowcount
+
+    def merge_payments(self, account_code: "AccountCode", payments: Iterable[Payment]) -> int:
+        """Store payments made not earlier than the latest stored one"""
+        high_water_mark = self.get_payments_high_water_mark(account_code)
+        rows = [
+            (
+                account_code,
+                payment.paid_at.isoformat(),
+                payment.transaction_id or "",
+                payment.source,
+                payment.amount,
+            )
+            for payment in payments
+            # Several payments may share a timestamp; duplicates are ignored on insertion
+            if high_water_mark is None or payment.paid_at >= high_water_mark
+        ]
+
+        with self._lock, self._connection:
+            cursor = self._connection.executemany(
+                "INSERT OR IGNORE INTO payments (account_code, paid_at, transaction_id, "
+                "source, amount) VALUES (?, ?, ?, ?, ?)",
+                rows,
+            )
+        return cursor.rowcount
+
+    #################################################################################
+    # Queries
+    #################################################################################
+
+    def get_meters(self, account: Account) -> Dict[str, Meter]:
+        return {
+            meter_code: _meter_from_json(account, data)
+            for meter_code, data in self._execute(
+                "SELECT meter_code, data FROM meters WHERE account_code = ? ORDER BY meter_code",
+                (account.code,),
+            )
+        }
+
+    def get_indications(
+        self,
+        account_code: "AccountCode",
+        start: Optional[Union[datetime, date]] = None,
+        end: Optional[Union[datetime, date]] = None,
+        meter_codes: Optional[Union[str, Iterable[str]]] = None,
+    ) -> IndicationList:
+        start, end = process_start_end_arguments(start, end)
+        query = (
+            "SELECT meter_code, taken_on, meter_identifier, status, t1, t2, t3 FROM indications "
+            "WHERE account_code = ? AND taken_on BETWEEN ? AND ?"
+        )
+        parameters = [account_code, start.date().isoformat(), end.date().isoformat()]
+
+        if meter_codes is not None:
+            if isinstance(meter_codes, str):
+                meter_codes = (meter_codes,)
+            meter_codes = tuple(meter_codes)
+            query += " AND meter_code IN (%s)" % ", ".join("?" * len(meter_codes))
+            parameters.extend(meter_codes)
+
+        return IndicationList(
+            Indication(
+                meter_identifier=meter_identifier,
+                taken_on=date.fromisoformat(taken_on),
+                meter_code=meter_code,
+                status=status,
+                zones={zone: value for zone, value in zip(_ZONES, values) if value is not None},
+            )
+            for meter_code, taken_on, meter_identifier, status, *values in self._execute(
+                query + " ORDER BY taken_on, meter_code", parameters
+            )
+        )
+
+    def get_payments(
+        self,
+        account_code: "AccountCode",
+        start: Optional[Union[datetime, date]] = None,
+        end: Optional[Union[datetime, date]] = None,
+    ) -> PaymentList:
+        start, end = process_start_end_arguments(start, end)
+
+        return PaymentList(
+            Payment(
+                transaction_id=transaction_id or None,
+                paid_at=datetime.fromisoformat(paid_at),
+                source=source,
+                amount=amount,
+            )
+            for paid_at, transaction_id, source, amount in self._execute(
+                "SELECT paid_at, transaction_id, source, amount FROM payments "
+                "WHERE account_code = ? AND paid_at BETWEEN ? AND ? ORDER BY paid_at",
+                (account_code, start.isoformat(), end.isoformat()),
+            )
+        )
+
+    #################################################################################
+    # Synchronization
+    #################################################################################
+
+    async def async_sync(
+        self,
+        account: Account,
+        meters: bool = True,
+        indications: bool = True,
+        payments: bool = True,
+    ) -> SyncResult:
+        """Fetch account data and merge records newer than the stored ones"""
+        loop = asyncio.get_running_loop()
+        code = account.code
+        counts = {}
+
+        if meters:
+            fetched_meters = await account.async_get_meters()
+            counts["meters"] = await loop.run_in_executor(
+                None, self.store_meters, code, fetched_meters
+            )
+
+        if indications:
+            history = await account.async_get_indication_history()
+            counts["indications"] = await loop.run_in_executor(
+                None, self.merge_indications, code, history
+            )
+
+        if payments:
+            payment_history = await account.async_get_payment_history()
+            counts["payments"] = await loop.run_in_executor(
+                None, self.merge_payments, code, payment_history
+            )
+
+        return SyncResult(account_code=code, **counts)
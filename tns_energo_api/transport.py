@@ -0,0 +1,478 @@
+__all__ = (
+    "Cassette",
+    "HTTPTransport",
+    "Interaction",
+    "RecordingTransport",
+    "ReplayTransport",
+    "Transport",
+    "TransportRequest",
+    "TransportResponse",
+    "TransportResponseError",
+    "redact",
+    "IDENTIFIER_FIELDS",
+    "IDENTIFIER_PATH_SEGMENTS",
+    "REDACTED",
+    "REDACTED_FIELDS",
+    "REDACTED_PARAMS",
+)
+
+import json
+import os
+import re
+import uuid
+from abc import ABC, abstractmethod
+from collections import deque
+from http import HTTPStatus
+from typing import Any, Callable, Deque, Dict, Hashable, List, Mapping, Optional, Pattern, Tuple
+from urllib.parse import urlsplit, urlunsplit
+
+import aiohttp
+import attr
+from aiohttp.client_reqrep import RequestInfo
+from multidict import CIMultiDict, CIMultiDictProxy, MultiDict
+from yarl import URL
+
+from tns_energo_api.exceptions import RequestException
+
+REDACTED = "<redacted>"
+
+# Query parameters and (request or response) JSON fields replaced with `REDACTED` on recording
+REDACTED_PARAMS = frozenset(("hash",))
+REDACTED_FIELDS = frozenset(("password", "PWD"))
+# JSON fields, and path segments following any of `IDENTIFIER_PATH_SEGMENTS`, holding account
+# codes (usernames included); these are replaced with pseudonyms on recording
+IDENTIFIER_FIELDS = frozenset(("ls", "for_ls", "slave_ls", "master_ls", "LS", "MASTER_LS"))
+IDENTIFIER_PATH_SEGMENTS = frozenset(("ls", "getLSListByLs"))
+
+CASSETTE_FORMAT_VERSION = 1
+
+
+@attr.s(kw_only=True, frozen=True, slots=True)
+class TransportRequest:
+    method: str = attr.ib()
+    url: str = attr.ib()
+    params: Mapping[str, str] = attr.ib(factory=dict)
+    # Multipart form field name and its (JSON-encoded) contents
+    form: Optional[Tuple[str, str]] = attr.ib(default=None)
+    # Passed to aiohttp as `trace_request_ctx`
+    trace: Optional[Any] = attr.ib(default=None, eq=False, repr=False)
+
+
+@attr.s(kw_only=True, frozen=True, slots=True)
+class TransportResponse:
+    status: int = attr.ib()
+    body: bytes = attr.ib(repr=False)
+    # Redirect target: URL of the final response when redirects were followed, or `Location`
+    # of a redirect response returned as is
+    location: Optional[str] = attr.ib(default=None)
+
+
+class TransportResponseError(aiohttp.ClientResponseError):
+    """Response with an error status; `response` holds its contents, so that it can be recorded"""
+
+    def __init__(self, request_info, history, *, response: TransportResponse, **kwargs) -> None:
+        super().__init__(request_info, history, status=response.status, **kwargs)
+        self.response = response
+
+
+class Transport(ABC):
+    """Performs HTTP exchanges on behalf of `TNSEnergoAPI`.
+
+    Implementations may raise `aiohttp.ClientError` (`TransportResponseError` for responses
+    with an error status) and `asyncio.TimeoutError`, which are wrapped into library
+    exceptions by the caller."""
+
+    @abstractmethod
+    async def async_request(
+        self, session: aiohttp.ClientSession, request: TransportRequest
+    ) -> TransportResponse:
+        ...
+
+
+async def _make_response(response: aiohttp.ClientResponse) -> TransportResponse:
+    if response.history:
+        location = str(response.url)
+    else:
+        location = response.headers.get(aiohttp.hdrs.LOCATION)
+    transport_response = TransportResponse(
+        status=response.status,
+        body=await response.read(),
+        location=location,
+    )
+    if response.status >= 400:
+        raise TransportResponseError(
+            response.request_info,
+            response.history,
+            response=transport_response,
+            message=response.reason or "",
+            headers=response.headers,
+        )
+    return transport_response
+
+
+class HTTPTransport(Transport):
+    """Default transport sending requests over the session of the API object"""
+
+    async def async_request(
+        self, session: aiohttp.ClientSession, request: TransportRequest
+    ) -> TransportResponse:
+        if request.form is None:
+            async with session.request(
+                request.method,
+                request.url,
+                params=request.params,
+                trace_request_ctx=request.trace,
+            ) as response:
+                return await _make_response(response)
+
+        name, value = request.form
+        with aiohttp.MultipartWriter(
+            "multipart/form-data", boundary=str(uuid.uuid1())
+        ) as mpdwriter:
+            mpdwriter.append(
+                value,
+                MultiDict(
+                    {
+                        aiohttp.hdrs.CONTENT_DISPOSITION: f'form-data; name="{name}"',
+                        aiohttp.hdrs.CONTENT_TRANSFER_ENCODING: "binary",
+                        aiohttp.hdrs.CONTENT_TYPE: "multipart/form-data; charset=utf-8",
+                    }
+                ),
+            )
+            async with session.request(
+                request.method,
+                request.url,
+                data=mpdwriter,
+                params=request.params,
+                headers={
+                    aiohttp.hdrs.CONTENT_TYPE: (
+                        f"multipart/form-data; boundary={mpdwriter.boundary}"
+                    ),
+                    aiohttp.hdrs.CONNECTION: aiohttp.hdrs.KEEP_ALIVE,
+                },
+                trace_request_ctx=request.trace,
+            ) as response:
+                return await _make_response(response)
+
+
+#################################################################################
+# Record / replay
+#################################################################################
+
+
+def redact(value: Any, replace_identifier: Optional[Callable[[str], str]] = None) -> Any:
+    """Copy of JSON-like value with `REDACTED_FIELDS` of mappings replaced at any depth; when
+    `replace_identifier` is provided, string `IDENTIFIER_FIELDS` are replaced with its result"""
+    if isinstance(value, dict):
+        redacted = {}
+        for key, item in value.items():
+            if key in REDACTED_FIELDS:
+                item = REDACTED
+            elif key in IDENTIFIER_FIELDS and replace_identifier is not None:
+                if item and isinstance(item, str):
+                    item = replace_identifier(item)
+            else:
+                item = redact(item, replace_identifier)
+            redacted[key] = item
+        return redacted
+    if isinstance(value, list):
+        return [redact(item, replace_identifier) for item in value]
+    return value
+
+
+def _redact_path(path: str, replace_identifier: Callable[[str], str]) -> str:
+    segments = path.split("/")
+    for index in range(1, len(segments)):
+        if segments[index] and segments[index - 1] in IDENTIFIER_PATH_SEGMENTS:
+            segments[index] = replace_identifier(segments[index])
+    return "/".join(segments)
+
+
+def _redact_url(url: str, replace_identifier: Callable[[str], str]) -> str:
+    parts = urlsplit(url)
+    return urlunsplit(parts._replace(path=_redact_path(parts.path, replace_identifier)))
+
+
+class _Pseudonyms:
+    """Replacements of account codes, assigned in order of appearance.
+
+    Pseudonyms keep the region prefix of codes (so that they may serve as usernames), and
+    contain a letter, so that they never coincide with real codes."""
+
+    def __init__(self) -> None:
+        self._values: Dict[str, str] = {}
+        self._pattern: Optional[Pattern[str]] = None
+
+    def get(self, value: str) -> str:
+        pseudonym = self._values.get(value)
+        if pseudonym is None:
+            width = max(len(value) - 3, 1)
+            pseudonym = self._values[value] = f"{value[:2]}x{len(self._values) + 1:0{width}d}"
+            self._pattern = None
+        return pseudonym
+
+    def find(self, value: str) -> str:
+        """Pseudonym of a known code; other values (pseudonyms included) are returned as is"""
+        return self._values.get(value, value)
+
+    def substitute(self, value: Any) -> Any:
+        """Copy of JSON-like value with known codes replaced within every string (such as
+        e-mail addresses derived from them)"""
+        if isinstance(value, str):
+            if not self._values:
+                return value
+            pattern = self._pattern
+            if pattern is None:
+                # Longest codes first, so that codes containing others are replaced whole
+                codes = sorted(self._values, key=len, reverse=True)
+                pattern = self._pattern = re.compile("|".join(map(re.escape, codes)))
+            return pattern.sub(lambda match: self._values[match.group(0)], value)
+        if isinstance(value, dict):
+            return {key: self.substitute(item) for key, item in value.items()}
+        if isinstance(value, list):
+            return [self.substitute(item) for item in value]
+        return value
+
+
+def _decode_body(body: str) -> Any:
+    try:
+        return json.loads(body)
+    except ValueError:
+        return body
+
+
+@attr.s(kw_only=True, frozen=True, slots=True)
+class Interaction:
+    """Recorded request/response pair with credentials and account codes redacted.
+
+    Requests are identified by method, URL path (without host) and form contents, so that
+    cassettes replay against any base URL. Account codes in forms are not compared, while
+    those in paths are compared by pseudonym. JSON bodies are stored decoded for readability.
+    Responses with error statuses are recorded as well."""
+
+    method: str = attr.ib()
+    path: str = attr.ib()
+    params: Mapping[str, str] = attr.ib(factory=dict)
+    form: Optional[Tuple[str, Any]] = attr.ib(default=None)
+    status: int = attr.ib()
+    response: Any = attr.ib(repr=False)
+    location: Optional[str] = attr.ib(default=None)
+
+    @classmethod
+    def from_exchange(
+        cls,
+        request: TransportRequest,
+        response: TransportResponse,
+        replace_identifier: Optional[Callable[[str], str]] = None,
+    ) -> "Interaction":
+        """Record exchange; account codes are replaced with `replace_identifier` results
+        (pseudonyms unique within the interaction by default)"""
+        if replace_identifier is None:
+            replace_identifier = _Pseudonyms().get
+
+        form = request.form
+        if form is not None:
+            form = (form[0], redact(_decode_body(form[1]), replace_identifier))
+
+        location = response.location
+        if location is not None:
+            location = _redact_url(location, replace_identifier)
+
+        return cls(
+            method=request.method,
+            path=_redact_path(urlsplit(request.url).path, replace_identifier),
+            params={
+                key: REDACTED if key in REDACTED_PARAMS else value
+                for key, value in request.params.items()
+            },
+            form=form,
+            status=response.status,
+            response=redact(
+                _decode_body(response.body.decode("utf-8", errors="replace")), replace_identifier
+            ),
+            location=location,
+        )
+
+    @property
+    def match_key(self) -> Hashable:
+        return _make_match_key(self.method, self.path, self.form)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "method": self.method,
+            "path": self.path,
+            "params": dict(self.params),
+            "form": None if self.form is None else list(self.form),
+            "status": self.status,
+            "response": self.response,
+            "location": self.location,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> "Interaction":
+        form = data.get("form")
+        return cls(
+            method=data["method"],
+            path=data["path"],
+            params=data.get("params") or {},
+            form=None if form is None else tuple(form),
+            status=data["status"],
+            response=data["response"],
+            location=data.get("location"),
+        )
+
+    def to_response(self) -> TransportResponse:
+        body = self.response
+        if not isinstance(body, str):
+            body = json.dumps(body, ensure_ascii=False)
+        return TransportResponse(
+            status=self.status, body=body.encode("utf-8"), location=self.location
+        )
+
+
+def _make_match_key(method: str, path: str, form: Optional[Tuple[str, Any]]) -> Hashable:
+    if form is not None:
+        form = (form[0], json.dumps(redact(form[1], lambda _: REDACTED), sort_keys=True))
+    return method, path, form
+
+
+class Cassette:
+    """Ordered collection of interactions, stored as a JSON file.
+
+    Identical requests are replayed in recording order; once exhausted, the last matching
+    interaction is repeated (so that recorded sessions may be replayed in benchmark loops).
+
+    Account codes are replaced with pseudonyms consistent across the recording. Replayed
+    responses carry pseudonyms, so clients pick them up; clients of loaded cassettes should
+    use the pseudonym of the username (the first code recorded, e.g. `58x000000001`)."""
+
+    def __init__(self, path: Optional[str] = None) -> None:
+        self.path = path
+        self.interactions: List[Interaction] = []
+        # Interactions not replayed yet, and the last replayed one, per match key
+        self._pending: Dict[Hashable, Deque[Interaction]] = {}
+        self._replayed: Dict[Hashable, Interaction] = {}
+        # Pseudonyms of account codes seen while recording; never saved
+        self._pseudonyms = _Pseudonyms()
+
+        if path is not None and os.path.exists(path):
+            self.load(path)
+
+    def __len__(self) -> int:
+        return len(self.interactions)
+
+    def load(self, path: str) -> None:
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        if data.get("version") != CASSETTE_FORMAT_VERSION:
+            raise ValueError(f"unsupported cassette format version: {data.get('version')}")
+        self.interactions = [Interaction.from_dict(item) for item in data["interactions"]]
+        self.rewind()
+
+    def save(self, path: Optional[str] = None) -> None:
+        path = path or self.path
+        if path is None:
+            raise ValueError("cassette path not provided")
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "version": CASSETTE_FORMAT_VERSION,
+                    "interactions": [item.to_dict() for item in self.interactions],
+                },
+                f,
+                ensure_ascii=False,
+                indent=1,
+            )
+
+    def record(self, request: TransportRequest, response: TransportResponse) -> Interaction:
+        """Append exchange, with account codes replaced by pseudonyms of the cassette"""
+        pseudonyms = self._pseudonyms
+        interaction = Interaction.from_exchange(request, response, pseudonyms.get)
+        form = interaction.form
+        interaction = attr.evolve(
+            interaction,
+            form=None if form is None else (form[0], pseudonyms.substitute(form[1])),
+            response=pseudonyms.substitute(interaction.response),
+        )
+        self.append(interaction)
+        return interaction
+
+    def append(self, interaction: Interaction) -> None:
+        self.interactions.append(interaction)
+        self._pending.setdefault(interaction.match_key, deque()).append(interaction)
+
+    def rewind(self) -> None:
+        """Restart replay from the first interaction; also required after modifying
+        `interactions` directly"""
+        self._replayed.clear()
+        pending = self._pending
+        pending.clear()
+        for interaction in self.interactions:
+            pending.setdefault(interaction.match_key, deque()).append(interaction)
+
+    def find(self, request: TransportRequest) -> Optional[Interaction]:
+        form = request.form
+        if form is not None:
+            form = (form[0], _decode_body(form[1]))
+        path = _redact_path(urlsplit(request.url).path, self._pseudonyms.find)
+        key = _make_match_key(request.method, path, form)
+
+        pending = self._pending.get(key)
+        if not pending:
+            return self._replayed.get(key)
+
+        interaction = self._replayed[key] = pending.popleft()
+        return interaction
+
+
+class RecordingTransport(Transport):
+    """Forward requests to another transport, recording every exchange into cassette.
+
+    Responses with error statuses are recorded before their error is raised. Cassette has to
+    be saved explicitly with `Cassette.save` once recording is done."""
+
+    def __init__(self, cassette: Cassette, transport: Optional[Transport] = None) -> None:
+        self.cassette = cassette
+        self.transport = transport or HTTPTransport()
+
+    async def async_request(
+        self, session: aiohttp.ClientSession, request: TransportRequest
+    ) -> TransportResponse:
+        try:
+            response = await self.transport.async_request(session, request)
+        except TransportResponseError as e:
+            self.cassette.record(request, e.response)
+            raise
+        self.cassette.record(request, response)
+        return response
+
+
+class ReplayTransport(Transport):
+    """Serve requests from cassette without network access; recorded error statuses are
+    raised as `TransportResponseError`"""
+
+    def __init__(self, cassette: Cassette) -> None:
+        self.cassette = cassette
+
+    async def async_request(
+        self, session: aiohttp.ClientSession, request: TransportRequest
+    ) -> TransportResponse:
+        interaction = self.cassette.find(request)
+        if interaction is None:
+            raise RequestException(
+                "No recorded interaction for %s %s" % (request.method, urlsplit(request.url).path)
+            )
+
+        response = interaction.to_response()
+        if response.status >= 400:
+            try:
+                message = HTTPStatus(response.status).phrase
+            except ValueError:
+                message = ""
+            raise TransportResponseError(
+                RequestInfo(URL(request.url), request.method, CIMultiDictProxy(CIMultiDict())),
+                (),
+                response=response,
+                message=message,
+            )
+        return response
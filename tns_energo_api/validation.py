@@ -0,0 +1,140 @@
+__all__ = (
+    "IssueCode",
+    "ValidationIssue",
+    "validate_indications",
+)
+
+import enum
+from typing import List, Mapping, Optional, SupportsInt, TYPE_CHECKING
+
+import attr
+
+if TYPE_CHECKING:
+    from tns_energo_api import Meter
+
+
+class IssueCode(enum.Enum):
+    ACCOUNT_MISMATCH = "account_mismatch"
+    UNKNOWN_ZONE = "unknown_zone"
+    INVALID_VALUE = "invalid_value"
+    NEGATIVE_VALUE = "negative_value"
+    TOO_MANY_DIGITS = "too_many_digits"
+    NOT_INCREASING = "not_increasing"
+    DIFFERENCE_EXCEEDED = "difference_exceeded"
+
+
+@attr.s(kw_only=True, frozen=True, slots=True)
+class ValidationIssue:
+    meter_code: str = attr.ib()
+    zone: Optional[str] = attr.ib()
+    code: IssueCode = attr.ib()
+    message: str = attr.ib()
+
+    def __str__(self) -> str:
+        if self.zone is None:
+            return f"meter {self.meter_code}: {self.message}"
+        return f"meter {self.meter_code}, zone {self.zone}: {self.message}"
+
+
+def validate_indications(
+    meter: "Meter",
+    values: Mapping[str, SupportsInt],
+    ignore_values: bool = False,
+) -> List[ValidationIssue]:
+    """Check new indications of a meter against its data, without any network I/O.
+
+    Every problem found is reported, rather than only the first one. Values must be
+    non-negative integers fitting into `precision` digits of the meter (when known), and must
+    exceed the previous indication of their zone, unless the decrease is a plausible rollover
+    of a `precision`-digit dial. Consumption since the previous indication must not exceed
+    `max_indication_difference` of the zone (when positive). `ignore_values` disables checks
+    against previous indications."""
+    issues: List[ValidationIssue] = []
+    code = meter.code
+
+    zones = meter.zones
+    precision = meter.precision
+    wrap = 10 ** precision if precision and precision > 0 else None
+
+    for zone_id, value in values.items():
+        zone = zones.get(zone_id)
+        if zone is None:
+            issues.append(
+                ValidationIssue(
+                    meter_code=code,
+                    zone=zone_id,
+                    code=IssueCode.UNKNOWN_ZONE,
+                    message=f"unknown zone (meter has {', '.join(zones) or 'no zones'})",
+                )
+            )
+            continue
+
+        try:
+            value = int(value)
+        except (TypeError, ValueError):
+            issues.append(
+                ValidationIssue(
+                    meter_code=code,
+                    zone=zone_id,
+                    code=IssueCode.INVALID_VALUE,
+                    message=f"invalid indication value: {value!r}",
+                )
+            )
+            continue
+
+        if value < 0:
+            issues.append(
+                ValidationIssue(
+                    meter_code=code,
+                    zone=zone_id,
+                    code=IssueCode.NEGATIVE_VALUE,
+                    message=f"negative indication: {value}",
+                )
+            )
+            continue
+
+        if wrap is not None and value >= wrap:
+            issues.append(
+                ValidationIssue(
+                    meter_code=code,
+                    zone=zone_id,
+                    code=IssueCode.TOO_MANY_DIGITS,
+                    message=f"indication {value} exceeds {precision} digits of the meter",
+                )
+            )
+            continue
+
+        if ignore_values:
+            continue
+
+        last_indication = zone.last_indication or 0
+        difference = value - last_indication
+        max_difference = zone.max_indication_difference
+
+        if difference <= 0:
+            # Dial wraps around to zero once all of its digits are exhausted
+            limit = max_difference if max_difference and max_difference > 0 else (wrap or 0) / 2
+            if wrap is None or difference == 0 or difference + wrap > limit:
+                issues.append(
+                    ValidationIssue(
+                        meter_code=code,
+                        zone=zone_id,
+                        code=IssueCode.NOT_INCREASING,
+                        message=f"indication {value} is not greater than previous "
+                        f"{last_indication}",
+                    )
+                )
+            continue
+
+        if max_difference and 0 < max_difference < difference:
+            issues.append(
+                ValidationIssue(
+                    meter_code=code,
+                    zone=zone_id,
+                    code=IssueCode.DIFFERENCE_EXCEEDED,
+                    message=f"consumption {difference} since previous indication exceeds "
+                    f"allowed {max_difference:g}",
+                )
+            )
+
+    return issues